@@ -0,0 +1,41 @@
+"""Upstream payloads used by the offline benchmarks."""
+import json
+import os
+from typing import Any, Dict
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# File names of every fixture, by the upstream endpoint they stand in for
+FIXTURE_FILES = {
+    "home": "home.html",
+    "anime_about": "anime_about.html",
+    "watch": "watch.html",
+    "episode_servers": "episode_servers.json",
+    "episode_sources": "episode_sources.json",
+    "megacloud_sources": "megacloud_getsources.json",
+    "megacloud_key": "megacloud_key.txt",
+    "rapidcloud_sources": "rapidcloud_getsources.json",
+    "rapidcloud_key": "rapidcloud_key.txt",
+}
+
+
+def fixture_path(name: str) -> str:
+    """Path of a fixture by its name in FIXTURE_FILES."""
+    return os.path.join(FIXTURE_DIR, FIXTURE_FILES[name])
+
+
+def load_text(name: str) -> str:
+    """Read a fixture as text."""
+    with open(fixture_path(name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_json(name: str) -> Any:
+    """Read a JSON fixture."""
+    return json.loads(load_text(name))
+
+
+def load_manifest() -> Dict[str, Any]:
+    """IDs the fixtures belong to and how they were produced."""
+    with open(os.path.join(FIXTURE_DIR, "manifest.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
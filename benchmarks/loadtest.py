@@ -0,0 +1,356 @@
+"""
+Load test the MCP server over SSE with many concurrent clients.
+
+Each client holds its own SSE session. Calls are issued open-loop at the target
+rate and spread over the clients; latency is measured from when a call was due,
+so time spent waiting for a free client counts, and a saturated server shows up
+as growing percentiles instead of a silently lower request rate.
+
+Usage:
+    # Against a running server
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000/sse --clients 20 --rate 10 --duration 60
+
+    # Start the upstream stand-in and a server redirected to it, then sweep rates
+    python benchmarks/loadtest.py --spawn --clients 50 --rates 5,10,20,40 --duration 30 \\
+        --mix get_home_page=4,get_anime_about_info=3,get_anime_episode_sources=1
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from benchmarks.run_benchmarks import percentile
+from benchmarks.standin import StandinConfig, StandinServer, standin_env
+from src.management import get_logger
+
+# Configure logging
+logger = get_logger("LoadTest")
+
+# Every SSE message is logged at INFO by the MCP client and httpx
+for noisy_logger in ("httpx", "mcp"):
+    logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+
+ANIME_ID = "frieren-beyond-journeys-end-18542"
+EPISODE_ID = f"{ANIME_ID}?ep=107257"
+
+DEFAULT_MIX = {
+    "get_home_page": 3,
+    "get_trending_anime": 2,
+    "get_anime_about_info": 3,
+    "get_episode_servers": 1,
+    "get_anime_episode_sources": 1,
+}
+
+
+def tool_arguments(tool: str, anime_id: str, episode_id: str) -> Dict[str, Any]:
+    """Arguments sent with each tool of the workload."""
+    if tool == "get_anime_about_info":
+        return {"anime_id": anime_id}
+    if tool in ("get_anime_episode_sources", "get_best_episode_source", "get_episode_servers", "get_all_episode_servers"):
+        return {"episode_id": episode_id}
+    return {}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse "tool=weight,tool=weight" into a weight by tool."""
+    mix = {}
+    for part in value.split(","):
+        tool, _, weight = part.strip().partition("=")
+        if tool:
+            mix[tool] = float(weight or 1)
+    return mix
+
+
+@dataclass
+class ToolStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    error_samples: List[str] = field(default_factory=list)
+
+    def record(self, latency: float, error: Optional[str]):
+        self.latencies.append(latency)
+        if error:
+            self.errors += 1
+            if len(self.error_samples) < 3:
+                self.error_samples.append(error[:200])
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        samples = sorted(self.latencies)
+        count = len(samples)
+        return {
+            "calls": count,
+            "errors": self.errors,
+            "errorRate": round(self.errors / count, 4) if count else 0.0,
+            "throughput": round(count / duration, 2) if duration else 0.0,
+            "p50Ms": round(percentile(samples, 50) * 1000, 1),
+            "p95Ms": round(percentile(samples, 95) * 1000, 1),
+            "p99Ms": round(percentile(samples, 99) * 1000, 1),
+            "maxMs": round(samples[-1] * 1000, 1) if samples else 0.0,
+            "errorSamples": self.error_samples
+        }
+
+
+def call_error(result) -> Optional[str]:
+    """Error message of a tool result, or None if the call succeeded."""
+    text = "".join(getattr(item, "text", "") for item in result.content)
+    if result.isError:
+        return text or "tool error"
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return None
+    if isinstance(payload, dict) and payload.get("success") is False:
+        return str(payload.get("error", "success=false"))
+    return None
+
+
+class LoadTest:
+    """Drive one workload at a fixed rate through a pool of SSE clients."""
+
+    def __init__(
+        self,
+        url: str,
+        clients: int,
+        mix: Dict[str, float],
+        anime_id: str = ANIME_ID,
+        episode_id: str = EPISODE_ID,
+        call_timeout: float = 60,
+        seed: Optional[int] = None
+    ):
+        self.url = url
+        self.clients = clients
+        self.mix = mix
+        self.anime_id = anime_id
+        self.episode_id = episode_id
+        self.call_timeout = call_timeout
+        self.random = random.Random(seed)
+
+        self._queue: "asyncio.Queue[Optional[Tuple[str, float]]]" = asyncio.Queue()
+        self._stats: Dict[str, ToolStats] = defaultdict(ToolStats)
+        self._ready = 0
+        self._connect_errors: List[str] = []
+
+    async def _client(self, ready: asyncio.Event):
+        try:
+            async with sse_client(self.url, timeout=10, sse_read_timeout=self.call_timeout + 30) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self._ready += 1
+                    if self._ready == self.clients:
+                        ready.set()
+                    await self._serve(session)
+        except Exception as e:
+            self._connect_errors.append(str(e))
+            self._ready += 1
+            if self._ready == self.clients:
+                ready.set()
+            # Keep draining so due calls are recorded as failures rather than lost
+            await self._serve(None)
+
+    async def _serve(self, session: Optional[ClientSession]):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            tool, due = item
+            error = None
+            if session is None:
+                error = "client not connected"
+            else:
+                try:
+                    result = await asyncio.wait_for(
+                        session.call_tool(tool, tool_arguments(tool, self.anime_id, self.episode_id)),
+                        timeout=self.call_timeout
+                    )
+                    error = call_error(result)
+                except asyncio.TimeoutError:
+                    error = f"timed out after {self.call_timeout}s"
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            self._stats[tool].record(time.perf_counter() - due, error)
+
+    async def _schedule(self, rate: float, duration: float) -> int:
+        """Enqueue calls at exponentially distributed intervals averaging rate per second."""
+        tools, weights = list(self.mix), list(self.mix.values())
+        start = time.perf_counter()
+        due = start
+        issued = 0
+        while True:
+            due += self.random.expovariate(rate)
+            if due - start >= duration:
+                return issued
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._queue.put_nowait((self.random.choices(tools, weights)[0], due))
+            issued += 1
+
+    async def run(self, rate: float, duration: float) -> Dict[str, Any]:
+        """Run the workload and return per-tool and overall statistics."""
+        ready = asyncio.Event()
+        workers = [asyncio.create_task(self._client(ready)) for _ in range(self.clients)]
+        await ready.wait()
+        if self._connect_errors:
+            logger.warning(f"{len(self._connect_errors)} of {self.clients} clients failed to connect: {self._connect_errors[0]}")
+
+        logger.info(f"Running {rate}/s for {duration}s over {self.clients} clients")
+        start = time.perf_counter()
+        issued = await self._schedule(rate, duration)
+        backlog = self._queue.qsize()
+        for _ in workers:
+            self._queue.put_nowait(None)
+        await asyncio.gather(*workers, return_exceptions=True)
+        elapsed = time.perf_counter() - start
+
+        overall = ToolStats()
+        for stats in self._stats.values():
+            overall.latencies.extend(stats.latencies)
+            overall.errors += stats.errors
+        return {
+            "targetRate": rate,
+            "clients": self.clients,
+            "connectedClients": self.clients - len(self._connect_errors),
+            "issued": issued,
+            "backlogAtEnd": backlog,
+            "elapsedSeconds": round(elapsed, 2),
+            "overall": {key: value for key, value in overall.summary(elapsed).items() if key != "errorSamples"},
+            "tools": {tool: stats.summary(elapsed) for tool, stats in sorted(self._stats.items())}
+        }
+
+
+async def fetch_runtime_stats(url: str) -> Dict[str, Any]:
+    async with sse_client(url, timeout=10) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            result = await session.call_tool("get_runtime_stats", {})
+            return json.loads(result.content[0].text)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def spawn_server(env: Dict[str, str], port: int, quiet: bool = True) -> asyncio.subprocess.Process:
+    """Start main.py's app under uvicorn and wait until it accepts connections."""
+    output = asyncio.subprocess.DEVNULL if quiet else None
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--log-level", "warning", "--no-access-log",
+        cwd=PROJECT_ROOT,
+        env={**os.environ, **env},
+        stdout=output,
+        stderr=output
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.returncode is not None:
+            raise RuntimeError(f"MCP server exited with code {process.returncode}")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return process
+        except OSError:
+            await asyncio.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("MCP server did not start within 30s")
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\nrate {report['targetRate']}/s, {report['connectedClients']}/{report['clients']} clients, "
+          f"{report['issued']} calls in {report['elapsedSeconds']}s, backlog at end {report['backlogAtEnd']}")
+    header = f"{'tool':<28}{'calls':>7}{'err %':>8}{'rps':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["tools"].items()) + [("overall", report["overall"])]
+    for tool, stats in rows:
+        print(f"{tool:<28}{stats['calls']:>7}{stats['errorRate'] * 100:>8.1f}{stats['throughput']:>8.2f}"
+              f"{stats['p50Ms']:>10.1f}{stats['p95Ms']:>10.1f}{stats['p99Ms']:>10.1f}")
+
+
+async def run_load_test(args) -> Dict[str, Any]:
+    standin = None
+    server = None
+    url = args.url
+    try:
+        if args.spawn:
+            standin = StandinServer(StandinConfig(
+                latency_ms=args.upstream_latency_ms,
+                jitter_ms=args.upstream_jitter_ms,
+                error_rate=args.upstream_error_rate,
+                seed=args.seed
+            ))
+            base_url = await standin.start()
+            port = free_port()
+            server = await spawn_server(standin_env(base_url), port, quiet=not args.server_logs)
+            url = f"http://127.0.0.1:{port}/sse"
+
+        mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+        reports = []
+        for rate in [float(rate) for rate in args.rates.split(",")]:
+            load_test = LoadTest(url, args.clients, mix, args.anime_id, args.episode_id, args.call_timeout, args.seed)
+            report = await load_test.run(rate, args.duration)
+            print_report(report)
+            reports.append(report)
+
+        result = {"url": url, "mix": mix, "runs": reports}
+        try:
+            result["serverStats"] = await fetch_runtime_stats(url)
+        except Exception as e:
+            logger.warning(f"Could not fetch runtime stats: {e}")
+        if standin:
+            result["upstreamRequests"] = dict(standin.requests)
+        return result
+    finally:
+        if server and server.returncode is None:
+            server.terminate()
+            await server.wait()
+        if standin:
+            await standin.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the MCP server over SSE")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/sse", help="SSE endpoint of the server")
+    parser.add_argument("--spawn", action="store_true", help="Start the upstream stand-in and a server redirected to it")
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent MCP client sessions")
+    parser.add_argument("--rate", dest="rates", default="5", help="Target calls per second")
+    parser.add_argument("--rates", dest="rates", help="Comma-separated rates to run one after another")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run each rate")
+    parser.add_argument("--mix", help="Workload as tool=weight pairs, e.g. get_home_page=3,get_anime_about_info=1")
+    parser.add_argument("--anime-id", default=ANIME_ID)
+    parser.add_argument("--episode-id", default=EPISODE_ID)
+    parser.add_argument("--call-timeout", type=float, default=60, help="Seconds before a call counts as failed")
+    parser.add_argument("--upstream-latency-ms", type=float, default=100, help="Stand-in latency with --spawn")
+    parser.add_argument("--upstream-jitter-ms", type=float, default=50, help="Stand-in jitter with --spawn")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0, help="Stand-in error rate with --spawn")
+    parser.add_argument("--server-logs", action="store_true", help="Show the output of the server started by --spawn")
+    parser.add_argument("--seed", type=int, help="Seed for arrivals and the tool mix")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load_test(args))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        logger.info(f"Wrote results to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Run the scraper benchmarks against the recorded fixtures.
+
+Every stage is timed in-process with no network access, so the numbers only
+reflect parsing and decryption cost and are comparable between commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --iterations 200 --filter home
+    python benchmarks/run_benchmarks.py --filter :bs4-lxml
+    python benchmarks/run_benchmarks.py --json results.json
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import load_json, load_manifest, load_text
+from src.management import get_logger
+from src.scrapers.animeAboutInfo import parse_anime_about_info
+from src.scrapers.animeEpisodeServers import parse_episode_servers
+from src.scrapers.extractor.megacloud import MegaCloud
+from src.scrapers.extractor.rapidcloud import RapidCloud
+from src.scrapers.homePages import HomePageScraper
+from src.models import HomePage
+from src.utils.m3u8 import parse_playlist, select_variant
+from src.utils.parsing import BACKENDS, parse_html
+
+# Configure logging
+logger = get_logger("Benchmarks")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    index = max(0, min(len(samples) - 1, math.ceil(pct / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def time_stage(func: Callable[[], Any], iterations: int, warmup: int) -> Dict[str, float]:
+    """Call func repeatedly and summarize the wall time of each call in milliseconds."""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        "iterations": iterations,
+        "meanMs": round(mean, 3),
+        "p50Ms": round(percentile(samples, 50), 3),
+        "p95Ms": round(percentile(samples, 95), 3),
+        "minMs": round(samples[0], 3),
+        "maxMs": round(samples[-1], 3),
+        "opsPerSec": round(1000 / mean, 1) if mean else 0.0
+    }
+
+
+def synthetic_playlists(segments: int = 3000) -> Tuple[str, str]:
+    """A master playlist shaped like the embed hosts' and a long media playlist."""
+    master = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for height, bandwidth in ((1080, 5000000), (720, 2800000), (480, 1400000), (360, 800000)):
+        attributes = f'BANDWIDTH={bandwidth},RESOLUTION={height * 16 // 9}x{height},CODECS="avc1.640028,mp4a.40.2"'
+        master += [f"#EXT-X-STREAM-INF:{attributes}", f"{height}p/index.m3u8"]
+        master.append(f'#EXT-X-I-FRAME-STREAM-INF:BANDWIDTH={bandwidth // 10},RESOLUTION={height * 16 // 9}x{height},URI="{height}p/iframes.m3u8"')
+    media = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:6", "#EXT-X-MEDIA-SEQUENCE:0"]
+    for index in range(segments):
+        media += ["#EXTINF:6.006,", f"seg-{index}-v1-a1.ts"]
+    media.append("#EXT-X-ENDLIST")
+    return "\n".join(master), "\n".join(media)
+
+
+def backend_stages(backend: str, home_html: str, about_html: str, servers_html: str, manifest: Dict[str, Any]) -> List[Tuple[str, Callable[[], Any]]]:
+    """Tree building and whole-page parsing of each fixture with one HTML parser backend."""
+    scraper = HomePageScraper()
+    return [
+        (f"tree.home:{backend}", lambda: parse_html(home_html, backend)),
+        (f"home.parse:{backend}", lambda: scraper.parse_home_page(home_html, backend)),
+        (f"about.parse:{backend}", lambda: parse_anime_about_info(about_html, manifest["animeId"], parser=backend)),
+        (f"servers.parse:{backend}", lambda: parse_episode_servers(parse_html(servers_html, backend), manifest["episodeId"])),
+    ]
+
+
+def build_stages() -> List[Tuple[str, Callable[[], Any]]]:
+    """The benchmarked stages, each a (name, zero-argument callable) pair."""
+    manifest = load_manifest()
+    home_html = load_text("home")
+    about_html = load_text("anime_about")
+    servers_html = load_json("episode_servers")["html"]
+    megacloud_sources = load_json("megacloud_sources")["sources"]
+    megacloud_key = load_text("megacloud_key")
+    rapidcloud_sources = load_json("rapidcloud_sources")["sources"]
+    rapidcloud_key = load_text("rapidcloud_key")
+    master_playlist, media_playlist = synthetic_playlists()
+    playlist_url = "https://cdn.example.com/hls/master.m3u8"
+
+    scraper = HomePageScraper()
+    home_soup = BeautifulSoup(home_html, "html.parser")
+    megacloud = MegaCloud()
+    rapidcloud = RapidCloud()
+
+    stages = [
+        ("home.soup", lambda: BeautifulSoup(home_html, "html.parser")),
+        ("home.spotlight", lambda: scraper._extract_spotlight_animes(home_soup)),
+        ("home.trending", lambda: scraper._extract_trending_animes(home_soup)),
+        ("home.genres", lambda: scraper._extract_genres(home_soup)),
+        ("home.single_pass", lambda: scraper._extract_single_pass(home_soup, HomePage())),
+        ("home.parse", lambda: scraper.parse_home_page(home_html)),
+        ("about.parse", lambda: parse_anime_about_info(about_html, manifest["animeId"])),
+        ("servers.parse", lambda: parse_episode_servers(parse_html(servers_html), manifest["episodeId"])),
+        ("megacloud.decrypt", lambda: megacloud.decrypt(megacloud_sources, megacloud_key)),
+        ("rapidcloud.decrypt", lambda: rapidcloud._decrypt_sources(rapidcloud_sources, rapidcloud_key)),
+        ("m3u8.master", lambda: select_variant(parse_playlist(master_playlist, playlist_url).variants, 720)),
+        ("m3u8.media", lambda: parse_playlist(media_playlist, playlist_url)),
+    ]
+    for backend in BACKENDS:
+        stages += backend_stages(backend, home_html, about_html, servers_html, manifest)
+    return stages
+
+
+def run(iterations: int, warmup: int, name_filter: str = None) -> Dict[str, Dict[str, float]]:
+    """Run every stage whose name contains name_filter and return the results by stage."""
+    results = {}
+    for name, func in build_stages():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_stage(func, iterations, warmup)
+    return results
+
+
+def print_table(results: Dict[str, Dict[str, float]]):
+    header = f"{'stage':<30}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'ops/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        print(f"{name:<30}{result['meanMs']:>10.3f}{result['p50Ms']:>10.3f}{result['p95Ms']:>10.3f}{result['opsPerSec']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against recorded fixtures")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed calls per stage")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed calls per stage before timing")
+    parser.add_argument("--filter", dest="name_filter", help="Only run stages whose name contains this")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    manifest = load_manifest()
+    logger.info(f"Benchmarking {manifest['source']} fixtures for {manifest['animeId']}")
+    results = run(args.iterations, args.warmup, args.name_filter)
+    print_table(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"fixtures": manifest, "results": results}, f, indent=2)
+        logger.info(f"Wrote results to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Local stand-in for the upstream hosts, for load testing without touching the real site.
+
+Serves the hianime pages and AJAX endpoints from the benchmark fixtures, the
+MegaCloud and RapidCloud getSources endpoints with freshly encrypted payloads,
+the published decryption keys and the HLS playlists the sources point at.
+Latency, error rate and page size are configurable.
+
+Point the MCP server at it with the variables printed on startup:
+
+    python benchmarks/standin.py --port 8100 --latency-ms 150 --jitter-ms 100 --error-rate 0.02
+    SRC_BASE_URL=http://127.0.0.1:8100 MEGACLOUD_URL=http://127.0.0.1:8100 ... python main.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from bs4 import BeautifulSoup
+
+from benchmarks.build_fixtures import encrypt_megacloud, encrypt_rapidcloud
+from benchmarks.fixtures import load_json, load_text
+from src.management import get_logger
+
+# Configure logging
+logger = get_logger("Standin")
+
+# Embed link served for each hianime server id
+EMBED_PATHS = {
+    4: "/embed-2/v2/e-1/{id}?k=1",  # MegaCloud
+    1: "/embed-2/e-1/{id}?z=",  # RapidCloud
+    3: "/e/{id}",  # StreamTape
+}
+
+HLS_VARIANTS = [("1920x1080", 5000000), ("1280x720", 2800000), ("640x360", 800000)]
+
+
+@dataclass
+class StandinConfig:
+    """How the stand-in behaves; every field can be changed while it runs."""
+    latency_ms: float = 0.0  # Added to every response
+    jitter_ms: float = 0.0  # Uniform random extra latency on top of latency_ms
+    error_rate: float = 0.0  # Fraction of requests answered with error_status
+    error_status: int = 503
+    payload_bytes: int = 0  # Pad HTML pages up to at least this size
+    seed: Optional[int] = None
+
+
+def standin_env(base_url: str) -> Dict[str, str]:
+    """Environment variables that redirect every upstream host to the stand-in at base_url."""
+    return {
+        "SRC_BASE_URL": base_url,
+        "MEGACLOUD_URL": base_url,
+        "RAPIDCLOUD_URL": base_url,
+        "MEGACLOUD_KEY_URL": f"{base_url}/keys/megacloud",
+        "RAPIDCLOUD_KEY_URL": f"{base_url}/keys/rapidcloud",
+    }
+
+
+class StandinServer:
+    """
+    aiohttp application mimicking the hianime, MegaCloud and RapidCloud endpoints.
+
+    Requests are counted per route so load tests can check how many upstream
+    calls a workload really caused (GET /__standin/stats).
+    """
+
+    def __init__(self, config: StandinConfig = None):
+        self.config = config or StandinConfig()
+        self.random = random.Random(self.config.seed)
+        self.base_url = ""
+        self.requests = Counter()
+        self.errors = Counter()
+        self.started_at = time.time()
+        self._runner: Optional[web.AppRunner] = None
+
+        self.pages = {
+            "home": load_text("home"),
+            "anime": load_text("anime_about"),
+            "watch": load_text("watch"),
+        }
+        self.servers = load_json("episode_servers")
+        self.megacloud_key = load_text("megacloud_key").strip()
+        self.rapidcloud_tracks = load_json("rapidcloud_sources")["tracks"]
+        self.megacloud_tracks = load_json("megacloud_sources")["tracks"]
+
+        soup = BeautifulSoup(self.servers["html"], "html.parser")
+        self.server_ids = {
+            item["data-id"]: int(item["data-server-id"])
+            for item in soup.select(".server-item[data-id]")
+        }
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/__standin/stats", self.handle_stats)
+        app.router.add_get("/home", self.handle_home)
+        app.router.add_get("/ajax/v2/episode/servers", self.handle_servers)
+        app.router.add_get("/ajax/v2/episode/sources", self.handle_sources)
+        app.router.add_get("/embed-2/v2/e-1/getSources", self.handle_megacloud_sources)
+        app.router.add_get("/embed-2/ajax/e-1/getSources", self.handle_rapidcloud_sources)
+        app.router.add_get("/e/{source_id}", self.handle_streamtape_embed)
+        app.router.add_get("/keys/megacloud", self.handle_megacloud_key)
+        app.router.add_get("/keys/rapidcloud", self.handle_rapidcloud_key)
+        app.router.add_get("/hls/{source_id}/master.m3u8", self.handle_master_playlist)
+        app.router.add_get("/hls/{source_id}/{variant}/index.m3u8", self.handle_media_playlist)
+        app.router.add_get("/hls/{source_id}/{variant}/{segment}.ts", self.handle_segment)
+        app.router.add_get("/watch/{anime_id}", self.handle_watch)
+        app.router.add_get("/{anime_id}", self.handle_anime)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else "unmatched"
+        if route == "/__standin/stats":
+            return await handler(request)
+
+        self.requests[route] += 1
+        delay = self.config.latency_ms + self.random.uniform(0, self.config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.config.error_rate and self.random.random() < self.config.error_rate:
+            self.errors[route] += 1
+            return web.Response(status=self.config.error_status, text="stand-in injected error")
+        return await handler(request)
+
+    def _page(self, html: str) -> web.Response:
+        missing = self.config.payload_bytes - len(html)
+        if missing > 0:
+            filler = '<div class="standin-filler" hidden>' + "lorem ipsum " * 8 + "</div>\n"
+            html = html.replace("</body>", filler * (missing // len(filler) + 1) + "</body>", 1)
+        return web.Response(text=html, content_type="text/html")
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "total": sum(self.requests.values()),
+            "uptimeSeconds": round(time.time() - self.started_at, 1)
+        })
+
+    async def handle_home(self, request: web.Request) -> web.Response:
+        return self._page(self.pages["home"])
+
+    async def handle_anime(self, request: web.Request) -> web.Response:
+        return self._page(self.pages["anime"])
+
+    async def handle_watch(self, request: web.Request) -> web.Response:
+        return self._page(self.pages["watch"])
+
+    async def handle_servers(self, request: web.Request) -> web.Response:
+        if not request.query.get("episodeId"):
+            return web.json_response({"status": False}, status=400)
+        return web.json_response(self.servers)
+
+    async def handle_sources(self, request: web.Request) -> web.Response:
+        data_id = request.query.get("id", "")
+        server_id = self.server_ids.get(data_id)
+        if server_id not in EMBED_PATHS:
+            return web.json_response({"status": False}, status=404)
+        source_id = f"{data_id}{self.random.getrandbits(32):08x}"
+        return web.json_response({
+            "type": "iframe",
+            "link": self.base_url + EMBED_PATHS[server_id].format(id=source_id),
+            "server": server_id,
+            "sources": [],
+            "tracks": [],
+            "htmlGuide": ""
+        })
+
+    def _sources_plaintext(self, source_id: str) -> str:
+        return json.dumps([{"file": f"{self.base_url}/hls/{source_id}/master.m3u8", "type": "hls"}])
+
+    async def handle_megacloud_sources(self, request: web.Request) -> web.Response:
+        source_id = request.query.get("id", "")
+        return web.json_response({
+            "sources": encrypt_megacloud(self._sources_plaintext(source_id), self.megacloud_key, self.random),
+            "tracks": self.megacloud_tracks,
+            "encrypted": True,
+            "intro": {"start": 0, "end": 91},
+            "outro": {"start": 1325, "end": 1415},
+            "server": 4
+        })
+
+    async def handle_rapidcloud_sources(self, request: web.Request) -> web.Response:
+        source_id = request.query.get("id", "")
+        sources, _ = encrypt_rapidcloud(self._sources_plaintext(source_id), self.random)
+        return web.json_response({
+            "sources": sources,
+            "tracks": self.rapidcloud_tracks,
+            "encrypted": True,
+            "intro": {"start": 0, "end": 91},
+            "outro": {"start": 1325, "end": 1415},
+            "server": 1
+        })
+
+    async def handle_streamtape_embed(self, request: web.Request) -> web.Response:
+        netloc = self.base_url.split("://", 1)[1]
+        token = f"{self.random.getrandbits(64):016x}"
+        script = (
+            "document.getElementById('robotlink').innerHTML = "
+            f"(//{netloc}/get_video?id={request.match_info['source_id']} + ('xyz&token={token});"
+        )
+        return self._page(f"<html><body><div id=\"robotlink\"></div><script>{script}</script></body></html>")
+
+    async def handle_megacloud_key(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.megacloud_key)
+
+    async def handle_rapidcloud_key(self, request: web.Request) -> web.Response:
+        return web.Response(text=load_text("rapidcloud_key"))
+
+    async def handle_master_playlist(self, request: web.Request) -> web.Response:
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+        for resolution, bandwidth in HLS_VARIANTS:
+            lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={resolution}")
+            lines.append(f"{resolution.split('x')[1]}p/index.m3u8")
+        return web.Response(text="\n".join(lines) + "\n", content_type="application/vnd.apple.mpegurl")
+
+    async def handle_media_playlist(self, request: web.Request) -> web.Response:
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:10", "#EXT-X-MEDIA-SEQUENCE:0"]
+        for index in range(144):
+            lines.append("#EXTINF:10.0,")
+            lines.append(f"seg-{index}.ts")
+        lines.append("#EXT-X-ENDLIST")
+        return web.Response(text="\n".join(lines) + "\n", content_type="application/vnd.apple.mpegurl")
+
+    async def handle_segment(self, request: web.Request) -> web.Response:
+        return web.Response(body=b"\x47" * 188 * 64, content_type="video/mp2t")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL; port 0 picks a free port."""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        logger.info(f"Stand-in upstream listening on {self.base_url}")
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(config: StandinConfig, host: str, port: int):
+    server = StandinServer(config)
+    base_url = await server.start(host, port)
+    print("Redirect the MCP server with:")
+    print(" ".join(f"{name}={value}" for name, value in standin_env(base_url).items()))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the upstream hosts")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform random latency on top of --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code of injected failures")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="Pad HTML pages up to this many bytes")
+    parser.add_argument("--seed", type=int, help="Seed for latency and error injection")
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        payload_bytes=args.payload_bytes,
+        seed=args.seed
+    )
+    try:
+        asyncio.run(serve(config, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,23 @@ from starlette.responses import JSONResponse
 
 from src.management import get_logger
 from src.scrapers import HomePageScraper
+from src.scrapers.homePages import selector_stats as home_page_selector_stats
 from src.scrapers.animeAboutInfo import get_anime_about_info as scrape_anime_about_info
 from src.scrapers.animeEpisodeSrcs import get_all_anime_episode_sources as scrape_all_anime_episode_sources
+from src.scrapers.animeEpisodeSrcs import get_best_anime_episode_source as scrape_best_anime_episode_source
 from src.scrapers.animeEpisodeServers import get_episode_servers as scrape_episode_servers
 from src.utils.config import Config
+from src.utils.executor import executor
+from src.utils.client import client, async_client
+from src.utils.ratelimit import rate_limiter
+from src.utils.retry import retrier
+from src.utils.circuitbreaker import circuit_breakers
+from src.utils.m3u8 import parse_quality, playlist_cache
+from src.utils.probe import source_prober
+from src.utils.cache import TTLCache
+from src.utils.singleflight import SingleFlight, normalize_key
+from src.scrapers.animeEpisodeSrcs import episode_sources_flight, episode_sources_cache, episode_sources_hedger, server_health
+from src.scrapers.extractor.keys import megacloud_key, rapidcloud_key
 
 from starlette.applications import Starlette
 from starlette.routing import Mount, Host
@@ -34,12 +47,39 @@ except Exception as e:
     logger.error(f"Failed to initialize Aniwatch scraper: {str(e)}")
     sys.exit(1)
 
+# The home page changes a few times per hour and backs four tools, so share one cached copy
+home_page_cache = TTLCache(
+    "home_page",
+    ttl=Config.HOME_PAGE_CACHE_TTL,
+    stale_ttl=Config.HOME_PAGE_STALE_TTL
+)
+
+
+async def get_cached_home_page(tool: str):
+    """Get the home page from the cache, scraping it on the thread pool when needed."""
+    return await home_page_cache.get_or_load(
+        "home",
+        lambda: executor.run(tool, home_page_scraper.get_home_page)
+    )
+
+def valid_quality(quality: str) -> bool:
+    """Whether a requested source quality is "best", "worst" or a height such as "720p"."""
+    try:
+        parse_quality(quality)
+        return True
+    except ValueError:
+        return False
+
+# Concurrent identical requests share one upstream scrape
+anime_about_flight = SingleFlight("get_anime_about_info")
+episode_servers_flight = SingleFlight("get_episode_servers")
+
 # Add Aniwatch tools
 @mcp.tool()
 async def get_home_page(ctx: Context) -> dict:
     """Get anime information from Aniwatch homepage."""
     try:
-        result = home_page_scraper.get_home_page()
+        result, cache_info = await get_cached_home_page("get_home_page")
         return {
             "spotlightAnimes": [
                 {
@@ -78,7 +118,8 @@ async def get_home_page(ctx: Context) -> dict:
                 }
                 for anime in result.trendingAnimes
             ],
-            "genres": result.genres
+            "genres": result.genres,
+            "cache": cache_info.to_dict()
         }
     except Exception as e:
         logger.error(f"Error getting home page: {str(e)}")
@@ -88,7 +129,7 @@ async def get_home_page(ctx: Context) -> dict:
 async def get_trending_anime(ctx: Context) -> dict:
     """Get trending anime from Aniwatch homepage."""
     try:
-        result = home_page_scraper.get_home_page()
+        result, cache_info = await get_cached_home_page("get_trending_anime")
         return {
             "animes": [
                 {
@@ -104,7 +145,8 @@ async def get_trending_anime(ctx: Context) -> dict:
                     "type": anime.type
                 }
                 for anime in result.trendingAnimes
-            ]
+            ],
+            "cache": cache_info.to_dict()
         }
     except Exception as e:
         logger.error(f"Error getting trending anime: {str(e)}")
@@ -114,8 +156,8 @@ async def get_trending_anime(ctx: Context) -> dict:
 async def get_anime_genres(ctx: Context) -> dict:
     """Get available anime genres from Aniwatch."""
     try:
-        result = home_page_scraper.get_home_page()
-        return {"genres": result.genres}
+        result, cache_info = await get_cached_home_page("get_anime_genres")
+        return {"genres": result.genres, "cache": cache_info.to_dict()}
     except Exception as e:
         logger.error(f"Error getting anime genres: {str(e)}")
         raise
@@ -124,7 +166,7 @@ async def get_anime_genres(ctx: Context) -> dict:
 async def get_anime_recommendations(ctx: Context) -> dict:
     """Get anime recommendations based on current trends."""
     try:
-        result = home_page_scraper.get_home_page()
+        result, cache_info = await get_cached_home_page("get_anime_recommendations")
         spotlight = result.spotlightAnimes[0] if result.spotlightAnimes else None
         trending = result.trendingAnimes[0] if result.trendingAnimes else None
         
@@ -157,7 +199,8 @@ async def get_anime_recommendations(ctx: Context) -> dict:
                     "dub": trending.episodes.dub
                 },
                 "type": trending.type
-            } if trending else None
+            } if trending else None,
+            "cache": cache_info.to_dict()
         }
     except Exception as e:
         logger.error(f"Error getting anime recommendations: {str(e)}")
@@ -177,7 +220,10 @@ async def get_anime_about_info(ctx: Context, anime_id: str = "") -> dict:
                 "error": "anime_id is required"
             }
 
-        result = scrape_anime_about_info(anime_id)
+        result = await anime_about_flight.do(
+            normalize_key(anime_id),
+            lambda: executor.run("get_anime_about_info", scrape_anime_about_info, anime_id)
+        )
 
         # Ensure we have a valid result
         if not result:
@@ -231,10 +277,17 @@ async def get_anime_about_info(ctx: Context, anime_id: str = "") -> dict:
         }
 
 @mcp.tool()
-async def get_anime_episode_sources(ctx: Context, episode_id: str = "", category: str = "sub") -> dict:
-    """Get anime episode streaming sources from ALL available servers for the specified category."""
+async def get_anime_episode_sources(ctx: Context, episode_id: str = "", category: str = "sub", enough_servers: int = 0, probe: bool = False, quality: str = "") -> dict:
+    """
+    Get anime episode streaming sources from ALL available servers for the specified category.
+
+    Servers are tried healthiest first; with enough_servers above 0 the remaining servers are
+    skipped once that many returned sources. With probe, every source and subtitle URL is
+    checked and carries its liveness and time to first byte. With quality ("best", "worst" or
+    a height such as "720p"), each server returns only its source closest to it.
+    """
     try:
-        logger.info(f"Received request for episode sources: episode_id='{episode_id}', category='{category}'")
+        logger.info(f"Received request for episode sources: episode_id='{episode_id}', category='{category}', enough_servers={enough_servers}, probe={probe}, quality='{quality}'")
 
         if not episode_id:
             logger.error("Empty episode_id received")
@@ -257,11 +310,20 @@ async def get_anime_episode_sources(ctx: Context, episode_id: str = "", category
                 "error": "category must be one of: sub, dub, raw"
             }
 
+        if quality and not valid_quality(quality):
+            logger.error(f"Invalid quality: {quality}")
+            return {
+                "success": False,
+                "error": "quality must be best, worst or a height such as 720p"
+            }
+
         # Add timeout to prevent hanging connections
         try:
             result = await asyncio.wait_for(
-                scrape_all_anime_episode_sources(episode_id, category),
-                timeout=90.0  # 90 second timeout for multiple servers (45s per server * 2 servers max in parallel)
+                scrape_all_anime_episode_sources(
+                    episode_id, category, enough_servers=enough_servers or None, probe=probe or None, quality=quality or None
+                ),
+                timeout=90.0  # Safety net above Config.SOURCES_TOTAL_TIMEOUT, which already returns partial results
             )
         except asyncio.TimeoutError:
             logger.error(f"Timeout while fetching episode sources for {episode_id}")
@@ -291,6 +353,68 @@ async def get_anime_episode_sources(ctx: Context, episode_id: str = "", category
             "error": str(e)
         }
 
+@mcp.tool()
+async def get_best_episode_source(ctx: Context, episode_id: str = "", category: str = "sub", probe: bool = False, quality: str = "") -> dict:
+    """
+    Get one playable streaming source for an episode from whichever server answers first.
+
+    With probe, the returned source and subtitle URLs carry their liveness and time to first byte.
+    With quality ("best", "worst" or a height such as "720p"), only the winner's source closest
+    to it is returned.
+    """
+    try:
+        logger.info(f"Received request for best episode source: episode_id='{episode_id}', category='{category}', probe={probe}, quality='{quality}'")
+
+        if not episode_id:
+            logger.error("Empty episode_id received")
+            return {
+                "success": False,
+                "error": "episode_id is required"
+            }
+
+        if "?ep=" not in episode_id:
+            logger.error(f"Invalid episode_id format: {episode_id}")
+            return {
+                "success": False,
+                "error": "episode_id must be in format 'anime-title?ep=12345'"
+            }
+
+        if category not in ["sub", "dub", "raw"]:
+            logger.error(f"Invalid category: {category}")
+            return {
+                "success": False,
+                "error": "category must be one of: sub, dub, raw"
+            }
+
+        if quality and not valid_quality(quality):
+            logger.error(f"Invalid quality: {quality}")
+            return {
+                "success": False,
+                "error": "quality must be best, worst or a height such as 720p"
+            }
+
+        try:
+            return await asyncio.wait_for(
+                scrape_best_anime_episode_source(episode_id, category, probe=probe or None, quality=quality or None),
+                timeout=90.0  # Safety net above Config.SOURCES_TOTAL_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout while racing servers for {episode_id}")
+            return {
+                "success": False,
+                "error": "Request timed out while racing servers for a source"
+            }
+
+    except asyncio.CancelledError:
+        logger.warning(f"Request cancelled for episode_id: {episode_id}")
+        raise
+    except Exception as e:
+        logger.error(f"Error getting best episode source: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 @mcp.tool()
 async def get_episode_servers(ctx: Context, episode_id: str = "") -> dict:
     """Get available servers for an anime episode."""
@@ -311,7 +435,10 @@ async def get_episode_servers(ctx: Context, episode_id: str = "") -> dict:
                 "error": "episode_id must be in format 'anime-title?ep=12345'"
             }
 
-        result = scrape_episode_servers(episode_id)
+        result = await episode_servers_flight.do(
+            normalize_key(episode_id),
+            lambda: executor.run("get_episode_servers", scrape_episode_servers, episode_id)
+        )
         logger.info(f"Successfully retrieved episode servers for {episode_id}")
 
         # Convert dataclass to dict for JSON serialization
@@ -360,7 +487,10 @@ async def get_all_episode_servers(ctx: Context, episode_id: str = "", category:
                 "error": "category must be one of: sub, dub, raw"
             }
 
-        result = scrape_episode_servers(episode_id)
+        result = await episode_servers_flight.do(
+            normalize_key(episode_id),
+            lambda: executor.run("get_all_episode_servers", scrape_episode_servers, episode_id)
+        )
         logger.info(f"Successfully retrieved episode servers for {episode_id}")
 
         # Get servers for the specified category
@@ -390,6 +520,46 @@ async def get_all_episode_servers(ctx: Context, episode_id: str = "", category:
             "error": str(e)
         }
 
+@mcp.tool()
+async def get_server_health(ctx: Context) -> dict:
+    """Get the health score, success rate, decryption failures and latency of each streaming server."""
+    return {
+        "success": True,
+        "data": {
+            "servers": server_health.stats(),
+            "halfLifeSeconds": server_health.half_life
+        }
+    }
+
+@mcp.tool()
+async def get_runtime_stats(ctx: Context) -> dict:
+    """Get runtime statistics of the server such as thread pool queue depth."""
+    return {
+        "success": True,
+        "data": {
+            "executor": executor.stats(),
+            "transport": client.stats(),
+            "asyncTransport": async_client.stats(),
+            "rateLimiter": rate_limiter.stats(),
+            "retries": retrier.stats(),
+            "circuitBreakers": circuit_breakers.stats(),
+            "hedging": episode_sources_hedger.stats(),
+            "homePageCache": home_page_cache.stats(),
+            "homePageSelectors": home_page_selector_stats(),
+            "episodeSourcesCache": episode_sources_cache.stats(),
+            "playlistCache": playlist_cache.stats(),
+            "sourceProbes": source_prober.stats(),
+            "singleFlight": {
+                flight.name: flight.stats()
+                for flight in (anime_about_flight, episode_servers_flight, episode_sources_flight)
+            },
+            "decryptionKeys": {
+                provider.name: provider.stats()
+                for provider in (megacloud_key, rapidcloud_key)
+            }
+        }
+    }
+
 # mcp.run()
 
 # Start the server when this script is run directly
@@ -1,12 +1,11 @@
 """Anime details scraping functionality."""
 from typing import Dict, Optional, Union
 import json
-import cloudscraper
-from bs4 import BeautifulSoup
 
 from src.management import get_logger
 from src.utils.constants import SRC_BASE_URL
-from src.utils.config import Config
+from src.utils.client import client
+from src.utils.parsing import parse_html
 
 # Configure logging
 logger = get_logger("AnimeAboutInfo")
@@ -21,285 +20,295 @@ def get_anime_about_info(anime_id: str) -> Optional[Dict[str, Union[Dict, bool]]
     anime_url = f"{SRC_BASE_URL}/{anime_id}"
     
     try:
-        # Use cloudscraper to bypass Cloudflare protection with more robust settings
-        scraper = cloudscraper.create_scraper(
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'mobile': False
-            },
-            delay=10,  # Add delay to avoid rate limiting
-            interpreter='js2py'  # Use js2py interpreter for better compatibility
-        )
-        
-        scraper.headers.update(Config.get_headers())
-        
-        response = scraper.get(anime_url)
+        # Use the shared cloudscraper session to bypass Cloudflare protection
+        response = client.get(anime_url, cloudflare=True, cache=True)
         response.raise_for_status()
         
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(response.text, 'lxml')
+        return parse_anime_about_info(response.text, anime_id, anime_url)
         
-        # Initialize result structure
-        result = {
-            "success": True,
-            "data": {
-                "anime": {
-                    "info": {
-                        "id": anime_id,
-                        "anilistId": None,
-                        "malId": None,
-                        "name": None,
-                        "poster": None,
-                        "description": None,
-                        "stats": {
-                            "rating": None,
-                            "quality": None,
-                            "episodes": {
-                                "sub": None,
-                                "dub": None
-                            },
-                            "type": None,
-                            "duration": None
+    except Exception as e:
+        logger.error(f"Error occurred: {str(e)}")
+        raise
+
+
+def parse_anime_about_info(
+    html: str,
+    anime_id: str,
+    anime_url: Optional[str] = None,
+    parser: Optional[str] = None
+) -> Dict[str, Union[Dict, bool]]:
+    """
+    Parse an anime details page.
+
+    Args:
+        html: HTML of the {SRC_BASE_URL}/{anime_id} page
+        anime_id: The anime ID the page belongs to
+        anime_url: URL of the page, reported when the content section is missing
+        parser: HTML parser backend, Config.HTML_PARSER by default
+
+    Returns:
+        The anime info result, or an error result if the content section is missing
+    """
+    anime_url = anime_url or f"{SRC_BASE_URL}/{anime_id}"
+    soup = parse_html(html, parser, scraper="about")
+    
+    # Initialize result structure
+    result = {
+        "success": True,
+        "data": {
+            "anime": {
+                "info": {
+                    "id": anime_id,
+                    "anilistId": None,
+                    "malId": None,
+                    "name": None,
+                    "poster": None,
+                    "description": None,
+                    "stats": {
+                        "rating": None,
+                        "quality": None,
+                        "episodes": {
+                            "sub": None,
+                            "dub": None
                         },
-                        "promotionalVideos": [],
-                        "charactersVoiceActors": []
+                        "type": None,
+                        "duration": None
                     },
-                    "moreInfo": {
-                        "genres": [],
-                        "studios": []
-                    }
+                    "promotionalVideos": [],
+                    "charactersVoiceActors": []
                 },
-                "seasons": []
-            }
+                "moreInfo": {
+                    "genres": [],
+                    "studios": []
+                }
+            },
+            "seasons": []
         }
+    }
+    
+    # Extract sync data for IDs
+    sync_data = soup.find("script", id="syncData")
+    if sync_data and sync_data.text:
+        try:
+            sync_json = json.loads(sync_data.text)
+            result["data"]["anime"]["info"]["anilistId"] = int(sync_json.get("anilist_id", 0)) or None
+            result["data"]["anime"]["info"]["malId"] = int(sync_json.get("mal_id", 0)) or None
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse sync data as JSON")
+    
+    # Extract main content using multiple selector strategies
+    content = soup.select_one("#ani_detail .container .anis-content")
+    
+    if not content:
+        # Fallback strategies if the primary selector fails
+        ani_detail = soup.select_one("#ani_detail")
+        if ani_detail:
+            # Try to find anis-content directly in ani_detail
+            content = ani_detail.select_one(".anis-content")
+            if not content:
+                # Try ani_detail-stage > anis-content
+                ani_detail_stage = ani_detail.select_one(".ani_detail-stage")
+                if ani_detail_stage:
+                    content = ani_detail_stage.select_one(".anis-content")
+                    if not content:
+                        # Try to find container in ani_detail-stage then anis-content
+                        container = ani_detail_stage.select_one(".container")
+                        if container:
+                            content = container.select_one(".anis-content")
+        else:
+            # If ani_detail not found, try to find anis-content directly in the soup
+            content = soup.select_one(".anis-content")
+
+        # If still not found, try the aggressive approach (walking up from .film-poster)
+        if not content:
+            film_poster = soup.select_one(".film-poster")
+            if film_poster:
+                parent = film_poster.parent
+                while parent and parent.name != 'body':
+                    if 'anis-content' in parent.get('class', []):
+                        content = parent
+                        break
+                    parent = parent.parent
+
+    if content:
+        # Basic info
+        name_elem = content.select_one(".anisc-detail .film-name.dynamic-name")
+        if name_elem:
+            result["data"]["anime"]["info"]["name"] = name_elem.text.strip()
         
-        # Extract sync data for IDs
-        sync_data = soup.find("script", id="syncData")
-        if sync_data and sync_data.text:
-            try:
-                sync_json = json.loads(sync_data.text)
-                result["data"]["anime"]["info"]["anilistId"] = int(sync_json.get("anilist_id", 0)) or None
-                result["data"]["anime"]["info"]["malId"] = int(sync_json.get("mal_id", 0)) or None
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse sync data as JSON")
+        desc_elem = content.select_one(".anisc-detail .film-description .text")
+        if desc_elem:
+            result["data"]["anime"]["info"]["description"] = desc_elem.text.strip()
         
-        # Extract main content using multiple selector strategies
-        content = soup.select_one("#ani_detail .container .anis-content")
+        # Extract poster - ensure we're using the same selector as test_advanced.py
+        poster_elem = content.select_one(".film-poster .film-poster-img")
+        if poster_elem:
+            if "src" in poster_elem.attrs:
+                result["data"]["anime"]["info"]["poster"] = poster_elem["src"].strip()
+            elif "data-src" in poster_elem.attrs:
+                result["data"]["anime"]["info"]["poster"] = poster_elem["data-src"].strip()
         
-        if not content:
-            # Fallback strategies if the primary selector fails
-            ani_detail = soup.select_one("#ani_detail")
-            if ani_detail:
-                # Try to find anis-content directly in ani_detail
-                content = ani_detail.select_one(".anis-content")
-                if not content:
-                    # Try ani_detail-stage > anis-content
-                    ani_detail_stage = ani_detail.select_one(".ani_detail-stage")
-                    if ani_detail_stage:
-                        content = ani_detail_stage.select_one(".anis-content")
-                        if not content:
-                            # Try to find container in ani_detail-stage then anis-content
-                            container = ani_detail_stage.select_one(".container")
-                            if container:
-                                content = container.select_one(".anis-content")
-            else:
-                # If ani_detail not found, try to find anis-content directly in the soup
-                content = soup.select_one(".anis-content")
-
-            # If still not found, try the aggressive approach (walking up from .film-poster)
-            if not content:
-                film_poster = soup.select_one(".film-poster")
-                if film_poster:
-                    parent = film_poster.parent
-                    while parent and parent.name != 'body':
-                        if 'anis-content' in parent.get('class', []):
-                            content = parent
-                            break
-                        parent = parent.parent
-
-        if content:
-            # Basic info
-            name_elem = content.select_one(".anisc-detail .film-name.dynamic-name")
-            if name_elem:
-                result["data"]["anime"]["info"]["name"] = name_elem.text.strip()
+        # Stats
+        stats = content.select_one(".film-stats")
+        if stats:
+            # Rating
+            tick_pg = stats.select_one(".tick .tick-pg")
+            if tick_pg:
+                result["data"]["anime"]["info"]["stats"]["rating"] = tick_pg.text.strip()
             
-            desc_elem = content.select_one(".anisc-detail .film-description .text")
-            if desc_elem:
-                result["data"]["anime"]["info"]["description"] = desc_elem.text.strip()
+            # Quality
+            tick_quality = stats.select_one(".tick .tick-quality")
+            if tick_quality:
+                result["data"]["anime"]["info"]["stats"]["quality"] = tick_quality.text.strip()
             
-            # Extract poster - ensure we're using the same selector as test_advanced.py
-            poster_elem = content.select_one(".film-poster .film-poster-img")
-            if poster_elem:
-                if "src" in poster_elem.attrs:
-                    result["data"]["anime"]["info"]["poster"] = poster_elem["src"].strip()
-                elif "data-src" in poster_elem.attrs:
-                    result["data"]["anime"]["info"]["poster"] = poster_elem["data-src"].strip()
+            # Type and Duration - use the method from test_advanced.py
+            tick_type = stats.select_one(".tick")
+            if tick_type:
+                type_text = tick_type.text.strip().replace("\n", " ").split()
+                if len(type_text) >= 2:
+                    result["data"]["anime"]["info"]["stats"]["type"] = type_text[-2]
+                    result["data"]["anime"]["info"]["stats"]["duration"] = type_text[-1]
             
-            # Stats
-            stats = content.select_one(".film-stats")
-            if stats:
-                # Rating
-                tick_pg = stats.select_one(".tick .tick-pg")
-                if tick_pg:
-                    result["data"]["anime"]["info"]["stats"]["rating"] = tick_pg.text.strip()
+            # Episodes
+            sub_eps = stats.select_one(".tick .tick-sub")
+            dub_eps = stats.select_one(".tick .tick-dub")
+            
+            if sub_eps:    
+                result["data"]["anime"]["info"]["stats"]["episodes"]["sub"] = int(sub_eps.text.strip())
+            
+            if dub_eps:    
+                result["data"]["anime"]["info"]["stats"]["episodes"]["dub"] = int(dub_eps.text.strip())
                 
-                # Quality
-                tick_quality = stats.select_one(".tick .tick-quality")
-                if tick_quality:
-                    result["data"]["anime"]["info"]["stats"]["quality"] = tick_quality.text.strip()
+        # Extract genres
+        genres = content.select(".anisc-info .item-list a")
+        if genres:
+            result["data"]["anime"]["moreInfo"]["genres"] = [genre.text.strip() for genre in genres]
+        
+        # Extract studios
+        studios = content.select(".anisc-info .item-title a.name")
+        if studios:
+            result["data"]["anime"]["moreInfo"]["studios"] = [studio.text.strip() for studio in studios]
+        
+        # Extract seasons
+        seasons = soup.select(".block_area-seasons .os-item")
+        if seasons:
+            for season in seasons:
+                season_obj = {
+                    "id": None,
+                    "name": None,
+                    "title": None,
+                    "poster": None,
+                    "isCurrent": False
+                }
                 
-                # Type and Duration - use the method from test_advanced.py
-                tick_type = stats.select_one(".tick")
-                if tick_type:
-                    type_text = tick_type.text.strip().replace("\n", " ").split()
-                    if len(type_text) >= 2:
-                        result["data"]["anime"]["info"]["stats"]["type"] = type_text[-2]
-                        result["data"]["anime"]["info"]["stats"]["duration"] = type_text[-1]
+                # Extract season ID
+                season_link = season.select_one("a")
+                if season_link and "href" in season_link.attrs:
+                    season_obj["id"] = season_link["href"].strip("/")
                 
-                # Episodes
-                sub_eps = stats.select_one(".tick .tick-sub")
-                dub_eps = stats.select_one(".tick .tick-dub")
+                # Extract season name
+                name = season.select_one(".title")
+                if name:
+                    season_obj["title"] = name.text.strip()
+                    season_obj["name"] = name.text.strip()
                 
-                if sub_eps:    
-                    result["data"]["anime"]["info"]["stats"]["episodes"]["sub"] = int(sub_eps.text.strip())
+                # Extract season poster
+                poster = season.select_one(".season-poster")
+                if poster and "style" in poster.attrs:
+                    style = poster["style"]
+                    if "background-image: url(" in style:
+                        season_obj["poster"] = style.split("url(")[1].split(")")[0].strip("'\"")
+                
+                if "active" in season.get("class", []):
+                    season_obj["isCurrent"] = True
+                
+                result["data"]["seasons"].append(season_obj)
+        
+        # Extract characters and voice actors
+        characters = soup.select(".block-actors-content .bac-item")
+        if characters:
+            for char in characters:
+                char_name = char.select_one(".pi-name a")
+                char_role = char.select_one(".pi-cast")
+                voice_actor_name = char.select_one(".per-info.rtl .pi-detail a")
+                voice_actor_role = char.select_one(".per-info.rtl .pi-cast")
                 
-                if dub_eps:    
-                    result["data"]["anime"]["info"]["stats"]["episodes"]["dub"] = int(dub_eps.text.strip())
+                if char_name and char_role:
+                    # Extract character ID from href
+                    char_id = ""
+                    if "href" in char_name.attrs:
+                        href = char_name["href"]
+                        if href.startswith("/character/"):
+                            char_id = href.split("/")[-1]
                     
-            # Extract genres
-            genres = content.select(".anisc-info .item-list a")
-            if genres:
-                result["data"]["anime"]["moreInfo"]["genres"] = [genre.text.strip() for genre in genres]
-            
-            # Extract studios
-            studios = content.select(".anisc-info .item-title a.name")
-            if studios:
-                result["data"]["anime"]["moreInfo"]["studios"] = [studio.text.strip() for studio in studios]
-            
-            # Extract seasons
-            seasons = soup.select(".block_area-seasons .os-item")
-            if seasons:
-                for season in seasons:
-                    season_obj = {
-                        "id": None,
-                        "name": None,
-                        "title": None,
-                        "poster": None,
-                        "isCurrent": False
+                    # Extract voice actor ID from href
+                    va_id = ""
+                    if voice_actor_name and "href" in voice_actor_name.attrs:
+                        va_href = voice_actor_name["href"]
+                        if va_href.startswith("/people/"):
+                            va_id = va_href.split("/")[-1]
+                    
+                    char_obj = {
+                        "character": {
+                            "id": char_id,
+                            "poster": "",
+                            "name": char_name.text.strip(),
+                            "cast": char_role.text.strip()
+                        },
+                        "voiceActor": {
+                            "id": va_id,
+                            "poster": "",
+                            "name": voice_actor_name.text.strip() if voice_actor_name else "",
+                            "cast": voice_actor_role.text.strip() if voice_actor_role else ""
+                        }
                     }
                     
-                    # Extract season ID
-                    season_link = season.select_one("a")
-                    if season_link and "href" in season_link.attrs:
-                        season_obj["id"] = season_link["href"].strip("/")
+                    # Extract character poster
+                    char_poster = char.select_one(".per-info.ltr .pi-avatar img")
+                    if char_poster and "data-src" in char_poster.attrs:
+                        char_obj["character"]["poster"] = char_poster["data-src"].strip()
                     
-                    # Extract season name
-                    name = season.select_one(".title")
-                    if name:
-                        season_obj["title"] = name.text.strip()
-                        season_obj["name"] = name.text.strip()
+                    # Extract voice actor poster
+                    va_poster = char.select_one(".per-info.rtl .pi-avatar img")
+                    if va_poster and "data-src" in va_poster.attrs:
+                        char_obj["voiceActor"]["poster"] = va_poster["data-src"].strip()
                     
-                    # Extract season poster
-                    poster = season.select_one(".season-poster")
-                    if poster and "style" in poster.attrs:
-                        style = poster["style"]
-                        if "background-image: url(" in style:
-                            season_obj["poster"] = style.split("url(")[1].split(")")[0].strip("'\"")
+                    result["data"]["anime"]["info"]["charactersVoiceActors"].append(char_obj)
+        
+        # Extract promotional videos
+        promos = soup.select(".block_area-promotions-list .item")
+        if promos:
+            for promo in promos:
+                title = promo.select_one(".sii-title")
+                if title:
+                    promo_obj = {
+                        "title": title.text.strip(),
+                        "source": None,
+                        "thumbnail": None
+                    }
                     
-                    if "active" in season.get("class", []):
-                        season_obj["isCurrent"] = True
+                    # Extract promo source
+                    if "data-src" in promo.attrs:
+                        promo_obj["source"] = promo["data-src"].strip()
                     
-                    result["data"]["seasons"].append(season_obj)
-            
-            # Extract characters and voice actors
-            characters = soup.select(".block-actors-content .bac-item")
-            if characters:
-                for char in characters:
-                    char_name = char.select_one(".pi-name a")
-                    char_role = char.select_one(".pi-cast")
-                    voice_actor_name = char.select_one(".per-info.rtl .pi-detail a")
-                    voice_actor_role = char.select_one(".per-info.rtl .pi-cast")
+                    # Extract promo thumbnail
+                    thumbnail = promo.select_one("img")
+                    if thumbnail and "src" in thumbnail.attrs:
+                        promo_obj["thumbnail"] = thumbnail["src"].strip()
                     
-                    if char_name and char_role:
-                        # Extract character ID from href
-                        char_id = ""
-                        if "href" in char_name.attrs:
-                            href = char_name["href"]
-                            if href.startswith("/character/"):
-                                char_id = href.split("/")[-1]
-                        
-                        # Extract voice actor ID from href
-                        va_id = ""
-                        if voice_actor_name and "href" in voice_actor_name.attrs:
-                            va_href = voice_actor_name["href"]
-                            if va_href.startswith("/people/"):
-                                va_id = va_href.split("/")[-1]
-                        
-                        char_obj = {
-                            "character": {
-                                "id": char_id,
-                                "poster": "",
-                                "name": char_name.text.strip(),
-                                "cast": char_role.text.strip()
-                            },
-                            "voiceActor": {
-                                "id": va_id,
-                                "poster": "",
-                                "name": voice_actor_name.text.strip() if voice_actor_name else "",
-                                "cast": voice_actor_role.text.strip() if voice_actor_role else ""
-                            }
-                        }
-                        
-                        # Extract character poster
-                        char_poster = char.select_one(".per-info.ltr .pi-avatar img")
-                        if char_poster and "data-src" in char_poster.attrs:
-                            char_obj["character"]["poster"] = char_poster["data-src"].strip()
-                        
-                        # Extract voice actor poster
-                        va_poster = char.select_one(".per-info.rtl .pi-avatar img")
-                        if va_poster and "data-src" in va_poster.attrs:
-                            char_obj["voiceActor"]["poster"] = va_poster["data-src"].strip()
-                        
-                        result["data"]["anime"]["info"]["charactersVoiceActors"].append(char_obj)
-            
-            # Extract promotional videos
-            promos = soup.select(".block_area-promotions-list .item")
-            if promos:
-                for promo in promos:
-                    title = promo.select_one(".sii-title")
-                    if title:
-                        promo_obj = {
-                            "title": title.text.strip(),
-                            "source": None,
-                            "thumbnail": None
-                        }
-                        
-                        # Extract promo source
-                        if "data-src" in promo.attrs:
-                            promo_obj["source"] = promo["data-src"].strip()
-                        
-                        # Extract promo thumbnail
-                        thumbnail = promo.select_one("img")
-                        if thumbnail and "src" in thumbnail.attrs:
-                            promo_obj["thumbnail"] = thumbnail["src"].strip()
-                        
-                        result["data"]["anime"]["info"]["promotionalVideos"].append(promo_obj)
+                    result["data"]["anime"]["info"]["promotionalVideos"].append(promo_obj)
 
-            
-            return result
-        else:
-            logger.warning("Could not find main content section")
-            return {
-                "success": False,
-                "error": "Could not find anime content section using any known selectors.",
-                "anime_id": anime_id,
-                "url": anime_url
-            }
         
-    except Exception as e:
-        logger.error(f"Error occurred: {str(e)}")
-        raise
+        return result
+    else:
+        logger.warning("Could not find main content section")
+        return {
+            "success": False,
+            "error": "Could not find anime content section using any known selectors.",
+            "anime_id": anime_id,
+            "url": anime_url
+        }
+
 
 # if __name__ == "__main__":
 #     # Test with a known anime ID.
@@ -1,22 +1,61 @@
 """Anime episode sources scraping functionality."""
-import requests
+import aiohttp
 import urllib.parse
 from bs4 import BeautifulSoup
 import json
 import asyncio
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional
 
 # Import previously converted modules
 from src.scrapers.extractor.rapidcloud import RapidCloud
 from src.scrapers.extractor.streamsb import StreamSB
 from src.scrapers.extractor.streamtape import StreamTape
 from src.scrapers.extractor.megacloud import MegaCloud
+from src.scrapers.episodeContext import EpisodeContext
+from src.scrapers.animeEpisodeServers import SERVER_ID_MAP
 from src.utils.constants import SRC_BASE_URL, SRC_AJAX_URL, USER_AGENT_HEADER
+from src.utils.config import Config
+from src.utils.client import async_client
+from src.utils.singleflight import SingleFlight, normalize_key
+from src.utils.cache import TTLCache
+from src.utils.retry import deadline_scope
+from src.utils.hedging import Hedger
+from src.utils.circuitbreaker import CircuitOpenError, circuit_breakers
+from src.utils.health import ServerHealth
+from src.utils.probe import source_prober
+from src.utils.m3u8 import parse_quality, select_sources
 from src.management import get_logger
 
 # Configure logging
 logger = get_logger("AnimeEpisodeSources")
 
+# Concurrent requests for the same episode, server and category share one extraction
+episode_sources_flight = SingleFlight("getAnimeEpisodeSources")
+
+# Extracted sources, kept until their signed URLs are about to expire
+episode_sources_cache = TTLCache(
+    "episode_sources",
+    ttl=Config.SOURCES_CACHE_DEFAULT_TTL,
+    max_entries=Config.SOURCES_CACHE_MAX_ENTRIES
+)
+
+# Servers slower than their usual tail latency get a duplicate extraction
+episode_sources_hedger = Hedger(
+    "episode_sources",
+    percentile=Config.SOURCES_HEDGE_PERCENTILE,
+    min_samples=Config.SOURCES_HEDGE_MIN_SAMPLES,
+    min_delay=Config.SOURCES_HEDGE_MIN_DELAY,
+    budget_ratio=Config.SOURCES_HEDGE_BUDGET_RATIO,
+    window=Config.SOURCES_HEDGE_LATENCY_WINDOW
+)
+
+# Decaying success rate, decryption failures and latency per server ID, used to order servers
+server_health = ServerHealth(names=SERVER_ID_MAP)
+
+# Query parameters embed hosts use for the expiry timestamp of signed URLs
+EXPIRY_PARAMS = ("expires", "expire", "expiry", "exp", "e")
+
 class HiAnimeError(Exception):
     """Custom exception for anime scraping errors."""
     def __init__(self, message: str, context: str, status_code: int):
@@ -41,64 +80,54 @@ def retrieveServerId(soup: BeautifulSoup, index: int, category: str):
 async def _getAnimeEpisodeSources(
     episode_id: str,
     server: str = Servers.VidStreaming,
-    category: str = "sub"
+    category: str = "sub",
+    context: Optional[EpisodeContext] = None
 ):
     if episode_id.startswith("http"):
         server_url = episode_id # In Python, we can directly use the string URL
-        if server == Servers.VidStreaming or server == Servers.VidCloud:
-            # MegaCloud extract2 is async
-            extracted_data = await MegaCloud().extract3(server_url)
-            return {
-                "headers": {"Referer": urllib.parse.urlparse(server_url).scheme + "://" + urllib.parse.urlparse(server_url).netloc + "/"},
-                **extracted_data,
-            }
-        elif server == Servers.StreamSB:
-            # StreamSB extract is not async in the converted version, but let's keep it consistent with TS
-            sources = StreamSB().extract(server_url, True)
-            return {
-                "headers": {
-                    "Referer": server_url,
-                    "watchsb": "streamsb",
-                    "User-Agent": USER_AGENT_HEADER,
-                },
-                "sources": sources,
-            }
-        elif server == Servers.StreamTape:
-            # StreamTape extract is not async in the converted version
-            sources = StreamTape().extract(server_url)
-            return {
-                "headers": {
-                    "Referer": server_url,
-                    "User-Agent": USER_AGENT_HEADER,
-                },
-                "sources": sources,
-            }
-        else: # RapidCloud
-            # RapidCloud extract is async
-            extracted_data = await RapidCloud().extract(server_url)
-            return {
-                "headers": {"Referer": server_url},
-                **extracted_data,
-            }
+        # Hosts that keep failing are skipped at once until a background probe finds them back up
+        async with circuit_breakers.guard(server_url, server):
+            if server == Servers.VidStreaming or server == Servers.VidCloud:
+                # MegaCloud extract2 is async
+                extracted_data = await MegaCloud().extract3(server_url)
+                return {
+                    "headers": {"Referer": urllib.parse.urlparse(server_url).scheme + "://" + urllib.parse.urlparse(server_url).netloc + "/"},
+                    **extracted_data,
+                }
+            elif server == Servers.StreamSB:
+                sources = await StreamSB().extract(server_url, True)
+                return {
+                    "headers": {
+                        "Referer": server_url,
+                        "watchsb": "streamsb",
+                        "User-Agent": USER_AGENT_HEADER,
+                    },
+                    "sources": sources,
+                }
+            elif server == Servers.StreamTape:
+                sources = await StreamTape().extract(server_url)
+                return {
+                    "headers": {
+                        "Referer": server_url,
+                        "User-Agent": USER_AGENT_HEADER,
+                    },
+                    "sources": sources,
+                }
+            else: # RapidCloud
+                # RapidCloud extract is async
+                extracted_data = await RapidCloud().extract(server_url)
+                return {
+                    "headers": {"Referer": server_url},
+                    **extracted_data,
+                }
 
-    ep_id_full_url = f"{SRC_BASE_URL}/watch/{episode_id}"
-    logger.info(f"EPISODE_ID: {ep_id_full_url}")
+    logger.info(f"EPISODE_ID: {SRC_BASE_URL}/watch/{episode_id}")
 
     try:
-        # Extract the actual episode ID from the URL for the AJAX call
-        # Assuming episodeId format is like 'some-anime-title-episode-1?ep=12345'
-        ep_id_param = episode_id.split("?ep=")[1] if "?ep=" in episode_id else episode_id
-
-        resp = requests.get(
-            f"{SRC_AJAX_URL}/v2/episode/servers?episodeId={ep_id_param}",
-            headers={
-                "Referer": ep_id_full_url,
-                "X-Requested-With": "XMLHttpRequest",
-            },
-            timeout=10  # Add timeout to prevent hanging
-        )
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.json()["html"], 'html.parser')
+        # The servers fragment is fetched once per episode and shared between servers
+        if context is None:
+            context = EpisodeContext(episode_id)
+        soup = await context.get_servers_soup()
 
         server_id = None
 
@@ -119,7 +148,7 @@ async def _getAnimeEpisodeSources(
             if not server_id: raise Exception("StreamTape not found")
 
         # Fetch sources link
-        sources_resp = requests.get(
+        sources_resp = await async_client.get(
             f"{SRC_AJAX_URL}/v2/episode/sources?id={server_id}",
             timeout=10  # Add timeout to prevent hanging
         )
@@ -129,7 +158,9 @@ async def _getAnimeEpisodeSources(
 
         return await _getAnimeEpisodeSources(link, server, category)
 
-    except requests.exceptions.RequestException as e:
+    except CircuitOpenError as e:
+        raise HiAnimeError(str(e), "_getAnimeEpisodeSources", 503) from e
+    except aiohttp.ClientError as e:
         raise HiAnimeError.wrapError(e, "_getAnimeEpisodeSources")
     except Exception as err:
         raise HiAnimeError.wrapError(err, "_getAnimeEpisodeSources")
@@ -138,7 +169,9 @@ async def _getAnimeEpisodeSources(
 async def getAnimeEpisodeSources(
     episode_id: str,
     server: str,
-    category: str
+    category: str,
+    context: Optional[EpisodeContext] = None,
+    coalesce: bool = True
 ):
     if not episode_id or "?ep=" not in episode_id:
         raise HiAnimeError(
@@ -153,46 +186,102 @@ async def getAnimeEpisodeSources(
             400
         )
 
-    mal_id = None
-    anilist_id = None
+    if context is None:
+        context = EpisodeContext(episode_id)
 
-    anime_url = f"{SRC_BASE_URL}/watch/{episode_id.split('?ep=')[0]}"
+    cached = cached_episode_sources(episode_id, server, category)
+    if cached is not None:
+        logger.info(f"Using cached sources for {episode_id} ({server}, {category})")
+        return cached
 
-    try:
-        # Concurrently fetch episode sources and anime page data
-        episode_src_data_task = _getAnimeEpisodeSources(episode_id, server, category)
-        anime_src_req_task = asyncio.to_thread(requests.get, anime_url, headers={
-            "Referer": SRC_BASE_URL,
-            "User-Agent": USER_AGENT_HEADER,
-            "X-Requested-With": "XMLHttpRequest",
-        }, timeout=10)
-
-        episode_src_data, anime_src_resp = await asyncio.gather(
-            episode_src_data_task, anime_src_req_task
-        )
-        anime_src_resp.raise_for_status()
+    key = normalize_key(episode_id, server, category.lower())
+    if not coalesce:
+        # A hedged attempt must not simply join the slow call it is racing
+        return dict(await _extractAndCacheSources(key, episode_id, server, category, context))
+
+    result = await episode_sources_flight.do(
+        key,
+        lambda: _extractAndCacheSources(key, episode_id, server, category, context)
+    )
+    return dict(result)
 
-        logger.info(f"EPISODE_SRC_DATA: {json.dumps(episode_src_data)}")
 
-        soup = BeautifulSoup(anime_src_resp.text, 'html.parser')
+def cached_episode_sources(episode_id: str, server: str, category: str) -> Optional[Dict[str, Any]]:
+    """Get a copy of the cached sources of one server, or None if there are none."""
+    if not Config.SOURCES_CACHE_ENABLED:
+        return None
+    cached = episode_sources_cache.get(normalize_key(episode_id, server, category.lower()))
+    return dict(cached) if cached is not None else None
 
+
+def signed_url_expiry(url: str) -> Optional[float]:
+    """
+    Get the expiry of a signed URL as a Unix timestamp.
+
+    Returns:
+        The timestamp from an expires/exp style query parameter, or None if there is none
+    """
+    try:
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    except ValueError:
+        return None
+    for name, values in query.items():
+        if name.lower() not in EXPIRY_PARAMS:
+            continue
         try:
-            sync_data_script = soup.find("script", id="syncData")
-            if sync_data_script and sync_data_script.string:
-                sync_data = json.loads(sync_data_script.string)
-                anilist_id = int(sync_data.get("anilist_id")) if sync_data.get("anilist_id") else None
-                mal_id = int(sync_data.get("mal_id")) if sync_data.get("mal_id") else None
-        except Exception as err:
-            logger.info(f"Error parsing syncData: {err}")
-            anilist_id = None
-            mal_id = None
+            value = float(values[0])
+        except ValueError:
+            continue
+        if value > 1e12:  # milliseconds
+            value /= 1000
+        if value > 1e9:
+            return value
+    return None
+
+
+def sources_cache_ttl(sources: List[Dict[str, Any]]) -> float:
+    """
+    Seconds extracted sources may be cached, based on the earliest expiry of their URLs.
+
+    Returns:
+        The TTL, or 0 if the sources must not be cached
+    """
+    if not sources:
+        return 0
+    expiries = [signed_url_expiry(source.get("url") or "") for source in sources]
+    expiries = [expiry for expiry in expiries if expiry is not None]
+    if not expiries:
+        return Config.SOURCES_CACHE_DEFAULT_TTL
+    ttl = min(expiries) - time.time() - Config.SOURCES_CACHE_EXPIRY_MARGIN
+    return max(0, min(ttl, Config.SOURCES_CACHE_MAX_TTL))
+
+
+async def _extractAndCacheSources(key, episode_id: str, server: str, category: str, context: EpisodeContext):
+    result = await _fetchAnimeEpisodeSources(episode_id, server, category, context)
+    if Config.SOURCES_CACHE_ENABLED:
+        ttl = sources_cache_ttl(result.get("sources", []))
+        if ttl > 0:
+            episode_sources_cache.set(key, result, ttl)
+            logger.debug(f"Cached sources for {episode_id} ({server}, {category}) for {ttl:.0f}s")
+    return result
+
+
+async def _fetchAnimeEpisodeSources(episode_id: str, server: str, category: str, context: EpisodeContext):
+    try:
+        # Concurrently fetch episode sources and the anime sync IDs
+        episode_src_data, (anilist_id, mal_id) = await asyncio.gather(
+            _getAnimeEpisodeSources(episode_id, server, category, context),
+            context.get_sync_ids()
+        )
+
+        logger.info(f"EPISODE_SRC_DATA: {json.dumps(episode_src_data)}")
 
         episode_src_data["anilistID"] = anilist_id
         episode_src_data["malID"] = mal_id
 
         return episode_src_data
 
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         raise HiAnimeError.wrapError(e, "getAnimeEpisodeSources")
     except Exception as err:
         raise HiAnimeError.wrapError(err, "getAnimeEpisodeSources")
@@ -208,7 +297,13 @@ if not hasattr(HiAnimeError, 'wrapError'):
     HiAnimeError.wrapError = staticmethod(_wrap_error)
 
 
-async def get_anime_episode_sources(episode_id: str, server: str = "VidStreaming", category: str = "sub") -> Dict[str, Any]:
+async def get_anime_episode_sources(
+    episode_id: str,
+    server: str = "VidStreaming",
+    category: str = "sub",
+    probe: Optional[bool] = None,
+    quality: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Get anime episode sources for streaming.
 
@@ -216,6 +311,8 @@ async def get_anime_episode_sources(episode_id: str, server: str = "VidStreaming
         episode_id: The episode ID in format 'anime-title?ep=12345'
         server: The streaming server to use (VidStreaming, VidCloud, StreamSB, StreamTape)
         category: The category (sub or dub)
+        probe: Check that every source and subtitle URL answers (defaults to Config.SOURCE_PROBE_ENABLED)
+        quality: Keep only the source closest to "best", "worst" or a height such as "720p"
 
     Returns:
         Dictionary containing episode sources and metadata
@@ -234,7 +331,13 @@ async def get_anime_episode_sources(episode_id: str, server: str = "VidStreaming
             logger.warning(f"Invalid category '{category}', defaulting to sub")
             category = "sub"
 
+        _check_quality(quality, "get_anime_episode_sources")
+
         result = await getAnimeEpisodeSources(episode_id, server, category)
+        if quality:
+            result = {**result, "sources": select_sources(result.get("sources", []), quality)}
+        if probe if probe is not None else Config.SOURCE_PROBE_ENABLED:
+            result = (await source_prober.annotate([result]))[0]
         logger.info(f"Successfully retrieved episode sources for {episode_id}")
 
         return {
@@ -259,13 +362,237 @@ async def get_anime_episode_sources(episode_id: str, server: str = "VidStreaming
         }
 
 
-async def get_all_anime_episode_sources(episode_id: str, category: str = "sub") -> Dict[str, Any]:
+def _check_quality(quality: Optional[str], context: str):
+    """Reject a requested quality select_sources() would not understand."""
+    if not quality:
+        return
+    try:
+        parse_quality(quality)
+    except ValueError as e:
+        raise HiAnimeError(str(e), context, 400) from e
+
+
+# Map server IDs to server names for the episode sources scraper
+SERVER_ID_TO_SCRAPER = {
+    1: Servers.VidCloud,    # rapidcloud
+    3: Servers.StreamTape,  # streamtape
+    4: Servers.VidStreaming, # vidstreaming
+    5: Servers.StreamSB,    # streamsb
+    6: Servers.VidCloud,    # megacloud (uses same extractor as rapidcloud)
+}
+
+
+async def _fetch_server_sources(context: EpisodeContext, server, category: str, deadline: float):
+    """
+    Extract sources from a single server, never raising except on cancellation.
+
+    Returns:
+        Tuple of (server entry, failed) where the entry carries the sources or the error
+        together with the time spent on this server in milliseconds
+    """
+    server_name = server.serverName
+    server_id = server.serverId
+    hianimeid = server.hianimeid
+
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+
+    def failure(error: str, decryption_failure: bool = False, record: bool = True):
+        if record:
+            server_health.record(server_id, False, decryption_failure=decryption_failure, error=error)
+        return {
+            "serverName": server_name,
+            "serverId": server_id,
+            "hianimeid": hianimeid,
+            "error": error,
+            "latencyMs": round((loop.time() - started_at) * 1000)
+        }, True
+
+    # The per-server timeout starts once the server gets a slot, but never runs past
+    # the overall budget so that the servers that did finish are still returned
+    timeout = min(Config.SOURCES_SERVER_TIMEOUT, deadline - started_at)
+    if timeout <= 0:
+        logger.warning(f"✗ Skipping {server_name}: time budget for all servers exhausted")
+        return failure("Skipped because the time budget for all servers was exhausted", record=False)
+
+    try:
+        # Map server ID to the appropriate server name for the scraper
+        scraper_server = SERVER_ID_TO_SCRAPER.get(server_id, Servers.VidStreaming)
+
+        logger.info(f"Fetching sources from {server_name} (ID: {server_id}, Scraper: {scraper_server})")
+
+        def attempt(hedged: bool):
+            return getAnimeEpisodeSources(context.episode_id, scraper_server, category, context, coalesce=not hedged)
+
+        # Get sources for this specific server with timeout; retries stop at the same deadline.
+        # Cache hits skip the hedger so they do not drag the observed latencies down.
+        server_result = cached_episode_sources(context.episode_id, scraper_server, category)
+        if server_result is None:
+            with deadline_scope(timeout):
+                if Config.SOURCES_HEDGING_ENABLED:
+                    extraction = episode_sources_hedger.run(server_name, attempt)
+                else:
+                    extraction = attempt(False)
+                server_result = await asyncio.wait_for(extraction, timeout=timeout)
+            server_health.record(server_id, True, latency=loop.time() - started_at)
+
+        logger.info(f"✓ Successfully fetched sources from {server_name}")
+        return {
+            "serverName": server_name,
+            "serverId": server_id,
+            "hianimeid": hianimeid,
+            "sources": server_result.get("sources", []),
+            "headers": server_result.get("headers", {}),
+            "subtitles": server_result.get("subtitles", server_result.get("tracks", [])),
+            "anilistID": server_result.get("anilistID"),
+            "malID": server_result.get("malID"),
+            "latencyMs": round((loop.time() - started_at) * 1000)
+        }, False
+
+    except asyncio.TimeoutError:
+        logger.warning(f"✗ Timeout fetching sources from {server_name} ({round(timeout, 1):g}s limit)")
+        return failure(f"Request timed out after {round(timeout, 1):g} seconds")
+    except asyncio.CancelledError:
+        logger.warning(f"✗ Request cancelled while fetching from {server_name}")
+        # Don't report as failed, just re-raise the cancellation
+        raise
+    except Exception as e:
+        error_msg = str(e)
+        if isinstance(e.__cause__, CircuitOpenError):
+            # Skipped without contacting the server, so this says nothing new about its health
+            logger.warning(f"✗ Skipping {server_name}: {error_msg}")
+            return failure(error_msg, record=False)
+        if "Padding is incorrect" in error_msg or "padding" in error_msg.lower():
+            error_msg = f"Decryption failed for {server_name}. The server may have updated its encryption method."
+            logger.warning(f"✗ Decryption error for {server_name}: {str(e)}")
+            return failure(error_msg, decryption_failure=True)
+        logger.warning(f"✗ Failed to fetch sources from {server_name}: {str(e)}")
+        return failure(error_msg)
+
+
+def playable_sources(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Get the sources whose URL is an absolute http(s) URL a player can open."""
+    playable = []
+    for source in sources or []:
+        url = urllib.parse.urlparse(source.get("url") or "")
+        if url.scheme in ("http", "https") and url.netloc:
+            playable.append(source)
+    return playable
+
+
+def _category_servers(servers_result, category: str) -> list:
+    if category == "sub":
+        return servers_result.sub
+    if category == "dub":
+        return servers_result.dub
+    return servers_result.raw
+
+
+async def _extract_servers(
+    context: EpisodeContext,
+    servers: list,
+    category: str,
+    deadline: float,
+    limit: int,
+    enough_servers: int = 0
+):
+    """
+    Extract sources from servers, at most `limit` at a time and healthiest first.
+
+    The semaphore hands out slots in the order the servers wait for them. With
+    enough_servers above 0, servers still waiting are skipped and running ones
+    cancelled once that many returned playable sources.
+
+    Returns:
+        Tuple of (successful entries by server name, failed entries, skipped server names),
+        each in the site's order of the servers
+    """
+    semaphore = asyncio.Semaphore(limit)
+    ordered_servers = server_health.order(servers, key=lambda server: server.serverId)
+
+    sources_data = {}
+    failed_servers = []
+    skipped_servers = []
+    good_servers = 0
+
+    def have_enough() -> bool:
+        return bool(enough_servers) and good_servers >= enough_servers
+
+    def collect(server, result):
+        if result is None:
+            skipped_servers.append(server.serverName)
+            return
+        server_entry, failed = result
+        if failed:
+            failed_servers.append(server_entry)
+        else:
+            sources_data[server_entry["serverName"]] = server_entry
+
+    async def fetch_server(server):
+        nonlocal good_servers
+        async with semaphore:
+            # Servers still waiting for a slot are not started once enough have answered
+            if have_enough():
+                return server, None
+            server_entry, failed = await _fetch_server_sources(context, server, category, deadline)
+            if not failed and playable_sources(server_entry["sources"]):
+                good_servers += 1
+            return server, (server_entry, failed)
+
+    tasks = [asyncio.ensure_future(fetch_server(server)) for server in ordered_servers]
+    handled = set()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            server, result = await next_done
+            handled.add(id(server))
+            collect(server, result)
+            if result is not None and not result[1] and have_enough():
+                break
+    finally:
+        for task, server in zip(tasks, ordered_servers):
+            if id(server) in handled:
+                continue
+            # Servers that finished while the last result was handled keep what they found
+            if task.done() and not task.cancelled() and task.exception() is None:
+                collect(*task.result())
+            else:
+                task.cancel()
+                skipped_servers.append(server.serverName)
+    if skipped_servers:
+        logger.info(f"Enough servers returned sources, skipped {', '.join(skipped_servers)}")
+
+    # Report servers in the site's order whatever order they finished in
+    position = {server.serverName: index for index, server in enumerate(servers)}
+    sources_data = dict(sorted(sources_data.items(), key=lambda item: position.get(item[0], 0)))
+    failed_servers.sort(key=lambda entry: position.get(entry["serverName"], 0))
+    skipped_servers.sort(key=lambda name: position.get(name, 0))
+    return sources_data, failed_servers, skipped_servers
+
+
+async def get_all_anime_episode_sources(
+    episode_id: str,
+    category: str = "sub",
+    concurrent: Optional[bool] = None,
+    max_concurrency: Optional[int] = None,
+    enough_servers: Optional[int] = None,
+    probe: Optional[bool] = None,
+    quality: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Get anime episode sources from ALL available servers for a specific category.
 
+    Servers are tried healthiest first (see server_health).
+
     Args:
         episode_id: The episode ID in format 'anime-title?ep=12345'
         category: The category (sub, dub, or raw)
+        concurrent: Extract all servers at once (defaults to Config.SOURCES_CONCURRENT_FANOUT)
+        max_concurrency: Max servers extracted at the same time (defaults to Config.SOURCES_MAX_CONCURRENCY)
+        enough_servers: Stop once this many servers returned playable sources, 0 tries every server
+            (defaults to Config.SOURCES_ENOUGH_SERVERS)
+        probe: Check that every returned source and subtitle URL answers, adding its
+            liveness and time to first byte (defaults to Config.SOURCE_PROBE_ENABLED)
+        quality: Keep only each server's source closest to "best", "worst" or a height such as "720p"
 
     Returns:
         Dictionary containing sources from all available servers and metadata
@@ -278,17 +605,26 @@ async def get_all_anime_episode_sources(episode_id: str, category: str = "sub")
             logger.warning(f"Invalid category '{category}', defaulting to sub")
             category = "sub"
 
-        # First, get the list of available servers for this episode and category
-        from .animeEpisodeServers import get_episode_servers
-        servers_result = get_episode_servers(episode_id)
+        if concurrent is None:
+            concurrent = Config.SOURCES_CONCURRENT_FANOUT
+        if not max_concurrency or max_concurrency < 1:
+            max_concurrency = Config.SOURCES_MAX_CONCURRENCY
+        if enough_servers is None:
+            enough_servers = Config.SOURCES_ENOUGH_SERVERS
+        if probe is None:
+            probe = Config.SOURCE_PROBE_ENABLED
+
+        if not episode_id or "?ep=" not in episode_id:
+            raise HiAnimeError("invalid anime episode id", "get_all_anime_episode_sources", 400)
+        _check_quality(quality, "get_all_anime_episode_sources")
+
+        # First, get the list of available servers for this episode and category.
+        # The context keeps the servers fragment and sync IDs for every server below.
+        context = EpisodeContext(episode_id)
+        servers_result = await context.get_servers()
 
         # Get servers for the specified category
-        if category == "sub":
-            available_servers = servers_result.sub
-        elif category == "dub":
-            available_servers = servers_result.dub
-        else:  # raw
-            available_servers = servers_result.raw
+        available_servers = _category_servers(servers_result, category)
 
         if not available_servers:
             logger.warning(f"No servers available for category '{category}'")
@@ -303,78 +639,28 @@ async def get_all_anime_episode_sources(episode_id: str, category: str = "sub")
                 }
             }
 
-        # Map server IDs to server names for the episode sources scraper
-        server_id_to_name = {
-            1: Servers.VidCloud,    # rapidcloud
-            3: Servers.StreamTape,  # streamtape
-            4: Servers.VidStreaming, # vidstreaming
-            5: Servers.StreamSB,    # streamsb
-            6: Servers.VidCloud,    # megacloud (uses same extractor as rapidcloud)
-        }
-
-        sources_data = {}
-        successful_servers = []
-        failed_servers = []
-
-        # Fetch sources from each available server with individual timeouts
-        for server in available_servers:
-            server_name = server.serverName
-            server_id = server.serverId
-            hianimeid = server.hianimeid
-
-            try:
-                # Map server ID to the appropriate server name for the scraper
-                scraper_server = server_id_to_name.get(server_id, Servers.VidStreaming)
-
-                logger.info(f"Fetching sources from {server_name} (ID: {server_id}, Scraper: {scraper_server})")
-
-                # Get sources for this specific server with timeout
-                server_result = await asyncio.wait_for(
-                    getAnimeEpisodeSources(episode_id, scraper_server, category),
-                    timeout=45.0  # 45 second timeout per server
-                )
-
-                sources_data[server_name] = {
-                    "serverName": server_name,
-                    "serverId": server_id,
-                    "hianimeid": hianimeid,
-                    "sources": server_result.get("sources", []),
-                    "headers": server_result.get("headers", {}),
-                    "anilistID": server_result.get("anilistID"),
-                    "malID": server_result.get("malID")
-                }
-
-                successful_servers.append(server_name)
-                logger.info(f"✓ Successfully fetched sources from {server_name}")
-
-            except asyncio.TimeoutError:
-                logger.warning(f"✗ Timeout fetching sources from {server_name} (45s limit)")
-                failed_servers.append({
-                    "serverName": server_name,
-                    "serverId": server_id,
-                    "hianimeid": hianimeid,
-                    "error": "Request timed out after 45 seconds"
-                })
-            except asyncio.CancelledError:
-                logger.warning(f"✗ Request cancelled while fetching from {server_name}")
-                # Don't add to failed servers, just re-raise the cancellation
-                raise
-            except Exception as e:
-                error_msg = str(e)
-                if "Padding is incorrect" in error_msg or "padding" in error_msg.lower():
-                    error_msg = f"Decryption failed for {server_name}. The server may have updated its encryption method."
-                    logger.warning(f"✗ Decryption error for {server_name}: {str(e)}")
-                else:
-                    logger.warning(f"✗ Failed to fetch sources from {server_name}: {str(e)}")
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        deadline = started_at + Config.SOURCES_TOTAL_TIMEOUT
 
-                failed_servers.append({
-                    "serverName": server_name,
-                    "serverId": server_id,
-                    "hianimeid": hianimeid,
-                    "error": error_msg
-                })
+        # Sequential mode is the same fan-out with a single slot
+        limit = max_concurrency if concurrent else 1
+        logger.info(f"Fetching sources from {len(available_servers)} servers (concurrency: {limit})")
+        sources_data, failed_servers, skipped_servers = await _extract_servers(
+            context, available_servers, category, deadline, limit, enough_servers
+        )
+        if quality:
+            # Before probing, so that only the chosen sources are probed
+            sources_data = {
+                name: {**entry, "sources": select_sources(entry["sources"], quality)}
+                for name, entry in sources_data.items()
+            }
+        if probe and sources_data:
+            annotated = await source_prober.annotate(list(sources_data.values()))
+            sources_data = dict(zip(sources_data, annotated))
 
-        logger.info(f"Successfully retrieved sources from {len(successful_servers)} servers, {len(failed_servers)} failed")
+        elapsed_ms = round((loop.time() - started_at) * 1000)
+        logger.info(f"Successfully retrieved sources from {len(sources_data)} servers, {len(failed_servers)} failed in {elapsed_ms}ms")
 
         return {
             "success": True,
@@ -383,10 +669,13 @@ async def get_all_anime_episode_sources(episode_id: str, category: str = "sub")
                 "category": category,
                 "episodeNo": servers_result.episodeNo,
                 "totalServers": len(available_servers),
-                "successfulServers": len(successful_servers),
+                "successfulServers": len(sources_data),
                 "failedServers": len(failed_servers),
                 "sources": sources_data,
-                "failedServersList": failed_servers
+                "failedServersList": failed_servers,
+                "skippedServers": skipped_servers,
+                "concurrency": limit,
+                "elapsedMs": elapsed_ms
             }
         }
 
@@ -403,6 +692,112 @@ async def get_all_anime_episode_sources(episode_id: str, category: str = "sub")
             "context": "get_all_anime_episode_sources"
         }
 
+
+async def get_best_anime_episode_source(
+    episode_id: str,
+    category: str = "sub",
+    probe: Optional[bool] = None,
+    quality: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get one playable source by racing all servers of a category.
+
+    Every server is extracted at once; the first one returning a playable source
+    wins and the others are cancelled, so the call takes as long as the fastest
+    healthy server instead of the slowest one.
+
+    Args:
+        episode_id: The episode ID in format 'anime-title?ep=12345'
+        category: The category (sub, dub, or raw)
+        probe: Check that the winner's source and subtitle URLs answer
+            (defaults to Config.SOURCE_PROBE_ENABLED)
+        quality: Keep only the winner's source closest to "best", "worst" or a height such as "720p"
+
+    Returns:
+        Dictionary containing the winning server, its playable sources and what happened to the others
+    """
+    try:
+        logger.info(f"Racing servers for the best episode source: {episode_id}, category: {category}")
+
+        if category not in ["sub", "dub", "raw"]:
+            logger.warning(f"Invalid category '{category}', defaulting to sub")
+            category = "sub"
+
+        if not episode_id or "?ep=" not in episode_id:
+            raise HiAnimeError("invalid anime episode id", "get_best_anime_episode_source", 400)
+        _check_quality(quality, "get_best_anime_episode_source")
+
+        context = EpisodeContext(episode_id)
+        servers_result = await context.get_servers()
+        available_servers = _category_servers(servers_result, category)
+        if not available_servers:
+            raise HiAnimeError(f"no servers available for category '{category}'", "get_best_anime_episode_source", 404)
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        sources_data, failed_servers, skipped_servers = await _extract_servers(
+            context, available_servers, category, started_at + Config.SOURCES_TOTAL_TIMEOUT,
+            limit=len(available_servers), enough_servers=1
+        )
+        elapsed_ms = round((loop.time() - started_at) * 1000)
+
+        best = None
+        for server_entry in sources_data.values():
+            sources = playable_sources(server_entry["sources"])
+            if best is None and sources:
+                best = {**server_entry, "sources": sources}
+            elif not sources:
+                failed_servers.append({**server_entry, "error": "No playable sources returned"})
+
+        if best is None:
+            logger.warning(f"No server returned a playable source for {episode_id} in {elapsed_ms}ms")
+            return {
+                "success": False,
+                "error": "No server returned a playable source",
+                "context": "get_best_anime_episode_source",
+                "failedServersList": failed_servers
+            }
+
+        if quality:
+            best["sources"] = select_sources(best["sources"], quality)
+        if probe if probe is not None else Config.SOURCE_PROBE_ENABLED:
+            best = (await source_prober.annotate([best]))[0]
+
+        logger.info(f"Best source for {episode_id} from {best['serverName']} in {elapsed_ms}ms")
+        return {
+            "success": True,
+            "data": {
+                "episodeId": episode_id,
+                "category": category,
+                "episodeNo": servers_result.episodeNo,
+                **best,
+                "totalServers": len(available_servers),
+                "failedServersList": failed_servers,
+                "skippedServers": skipped_servers,
+                "elapsedMs": elapsed_ms
+            }
+        }
+
+    except asyncio.CancelledError:
+        logger.warning(f"Request cancelled while racing servers for {episode_id}")
+        raise
+
+    except HiAnimeError as e:
+        logger.error(f"HiAnimeError racing servers: {e.context} - {str(e)} (Status: {e.status_code})")
+        return {
+            "success": False,
+            "error": str(e),
+            "context": e.context,
+            "status_code": e.status_code
+        }
+    except Exception as e:
+        logger.error(f"Unexpected error racing servers: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "context": "get_best_anime_episode_source"
+        }
+
 # # Example Usage
 # async def main():
 #     # Example usage (replace with actual episode ID and server)
@@ -0,0 +1,101 @@
+"""Per-episode upstream data shared by every server extraction."""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from src.management import get_logger
+from src.models import ScrapedEpisodeServers
+from src.utils.client import async_client
+from src.utils.constants import SRC_BASE_URL, SRC_AJAX_URL, USER_AGENT_HEADER
+from src.utils.parsing import parse_html
+from src.scrapers.animeEpisodeServers import parse_episode_servers
+
+# Configure logging
+logger = get_logger("EpisodeContext")
+
+
+class EpisodeContext:
+    """
+    Fetch-once view of the upstream pages every server of an episode needs.
+
+    Extracting sources from N servers used to fetch /ajax/v2/episode/servers and the
+    /watch/{anime} page once per server. A context fetches each of them a single time,
+    on first use, and hands the same result (or error) to every server extraction
+    that asks for it, including ones running concurrently.
+    """
+
+    def __init__(self, episode_id: str):
+        self.episode_id = episode_id
+        self._servers_task: Optional[asyncio.Task] = None
+        self._sync_ids_task: Optional[asyncio.Task] = None
+
+    @property
+    def ep_id_param(self) -> str:
+        """Numeric episode ID used by the AJAX endpoints."""
+        return self.episode_id.split("?ep=")[1] if "?ep=" in self.episode_id else self.episode_id
+
+    async def _shared(self, attr: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Start fetch once and let every caller await the same task."""
+        task = getattr(self, attr)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            setattr(self, attr, task)
+        # Shield so a caller timing out does not cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    async def _fetch_servers_soup(self) -> BeautifulSoup:
+        ep_id_full_url = f"{SRC_BASE_URL}/watch/{self.episode_id}"
+        logger.info(f"Fetching servers fragment for {self.episode_id}")
+
+        resp = await async_client.get(
+            f"{SRC_AJAX_URL}/v2/episode/servers?episodeId={self.ep_id_param}",
+            headers={
+                "Referer": ep_id_full_url,
+                "X-Requested-With": "XMLHttpRequest",
+            },
+            timeout=10  # Add timeout to prevent hanging
+        )
+        resp.raise_for_status()
+        return parse_html(resp.json()["html"], scraper="servers")
+
+    async def _fetch_sync_ids(self) -> Tuple[Optional[int], Optional[int]]:
+        anime_url = f"{SRC_BASE_URL}/watch/{self.episode_id.split('?ep=')[0]}"
+        logger.info(f"Fetching sync data from {anime_url}")
+
+        resp = await async_client.get(anime_url, headers={
+            "Referer": SRC_BASE_URL,
+            "User-Agent": USER_AGENT_HEADER,
+            "X-Requested-With": "XMLHttpRequest",
+        }, timeout=10)
+        resp.raise_for_status()
+
+        soup = parse_html(resp.text, scraper="watch")
+
+        anilist_id = None
+        mal_id = None
+        try:
+            sync_data_script = soup.find("script", id="syncData")
+            if sync_data_script and sync_data_script.string:
+                sync_data = json.loads(sync_data_script.string)
+                anilist_id = int(sync_data.get("anilist_id")) if sync_data.get("anilist_id") else None
+                mal_id = int(sync_data.get("mal_id")) if sync_data.get("mal_id") else None
+        except Exception as err:
+            logger.info(f"Error parsing syncData: {err}")
+            anilist_id = None
+            mal_id = None
+
+        return anilist_id, mal_id
+
+    async def get_servers_soup(self) -> BeautifulSoup:
+        """Parsed /ajax/v2/episode/servers fragment."""
+        return await self._shared("_servers_task", self._fetch_servers_soup)
+
+    async def get_servers(self) -> ScrapedEpisodeServers:
+        """Servers available for the episode, parsed from the shared fragment."""
+        return parse_episode_servers(await self.get_servers_soup(), self.episode_id)
+
+    async def get_sync_ids(self) -> Tuple[Optional[int], Optional[int]]:
+        """AniList and MAL IDs from the syncData script of the watch page."""
+        return await self._shared("_sync_ids_task", self._fetch_sync_ids)
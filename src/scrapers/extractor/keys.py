@@ -0,0 +1,163 @@
+"""Cached decryption keys for the MegaCloud and RapidCloud extractors."""
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from src.management import get_logger
+from src.utils.cache import TTLCache
+from src.utils.client import async_client
+from src.utils.config import Config
+from src.utils.constants import MEGACLOUD_KEY_URL, RAPIDCLOUD_KEY_URL
+
+# Configure logging
+logger = get_logger("DecryptionKeys")
+
+T = TypeVar("T")
+
+
+def is_padding_error(error: Exception) -> bool:
+    """Check whether a decryption error is the bad-padding failure a wrong key causes."""
+    return "padding" in str(error).lower()
+
+
+class KeyProvider:
+    """
+    Download a decryption key once and share it between extractions.
+
+    The key is cached for Config.DECRYPTION_KEY_TTL seconds and then refreshed in the
+    background while the old key keeps being used. A padding error while decrypting
+    is the only thing that forces an immediate refetch, and such refetches are spaced
+    at least Config.DECRYPTION_KEY_MIN_REFRESH_INTERVAL seconds apart so that data
+    that never decrypts cannot cause a flood of key downloads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        parse: Optional[Callable[[str], str]] = None,
+        fallback: Optional[str] = None
+    ):
+        self.name = name
+        self.url = url
+        self.parse = parse or (lambda text: text)
+        self.fallback = fallback
+
+        self._cache = TTLCache(
+            f"{name}_key",
+            ttl=Config.DECRYPTION_KEY_TTL,
+            stale_ttl=Config.DECRYPTION_KEY_STALE_TTL
+        )
+        self._refresh_task: Optional[asyncio.Future] = None
+        self._last_forced_refresh: Optional[float] = None
+        self._stats = {
+            "fetches": 0,
+            "forcedRefreshes": 0,
+            "suppressedRefreshes": 0,
+            "recoveredDecryptions": 0
+        }
+
+    async def _fetch(self) -> str:
+        self._stats["fetches"] += 1
+        logger.info(f"Fetching {self.name} decryption key")
+        response = await async_client.get(self.url, timeout=Config.EXTRACTOR_REQUEST_TIMEOUT)
+        response.raise_for_status()
+
+        key = self.parse(response.text).strip()
+        if not key:
+            if not self.fallback:
+                raise Exception(f"Empty {self.name} decryption key")
+            logger.info(f"Empty {self.name} key downloaded, using the fallback key")
+            key = self.fallback
+        return key
+
+    async def _fetch_and_store(self) -> str:
+        key = await self._fetch()
+        self._cache.set("key", key)
+        return key
+
+    async def get(self) -> str:
+        """Get the current key, downloading it if none is cached."""
+        key, _ = await self._cache.get_or_load("key", self._fetch)
+        return key
+
+    async def refresh_after_failure(self, failed_key: str) -> Optional[str]:
+        """
+        Get a new key after failed_key could not decrypt a response.
+
+        Returns:
+            A key different from failed_key, or None if none could be obtained
+        """
+        current = self._cache.peek("key")
+        if current is not None and current != failed_key:
+            # Another extraction already replaced the key
+            return current
+
+        task = self._refresh_task
+        if task is None or task.done():
+            now = time.monotonic()
+            if (self._last_forced_refresh is not None
+                    and now - self._last_forced_refresh < Config.DECRYPTION_KEY_MIN_REFRESH_INTERVAL):
+                self._stats["suppressedRefreshes"] += 1
+                logger.debug(f"{self.name} key was refetched recently, not refetching again")
+                return None
+
+            self._last_forced_refresh = now
+            self._stats["forcedRefreshes"] += 1
+            task = self._refresh_task = asyncio.ensure_future(self._fetch_and_store())
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        try:
+            key = await asyncio.shield(task)
+        except Exception as e:
+            logger.warning(f"Refetching {self.name} key failed: {e}")
+            return None
+        return key if key != failed_key else None
+
+    async def decrypt(self, decrypt: Callable[[str], T]) -> T:
+        """
+        Run a decryption function with the current key, retrying once with a fresh key on a padding error.
+
+        Args:
+            decrypt: Function taking the key and returning the decrypted data
+
+        Returns:
+            Whatever decrypt returns
+        """
+        key = await self.get()
+        try:
+            return decrypt(key)
+        except Exception as e:
+            if not is_padding_error(e):
+                raise
+            logger.warning(f"{self.name} key failed to decrypt ({e}), trying a fresh key")
+            new_key = await self.refresh_after_failure(key)
+            if new_key is None:
+                raise
+            result = decrypt(new_key)
+            self._stats["recoveredDecryptions"] += 1
+            return result
+
+    def invalidate(self):
+        """Drop the cached key."""
+        self._cache.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get fetch counters and cache stats for the key."""
+        return {
+            **self._stats,
+            "cache": self._cache.stats()
+        }
+
+
+def _parse_rapidcloud_key(text: str) -> str:
+    """The key used to be served as a GitHub HTML page; take the code cell if present."""
+    marker = '"blob-code blob-code-inner js-file-line">'
+    if marker in text:
+        return text.split(marker, 1)[1].split("</td>", 1)[0]
+    return text
+
+
+# Shared key providers
+megacloud_key = KeyProvider("megacloud", MEGACLOUD_KEY_URL)
+rapidcloud_key = KeyProvider("rapidcloud", RAPIDCLOUD_KEY_URL, parse=_parse_rapidcloud_key, fallback="c1d17096f2ca11b7")
@@ -1,11 +1,17 @@
-import requests
+import aiohttp
 import hashlib
 import base64
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import unpad
+import asyncio
 import json
 import re
 
+from src.utils.client import async_client
+from src.utils.config import Config
+from src.utils.constants import MEGACLOUD_URL
+from src.scrapers.extractor.keys import megacloud_key
+
 class HiAnimeError(Exception):
     def __init__(self, message, context, status_code):
         super().__init__(message)
@@ -66,11 +72,6 @@ class MegaCloud:
 
     async def extract3(self, embed_iframe_url: str):
         try:
-            # Fetch the key from GitHub
-            response = requests.get("https://raw.githubusercontent.com/itzzzme/megacloud-keys/refs/heads/main/key.txt")
-            response.raise_for_status()
-            key = response.text.strip()
-
             extracted_data = {
                 "tracks": [],
                 "intro": {"start": 0, "end": 0},
@@ -85,8 +86,8 @@ class MegaCloud:
             if not source_id:
                 raise Exception("Unable to extract sourceId from embed URL")
 
-            megacloud_url = f"https://megacloud.blog/embed-2/v2/e-1/getSources?id={source_id}"
-            raw_source_data_res = requests.get(megacloud_url)
+            megacloud_url = f"{MEGACLOUD_URL}/embed-2/v2/e-1/getSources?id={source_id}"
+            raw_source_data_res = await async_client.get(megacloud_url, timeout=Config.EXTRACTOR_REQUEST_TIMEOUT)
             raw_source_data_res.raise_for_status()
             raw_source_data = raw_source_data_res.json()
 
@@ -94,7 +95,8 @@ class MegaCloud:
             if not encrypted:
                 raise Exception("Encrypted source missing in response")
 
-            decrypted = self.decrypt(encrypted, key)
+            # The key is cached and only refetched when it stops decrypting
+            decrypted = await megacloud_key.decrypt(lambda key: self.decrypt(encrypted, key))
 
             try:
                 decrypted_sources = json.loads(decrypted)
@@ -116,7 +118,7 @@ class MegaCloud:
 
             return extracted_data
 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise Exception(f"Network error during extract3: {e}")
         except Exception as err:
             raise err
\ No newline at end of file
@@ -1,11 +1,15 @@
-import requests
+import aiohttp
+import asyncio
 import re
+import time
 import base64
 import json
 import hashlib
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import unpad
 from src.utils.constants import SRC_BASE_URL,USER_AGENT_HEADER
+from src.utils.client import async_client
+from src.utils.config import Config
 from src.management import get_logger
 
 # Configure logging
@@ -59,7 +63,7 @@ async def getSources(video_id: str):
 
         # First request to get the sources data
         sources_url = f"https://megacloud.tv/embed-2/ajax/e-1/getSources?id={video_id}"
-        res = requests.get(sources_url, headers=headers)
+        res = await async_client.get(sources_url, headers=headers, timeout=Config.EXTRACTOR_REQUEST_TIMEOUT)
         res.raise_for_status()
         srcs_data = res.json()
 
@@ -71,8 +75,8 @@ async def getSources(video_id: str):
             return srcs_data
 
         # If encrypted, fetch the script to decrypt
-        script_url = f"https://megacloud.tv/js/player/a/prod/e1-player.min.js?v={requests.utils.time.time() * 1000}"
-        script_res = requests.get(script_url)
+        script_url = f"https://megacloud.tv/js/player/a/prod/e1-player.min.js?v={time.time() * 1000}"
+        script_res = await async_client.get(script_url, timeout=Config.EXTRACTOR_REQUEST_TIMEOUT)
         script_res.raise_for_status()
         script_text = script_res.text
 
@@ -124,7 +128,7 @@ async def getSources(video_id: str):
         srcs_data["sources"] = sources
         return srcs_data
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.info(f"Network error: {e}")
         return None
     except Exception as e:
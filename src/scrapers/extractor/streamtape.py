@@ -1,15 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import asyncio
+
+from src.utils.client import async_client
+from src.utils.config import Config
+from src.utils.parsing import parse_html
 
 class StreamTape:
     def __init__(self):
         self.sources = []
 
-    def extract(self, video_url: str):
+    async def extract(self, video_url: str):
         try:
-            response = requests.get(video_url)
+            response = await async_client.get(video_url, timeout=Config.EXTRACTOR_REQUEST_TIMEOUT)
             response.raise_for_status()  # Raise an exception for HTTP errors
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = parse_html(response.text, scraper="streamtape")
 
             # Find the script tag containing the robotlink assignment
             script_tag = soup.find('script', string=lambda text: text and 'robotlink' in text)
@@ -35,7 +39,7 @@ class StreamTape:
             })
 
             return self.sources
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise Exception(f"Video not found or network error: {e}")
         except Exception as err:
             raise Exception(f"Error during extraction: {err}")
@@ -46,7 +50,7 @@ class StreamTape:
 #     # Replace with a valid StreamTape video URL for testing
 #     video_url = "https://streamtape.com/e/your_video_id"
 #     try:
-#         extracted_data = st.extract(video_url)
+#         extracted_data = asyncio.run(st.extract(video_url))
 #         print(extracted_data)
 #     except Exception as e:
 #         print(f"Error: {e}")
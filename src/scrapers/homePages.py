@@ -1,22 +1,29 @@
 """Homepage scraping functionality."""
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import gzip
 import io
 import zlib
-import cloudscraper
 from bs4 import BeautifulSoup
 from mcp.server.fastmcp import FastMCP, Context
 
 from src.management import get_logger
 from src.utils.constants import SRC_BASE_URL
 from src.utils.config import Config
+from src.utils.client import client
 from src.utils import (
-    extract_episodes,
-    extract_base_anime_info,
     extract_text,
-    extract_href_id,
-    safe_int_extract
+    safe_int_extract,
+    SelectorChain
 )
+from src.utils.extractors import (
+    BASE_ANIME_FIELDS,
+    EPISODE_FIELDS,
+    SelectLookup,
+    base_anime_info,
+    episode_info
+)
+from src.utils.parsing import parse_html
+from src.utils.singlepass import ContainerSection, MatchSection, SinglePassExtractor, UnsupportedSelector
 from src.models import (
     EpisodeInfo,
     SpotlightAnime,
@@ -30,16 +37,59 @@ logger = get_logger("HomePageScraper")
 # Constants
 HOME_URL = f"{SRC_BASE_URL}/home"
 
+# Fallback selectors, shared by all scrapers so the one that matched last is tried first
+SPOTLIGHT_SELECTORS = SelectorChain("spotlight", [
+    ".swiper-wrapper",
+    "#slider .swiper-wrapper",
+    ".spotlight-container .swiper-wrapper",
+    ".hero-slider .swiper-wrapper"
+])
+TRENDING_SELECTORS = SelectorChain("trending", [
+    ".block_area_category",
+    ".block_area-realtime",
+    ".film_list-wrap",
+    ".trending-section",
+    ".popular-section"
+])
+RANK_SELECTORS = SelectorChain("trendingRank", [".number", ".rank", ".position", ".item-number"])
+GENRE_SELECTORS = SelectorChain("genres", [
+    "#sidebar_subs_genre .nav-link",
+    ".genre-list .nav-link",
+    ".sidebar-genre .nav-link",
+    ".genre-container a",
+    ".genres-list a"
+])
+
+# Selectors of the fields read from each spotlight slide and trending card
+SPOTLIGHT_ITEM_FIELDS = {
+    **BASE_ANIME_FIELDS,
+    **EPISODE_FIELDS,
+    "otherInfo": ".sc-detail .scd-item",
+    "watchLink": ".desi-buttons a",
+    "headTitle": ".desi-head-title.dynamic-name",
+    "description": ".desi-description",
+    "rank": ".desi-sub-text",
+}
+TRENDING_ITEM_FIELDS = {
+    **BASE_ANIME_FIELDS,
+    **EPISODE_FIELDS,
+    "detailLink": ".film-detail a[href]",
+}
+
+
+def trending_item_fields() -> Dict[str, str]:
+    """Trending card fields, with each rank selector as a field of its own."""
+    return {**TRENDING_ITEM_FIELDS, **{selector: selector for selector in RANK_SELECTORS.selectors}}
+
+
+def selector_stats() -> list:
+    """Hit and miss counts of the home page fallback selectors."""
+    return [chain.stats() for chain in (SPOTLIGHT_SELECTORS, TRENDING_SELECTORS, RANK_SELECTORS, GENRE_SELECTORS)]
+
 class HomePageScraper:
     def __init__(self):
-        self.session = cloudscraper.create_scraper(
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'mobile': False
-            }
-        )
-        self.session.headers.update(Config.get_headers())
+        # Shared cloudscraper session from the pooled transport
+        self.session = client.scraper
 
     def _process_html_content(self, response) -> str:
         """Process and decompress HTML content from response."""
@@ -110,78 +160,64 @@ class HomePageScraper:
 
         return html_content
 
-    def _extract_spotlight_animes(self, soup: BeautifulSoup) -> list:
-        """Extract spotlight animes using improved BeautifulSoup parsing."""
-        spotlight_animes = []
+    def _spotlight_anime(self, item) -> SpotlightAnime:
+        """Build a spotlight anime from a lookup over SPOTLIGHT_ITEM_FIELDS."""
+        # Extract other info with better error handling
+        other_info = []
+        for elem in item.all("otherInfo")[:-1]:  # Exclude last item
+            text = elem.get_text(strip=True)
+            if text:
+                other_info.append(text)
+
+        # Extract base anime info using utility function
+        anime_info = base_anime_info(item)
+
+        # Extract additional spotlight-specific data
+        anime_id = anime_info.get("id")
+        if not anime_id:
+            button = item.first("watchLink")
+            href = button["href"].strip() if button and "href" in button.attrs else None
+            anime_id = href.strip("/") if href and href.startswith("/") else None
+        name = anime_info.get("name") or extract_text(item.first("headTitle"))
+
+        # Extract description with better text processing
+        description_elem = item.first("description")
+        description = ""
+        if description_elem:
+            description = description_elem.get_text(strip=True)
+            # Remove content after "[" if present (usually contains spoiler warnings)
+            if "[" in description:
+                description = description.split("[")[0].strip()
+
+        # Create SpotlightAnime object
+        anime = SpotlightAnime(
+            id=anime_id,
+            name=name,
+            description=description,
+            poster=anime_info.get("poster"),
+            jname=anime_info.get("jname"),
+            type=anime_info.get("type") or (other_info[0] if other_info else None),
+            otherInfo=other_info,
+            episodes=EpisodeInfo(**vars(episode_info(item)))
+        )
 
-        # Multiple selector strategies for spotlight container
-        spotlight_selectors = [
-            ".swiper-wrapper",
-            "#slider .swiper-wrapper",
-            ".spotlight-container .swiper-wrapper",
-            ".hero-slider .swiper-wrapper"
-        ]
-
-        spotlight_container = None
-        for selector in spotlight_selectors:
-            spotlight_container = soup.select_one(selector)
-            if spotlight_container:
-                logger.debug(f"Found spotlight container with selector: {selector}")
-                break
+        # Extract rank with improved parsing
+        rank_elem = item.first("rank")
+        if rank_elem:
+            rank_text = rank_elem.get_text(strip=True)
+            if rank_text and rank_text.startswith("#"):
+                anime.rank = safe_int_extract(rank_text[1:])
 
-        if not spotlight_container:
-            logger.warning("No spotlight container found with any selector")
-            return spotlight_animes
+        return anime
 
-        # Extract spotlight items with improved parsing
-        spotlight_items = spotlight_container.select(".swiper-slide")
-        logger.debug(f"Found {len(spotlight_items)} spotlight items")
+    def _spotlight_animes(self, items: list) -> list:
+        """Build the spotlight animes from lookups over their slides."""
+        spotlight_animes = []
+        logger.debug(f"Found {len(items)} spotlight items")
 
-        for item in spotlight_items:
+        for item in items:
             try:
-                # Extract other info with better error handling
-                other_info_elements = item.select(".sc-detail .scd-item")
-                other_info = []
-                for elem in other_info_elements[:-1]:  # Exclude last item
-                    text = elem.get_text(strip=True)
-                    if text:
-                        other_info.append(text)
-
-                # Extract base anime info using utility function
-                anime_info = extract_base_anime_info(item)
-
-                # Extract additional spotlight-specific data
-                anime_id = anime_info.get("id") or extract_href_id(item, ".desi-buttons a")
-                name = anime_info.get("name") or extract_text(item, ".desi-head-title.dynamic-name")
-
-                # Extract description with better text processing
-                description_elem = item.select_one(".desi-description")
-                description = ""
-                if description_elem:
-                    description = description_elem.get_text(strip=True)
-                    # Remove content after "[" if present (usually contains spoiler warnings)
-                    if "[" in description:
-                        description = description.split("[")[0].strip()
-
-                # Create SpotlightAnime object
-                anime = SpotlightAnime(
-                    id=anime_id,
-                    name=name,
-                    description=description,
-                    poster=anime_info.get("poster"),
-                    jname=anime_info.get("jname"),
-                    type=anime_info.get("type") or (other_info[0] if other_info else None),
-                    otherInfo=other_info,
-                    episodes=EpisodeInfo(**vars(extract_episodes(item)))
-                )
-
-                # Extract rank with improved parsing
-                rank_elem = item.select_one(".desi-sub-text")
-                if rank_elem:
-                    rank_text = rank_elem.get_text(strip=True)
-                    if rank_text and rank_text.startswith("#"):
-                        anime.rank = safe_int_extract(rank_text[1:])
-
+                anime = self._spotlight_anime(item)
                 if anime.name:  # Only add if we have a name
                     spotlight_animes.append(anime)
                     logger.debug(f"Added spotlight anime: {anime.name}")
@@ -192,108 +228,77 @@ class HomePageScraper:
 
         return spotlight_animes
 
-    def _extract_trending_animes(self, soup: BeautifulSoup) -> list:
-        """Extract trending animes using improved BeautifulSoup parsing."""
-        trending_animes = []
-
-        # Multiple selector strategies for trending anime containers
-        trending_selectors = [
-            ".block_area_category",
-            ".block_area-realtime",
-            ".film_list-wrap",
-            ".trending-section",
-            ".popular-section"
-        ]
-
-        trend_items = []
-
-        # Try each selector strategy
-        for selector in trending_selectors:
-            containers = soup.select(selector)
-            for container in containers:
-                items = container.select(".flw-item")
-                if items:
-                    trend_items = items
-                    logger.debug(f"Found {len(trend_items)} trending items with selector: {selector}")
-                    break
-            if trend_items:
-                break
+    def _trending_anime(self, item, position: int) -> TrendingAnime:
+        """Build a trending anime from a lookup over trending_item_fields()."""
+        # Try to find explicit rank number
+        def explicit_rank(rank_selector: str):
+            rank_elem = item.first(rank_selector)
+            return safe_int_extract(rank_elem.get_text(strip=True)) if rank_elem else None
+
+        _, rank = RANK_SELECTORS.resolve(explicit_rank)
+
+        # Use position as rank if no explicit rank found
+        if not rank:
+            rank = position
+
+        # Extract base anime info
+        anime_info = base_anime_info(item)
+
+        # Enhanced ID extraction with multiple fallback strategies
+        anime_id = anime_info.get("id")
+        if not anime_id:
+            # Try film-detail link
+            detail_link = item.first("detailLink")
+            if detail_link and detail_link.get("href"):
+                href = detail_link["href"]
+                if href.startswith("/"):
+                    anime_id = href.strip("/")
+
+            # Try any link with href
+            if not anime_id:
+                any_link = item.first("link")
+                if any_link and any_link.get("href"):
+                    href = any_link["href"]
+                    if href.startswith("/"):
+                        anime_id = href.strip("/")
+
+        # Clean up the ID
+        if anime_id:
+            # Remove "watch/" prefix if present
+            if anime_id.startswith("watch/"):
+                anime_id = anime_id[6:]
+            # Remove query parameters
+            if "?" in anime_id:
+                anime_id = anime_id.split("?")[0]
+            # Remove trailing slashes
+            anime_id = anime_id.strip("/")
+
+        # Create TrendingAnime object
+        return TrendingAnime(
+            rank=rank,
+            id=anime_id,
+            name=anime_info.get("name"),
+            jname=anime_info.get("jname"),
+            poster=anime_info.get("poster"),
+            type=anime_info.get("type"),
+            episodes=EpisodeInfo(**vars(episode_info(item)))
+        )
 
-        if not trend_items:
-            # Fallback: search for any .flw-item elements
-            trend_items = soup.select(".flw-item")
-            logger.debug(f"Fallback: Found {len(trend_items)} .flw-item elements")
+    def _trending_animes(self, items: list) -> list:
+        """Build the trending animes from lookups over their cards."""
+        trending_animes = []
 
-        if not trend_items:
+        if not items:
             logger.warning("No trending anime items found with any selector")
             return trending_animes
 
         # Process trending items with improved parsing
-        for i, item in enumerate(trend_items):
+        for i, item in enumerate(items):
             try:
-                # Extract rank with multiple strategies
-                rank = None
-
-                # Try to find explicit rank number
-                rank_selectors = [".number", ".rank", ".position", ".item-number"]
-                for rank_selector in rank_selectors:
-                    rank_elem = item.select_one(rank_selector)
-                    if rank_elem:
-                        rank_text = rank_elem.get_text(strip=True)
-                        rank = safe_int_extract(rank_text)
-                        if rank:
-                            break
-
-                # Use position as rank if no explicit rank found
-                if not rank:
-                    rank = i + 1
-
-                # Extract base anime info
-                anime_info = extract_base_anime_info(item)
-
-                # Enhanced ID extraction with multiple fallback strategies
-                anime_id = anime_info.get("id")
-                if not anime_id:
-                    # Try film-detail link
-                    detail_link = item.select_one(".film-detail a[href]")
-                    if detail_link and detail_link.get("href"):
-                        href = detail_link["href"]
-                        if href.startswith("/"):
-                            anime_id = href.strip("/")
-
-                    # Try any link with href
-                    if not anime_id:
-                        any_link = item.select_one("a[href]")
-                        if any_link and any_link.get("href"):
-                            href = any_link["href"]
-                            if href.startswith("/"):
-                                anime_id = href.strip("/")
-
-                # Clean up the ID
-                if anime_id:
-                    # Remove "watch/" prefix if present
-                    if anime_id.startswith("watch/"):
-                        anime_id = anime_id[6:]
-                    # Remove query parameters
-                    if "?" in anime_id:
-                        anime_id = anime_id.split("?")[0]
-                    # Remove trailing slashes
-                    anime_id = anime_id.strip("/")
-
-                # Create TrendingAnime object
-                anime = TrendingAnime(
-                    rank=rank,
-                    id=anime_id,
-                    name=anime_info.get("name"),
-                    jname=anime_info.get("jname"),
-                    poster=anime_info.get("poster"),
-                    type=anime_info.get("type"),
-                    episodes=EpisodeInfo(**vars(extract_episodes(item)))
-                )
-
+                anime = self._trending_anime(item, i + 1)
                 if anime.name and anime.id:  # Only add if we have both name and ID
                     trending_animes.append(anime)
-                    logger.debug(f"Added trending anime: {anime.name} (rank: {rank})")
+                    logger.debug(f"Added trending anime: {anime.name} (rank: {anime.rank})")
 
             except Exception as e:
                 logger.error(f"Error processing trending anime item: {str(e)}")
@@ -301,63 +306,135 @@ class HomePageScraper:
 
         return trending_animes
 
+    @staticmethod
+    def _genre_names(elements: list) -> list:
+        return [text for text in (elem.get_text(strip=True) for elem in elements) if text]
+
+    def _extract_spotlight_animes(self, soup: BeautifulSoup) -> list:
+        """Extract spotlight animes using improved BeautifulSoup parsing."""
+        # Multiple selector strategies for spotlight container
+        selector, spotlight_container = SPOTLIGHT_SELECTORS.resolve(soup.select_one)
+        if not spotlight_container:
+            logger.warning("No spotlight container found with any selector")
+            return []
+        logger.debug(f"Found spotlight container with selector: {selector}")
+
+        # Extract spotlight items with improved parsing
+        return self._spotlight_animes([
+            SelectLookup(item, SPOTLIGHT_ITEM_FIELDS) for item in spotlight_container.select(".swiper-slide")
+        ])
+
+    def _extract_trending_animes(self, soup: BeautifulSoup) -> list:
+        """Extract trending animes using improved BeautifulSoup parsing."""
+        def container_items(selector: str) -> list:
+            # Items of the first container matching the selector that has any
+            for container in soup.select(selector):
+                items = container.select(".flw-item")
+                if items:
+                    return items
+            return []
+
+        # Multiple selector strategies for trending anime containers
+        selector, trend_items = TRENDING_SELECTORS.resolve(container_items)
+        if trend_items:
+            logger.debug(f"Found {len(trend_items)} trending items with selector: {selector}")
+        else:
+            # Fallback: search for any .flw-item elements
+            trend_items = soup.select(".flw-item")
+            logger.debug(f"Fallback: Found {len(trend_items)} .flw-item elements")
+
+        fields = trending_item_fields()
+        return self._trending_animes([SelectLookup(item, fields) for item in trend_items])
+
     def _extract_genres(self, soup: BeautifulSoup) -> list:
         """Extract genres using improved BeautifulSoup parsing."""
         # Multiple selector strategies for genre containers
-        genre_selectors = [
-            "#sidebar_subs_genre .nav-link",
-            ".genre-list .nav-link",
-            ".sidebar-genre .nav-link",
-            ".genre-container a",
-            ".genres-list a"
-        ]
-
-        extracted_genres = []
-
-        for selector in genre_selectors:
-            genre_elements = soup.select(selector)
-            if genre_elements:
-                extracted_genres = [
-                    elem.get_text(strip=True)
-                    for elem in genre_elements
-                    if elem.get_text(strip=True)
-                ]
-                if extracted_genres:
-                    logger.debug(f"Extracted {len(extracted_genres)} genres with selector: {selector}")
-                    break
+        selector, extracted_genres = GENRE_SELECTORS.resolve(lambda selector: self._genre_names(soup.select(selector)))
+        if extracted_genres:
+            logger.debug(f"Extracted {len(extracted_genres)} genres with selector: {selector}")
+
+        return extracted_genres or []
+
+    def _extract_single_pass(self, soup: BeautifulSoup, result: HomePage):
+        """
+        Extract spotlight, trending and genres in one walk over the tree.
+
+        The walk collects the candidate containers of every fallback selector and
+        the fields of their items; the selector chains then pick among them as
+        the per-section extractors would, without scanning the document again.
+        """
+        spotlight = ContainerSection(
+            SPOTLIGHT_SELECTORS.selectors, ".swiper-slide", SPOTLIGHT_ITEM_FIELDS, many=["otherInfo"]
+        )
+        trending = ContainerSection(TRENDING_SELECTORS.selectors, ".flw-item", trending_item_fields())
+        genres = MatchSection(GENRE_SELECTORS.selectors)
+        SinglePassExtractor([spotlight, trending, genres]).walk(soup)
+
+        selector, container = SPOTLIGHT_SELECTORS.resolve(spotlight.first_container)
+        if container:
+            logger.debug(f"Found spotlight container with selector: {selector}")
+            result.spotlightAnimes = self._spotlight_animes(container.items)
+        else:
+            logger.warning("No spotlight container found with any selector")
+
+        selector, container = TRENDING_SELECTORS.resolve(trending.first_with_items)
+        if container:
+            logger.debug(f"Found {len(container.items)} trending items with selector: {selector}")
+            result.trendingAnimes = self._trending_animes(container.items)
+        else:
+            # Fallback: search for any .flw-item elements
+            fields = trending_item_fields()
+            result.trendingAnimes = self._trending_animes([SelectLookup(item, fields) for item in soup.select(".flw-item")])
+
+        selector, extracted_genres = GENRE_SELECTORS.resolve(lambda selector: self._genre_names(genres.matches(selector)))
+        if extracted_genres:
+            logger.debug(f"Extracted {len(extracted_genres)} genres with selector: {selector}")
+        result.genres = extracted_genres or []
+
+    def parse_home_page(self, html_content: str, parser: Optional[str] = None) -> HomePage:
+        """
+        Parse the /home page HTML into spotlight, trending and genre data.
+
+        parser selects the HTML parser backend, Config.HTML_PARSER by default.
+        """
+        soup = parse_html(html_content, parser, scraper="home")
+
+        result = HomePage()
 
-    def get_home_page(self) -> HomePage:
         try:
-            logger.debug(f"Fetching homepage from {HOME_URL}")
-            response = self.session.get(HOME_URL)
-            response.raise_for_status()
+            # The walk saves repeated traversals of a BeautifulSoup tree; on a native lxml
+            # tree the per-section selectors run as compiled XPath and are faster
+            if Config.HOME_PAGE_SINGLE_PASS and isinstance(soup, BeautifulSoup):
+                try:
+                    self._extract_single_pass(soup, result)
+                    return result
+                except UnsupportedSelector as e:
+                    logger.warning(f"Single-pass extraction unavailable, using per-section selectors: {str(e)}")
 
-            # Process HTML content
-            html_content = self._process_html_content(response)
+            # Extract spotlight animes using improved method
+            result.spotlightAnimes = self._extract_spotlight_animes(soup)
+            # Extract trending animes using improved method
+            result.trendingAnimes = self._extract_trending_animes(soup)
 
-            # Parse with BeautifulSoup using lxml parser for better performance
-            try:
-                soup = BeautifulSoup(html_content, 'lxml')
-                logger.debug("Using lxml parser")
-            except:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                logger.debug("Fallback to html.parser")
+            # Extract genres using improved method
+            result.genres = self._extract_genres(soup)
 
-            result = HomePage()
+            return result
 
-            try:
-                # Extract spotlight animes using improved method
-                result.spotlightAnimes = self._extract_spotlight_animes(soup)                # Extract trending animes using improved method
-                result.trendingAnimes = self._extract_trending_animes(soup)
+        except Exception as scrape_error:
+            logger.error(f"Error while scraping content: {str(scrape_error)}")
+            raise Exception(f"Error extracting content: {str(scrape_error)}")
 
-                # Extract genres using improved method
-                result.genres = self._extract_genres(soup)
+    def get_home_page(self) -> HomePage:
+        try:
+            logger.debug(f"Fetching homepage from {HOME_URL}")
+            response = client.get(HOME_URL, cloudflare=True, cache=True)
+            response.raise_for_status()
 
-                return result
+            # Process HTML content
+            html_content = self._process_html_content(response)
 
-            except Exception as scrape_error:
-                logger.error(f"Error while scraping content: {str(scrape_error)}")
-                raise Exception(f"Error extracting content: {str(scrape_error)}")
+            return self.parse_home_page(html_content)
 
         except Exception as e:
             logger.error(f"Failed to get homepage: {str(e)}")
@@ -4,6 +4,7 @@ from .config import Config
 from .constants import *
 from .extractors import (
     EpisodeInfo,
+    SelectorChain,
     extract_episodes,
     extract_base_anime_info,
     safe_int_extract,
@@ -17,6 +18,7 @@ from .extractors import (
 __all__ = [
     'Config',
     'EpisodeInfo',
+    'SelectorChain',
     'extract_episodes',
     'extract_base_anime_info',
     'safe_int_extract',
@@ -0,0 +1,181 @@
+"""In-memory TTL cache with stale-while-revalidate loading."""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.management import get_logger
+
+# Configure logging
+logger = get_logger("Cache")
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and when it was stored."""
+    value: Any
+    stored_at: float
+    ttl: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the value was stored."""
+        return time.monotonic() - self.stored_at
+
+    def is_fresh(self) -> bool:
+        return self.age < self.ttl
+
+
+@dataclass
+class CacheInfo:
+    """How a value returned by get_or_load was obtained."""
+    hit: bool
+    stale: bool
+    age: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hit": self.hit,
+            "stale": self.stale,
+            "ageSeconds": round(self.age, 3)
+        }
+
+
+class TTLCache:
+    """
+    Cache values for a fixed time, optionally serving them stale while they refresh.
+
+    A value younger than ttl is fresh. A value older than ttl but younger than
+    ttl + stale_ttl is stale: get_or_load returns it right away and starts a single
+    background refresh for the key. Anything older is dropped and loaded inline.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, max_entries: Optional[int] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "staleHits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refreshErrors": 0
+        }
+
+    def _lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        """Get the entry for key if it is still usable, dropping it otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.age >= entry.ttl + self.stale_ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a fresh value, or None if missing or expired."""
+        entry = self._lookup(key)
+        if entry is None or not entry.is_fresh():
+            return None
+        return entry.value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Get a value that is fresh or still within the stale window, or None."""
+        entry = self._lookup(key)
+        return entry.value if entry is not None else None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.monotonic(), self.ttl if ttl is None else ttl)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or every key when none is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> asyncio.Future:
+        """Start loading key unless a load for it is already running."""
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return task
+
+        async def load():
+            try:
+                value = await loader()
+                self.set(key, value, ttl)
+                self._stats["refreshes"] += 1
+                return value
+            except Exception as e:
+                self._stats["refreshErrors"] += 1
+                logger.warning(f"{self.name}: loading {key!r} failed: {e}")
+                raise
+            finally:
+                if self._refreshing.get(key) is task:
+                    del self._refreshing[key]
+
+        task = asyncio.ensure_future(load())
+        # Background refreshes have nobody awaiting them; mark their errors as retrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._refreshing[key] = task
+        return task
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Tuple[Any, CacheInfo]:
+        """
+        Get a value, loading it when missing and refreshing it in the background when stale.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing a new value
+            ttl: Override of the cache TTL for a newly loaded value
+
+        Returns:
+            Tuple of the value and how it was obtained
+        """
+        entry = self._lookup(key)
+        if entry is not None and entry.is_fresh():
+            self._stats["hits"] += 1
+            return entry.value, CacheInfo(hit=True, stale=False, age=entry.age)
+
+        if entry is not None:
+            self._stats["staleHits"] += 1
+            self._refresh(key, loader, ttl)
+            logger.debug(f"{self.name}: serving stale value ({entry.age:.1f}s old) while refreshing")
+            return entry.value, CacheInfo(hit=True, stale=True, age=entry.age)
+
+        self._stats["misses"] += 1
+        # Shield so a cancelled caller does not abort a load other callers may be awaiting
+        value = await asyncio.shield(self._refresh(key, loader, ttl))
+        return value, CacheInfo(hit=False, stale=False, age=0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of cached entries."""
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            **self._stats,
+            "entries": entries,
+            "ttl": self.ttl,
+            "staleTtl": self.stale_ttl
+        }
@@ -0,0 +1,252 @@
+"""Circuit breakers that stop calling an extractor host while it is down."""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.management import get_logger
+from .client import async_client
+from .config import Config
+from .retry import remaining_time
+
+# Configure logging
+logger = get_logger("CircuitBreaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is failing, skipped for the next {max(retry_in, 0):.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Fail fast on one extractor host after it failed several times in a row.
+
+    Closed: calls go through and consecutive failures are counted.
+    Open: calls are rejected at once. After the recovery time a probe runs in the
+    background; if the host answers, the circuit turns half-open, otherwise the
+    recovery time doubles up to max_recovery_time.
+    Half-open: a single trial call goes through. Its success closes the circuit,
+    its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_time: float,
+        max_recovery_time: float,
+        probe: Optional[Callable[[], Awaitable[bool]]] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.max_recovery_time = max_recovery_time
+        self.probe = probe
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = recovery_time
+        self.retry_at = 0.0
+        self._trial_in_flight = False
+        self._probe_task: Optional[asyncio.Task] = None
+        self._stats = {
+            "trips": 0,
+            "rejected": 0,
+            "probes": 0,
+            "probeFailures": 0,
+            "lastError": None
+        }
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; a half-open trial is taken if it does."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() >= self.retry_at:
+                if self.probe is None:
+                    self.state = HALF_OPEN
+                elif self._probe_task is None or self._probe_task.done():
+                    # The probe scheduled on tripping may have died with its event loop
+                    self._schedule_probe(0)
+            if self.state == OPEN:
+                self._stats["rejected"] += 1
+                return False
+        if self._trial_in_flight:
+            self._stats["rejected"] += 1
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def retry_in(self) -> float:
+        return self.retry_at - time.monotonic()
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info(f"{self.name} recovered, closing its circuit")
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self.recovery_time
+        self._trial_in_flight = False
+
+    def record_failure(self, error: str):
+        self._stats["lastError"] = error
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+            self.cooldown = min(self.cooldown * 2, self.max_recovery_time)
+            self._trip()
+        elif self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._trip()
+
+    def release(self):
+        """End a call that gave no verdict on the host, e.g. because the caller gave up on it."""
+        self._trial_in_flight = False
+
+    def _trip(self):
+        self.state = OPEN
+        self.retry_at = time.monotonic() + self.cooldown
+        self._stats["trips"] += 1
+        logger.warning(
+            f"{self.name} failed {self.failures} times in a row, "
+            f"opening its circuit for {self.cooldown:g}s ({self._stats['lastError']})"
+        )
+        if self.probe is not None:
+            self._schedule_probe(self.cooldown)
+
+    def _schedule_probe(self, delay: float):
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_after(delay))
+        except RuntimeError:
+            # No event loop here; the next allow() on one starts the probe
+            self._probe_task = None
+
+    async def _probe_after(self, delay: float):
+        await asyncio.sleep(delay)
+        if self.state != OPEN:
+            return
+        self._stats["probes"] += 1
+        try:
+            healthy = await self.probe()
+        except Exception as e:
+            healthy = False
+            self._stats["lastError"] = f"probe: {e}"
+        if self.state != OPEN:
+            return
+        if healthy:
+            logger.info(f"{self.name} answered a probe, letting a trial call through")
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        else:
+            self._stats["probeFailures"] += 1
+            self.cooldown = min(self.cooldown * 2, self.max_recovery_time)
+            self.retry_at = time.monotonic() + self.cooldown
+            self._schedule_probe(self.cooldown)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self.failures,
+            "retryInSeconds": round(max(0.0, self.retry_in()), 1) if self.state == OPEN else 0,
+            **self._stats
+        }
+
+
+async def probe_host(url: str, timeout: float) -> bool:
+    """Whether the host of url answers at all, without a server error."""
+    response = await async_client.get(url, timeout=timeout, retry=False)
+    return response.status_code < 500
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers keyed by host and extractor.
+
+    A dead mirror is skipped instantly instead of costing every request a timeout,
+    while the same host used by another extractor, or another host used by the
+    same extractor, keeps its own circuit.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = None,
+        failure_threshold: int = None,
+        recovery_time: float = None,
+        max_recovery_time: float = None,
+        probe_timeout: float = None,
+        probe: Optional[Callable[[str], Awaitable[bool]]] = None
+    ):
+        self.enabled = Config.CIRCUIT_BREAKER_ENABLED if enabled is None else enabled
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.recovery_time = recovery_time or Config.CIRCUIT_BREAKER_RECOVERY_TIME
+        self.max_recovery_time = max_recovery_time or Config.CIRCUIT_BREAKER_MAX_RECOVERY_TIME
+        self.probe_timeout = probe_timeout or Config.CIRCUIT_BREAKER_PROBE_TIMEOUT
+        self._probe = probe or (lambda url: probe_host(url, self.probe_timeout))
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def breaker(self, url: str, extractor: str) -> CircuitBreaker:
+        """Get the breaker of the host of url for an extractor."""
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+        key = (host, extractor)
+        if key not in self._breakers:
+            probe_url = f"{parsed.scheme or 'https'}://{parsed.netloc}/"
+            self._breakers[key] = CircuitBreaker(
+                f"{extractor}@{host}",
+                self.failure_threshold,
+                self.recovery_time,
+                self.max_recovery_time,
+                probe=lambda: self._probe(probe_url)
+            )
+        return self._breakers[key]
+
+    @asynccontextmanager
+    async def guard(self, url: str, extractor: str) -> AsyncIterator[None]:
+        """
+        Run the block only if the circuit of the host allows it, recording the outcome.
+
+        Raises:
+            CircuitOpenError: The circuit is open, the block is not run
+        """
+        if not self.enabled:
+            yield
+            return
+        breaker = self.breaker(url, extractor)
+        if not breaker.allow():
+            raise CircuitOpenError(breaker.name, breaker.retry_in())
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Cancelled by the caller's timeout counts against the host, by anything else not
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0.05:
+                breaker.record_failure("timed out")
+            else:
+                breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        else:
+            breaker.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the state of every breaker that has seen a call."""
+        return {
+            "enabled": self.enabled,
+            "breakers": {breaker.name: breaker.stats() for breaker in self._breakers.values()}
+        }
+
+
+# Create singleton circuit breakers instance
+circuit_breakers = CircuitBreakers()
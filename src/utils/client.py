@@ -0,0 +1,387 @@
+"""Shared HTTP transport for all scrapers and extractors."""
+import asyncio
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+import cloudscraper
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .config import Config
+from .httpcache import DiskCache
+from .ratelimit import rate_limiter
+from .retry import retrier
+
+
+class Client:
+    """
+    Pooled HTTP transport shared by every scraper and extractor.
+
+    Holds two long-lived sessions so TCP and TLS connections are reused across tool
+    calls: a cloudscraper session for hianime pages behind Cloudflare and a plain
+    requests session for AJAX endpoints, embed hosts and key files. Both keep one
+    connection pool per host, sized by Config.HTTP_POOL_CONNECTIONS and
+    Config.HTTP_POOL_MAXSIZE, and send the default headers from Config.get_headers().
+
+    GETs made with cache=True go through an optional on-disk response cache
+    (Config.HTTP_DISK_CACHE_ENABLED) that is revalidated with conditional requests.
+    Requests that reach the network are paced per host by the shared rate limiter,
+    and transient failures of idempotent requests are retried (see retry.Retrier).
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        timeout: float = None,
+        disk_cache: Optional[DiskCache] = None
+    ):
+        self.pool_connections = pool_connections or Config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or Config.HTTP_POOL_MAXSIZE
+        self.timeout = timeout or Config.REQUEST_TIMEOUT
+        if disk_cache is None and Config.HTTP_DISK_CACHE_ENABLED:
+            disk_cache = DiskCache()
+        self.disk_cache = disk_cache
+
+        self.session = requests.Session()
+        self.session.headers.update(Config.get_headers())
+        # Only advertise the encodings urllib3 can actually decode
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = self._pooled_adapter()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.scraper = cloudscraper.create_scraper(
+            browser={
+                'browser': 'chrome',
+                'platform': 'windows',
+                'mobile': False
+            }
+        )
+        self.scraper.headers.update(Config.get_headers())
+        # Keep cloudscraper's TLS fingerprint but give it the same pool sizing
+        cipher_adapter = self.scraper.adapters["https://"]
+        self.scraper.mount("https://", cloudscraper.CipherSuiteAdapter(
+            cipherSuite=cipher_adapter.cipherSuite,
+            ecdhCurve=cipher_adapter.ecdhCurve,
+            server_hostname=cipher_adapter.server_hostname,
+            source_address=cipher_adapter.source_address,
+            ssl_context=cipher_adapter.ssl_context,
+            **self._pool_kwargs()
+        ))
+        self.scraper.mount("http://", self._pooled_adapter())
+
+        self._requests_per_host = Counter()
+        self._lock = threading.Lock()
+
+    def _pool_kwargs(self) -> Dict[str, Any]:
+        return {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": Config.HTTP_POOL_BLOCK,
+        }
+
+    def _pooled_adapter(self) -> HTTPAdapter:
+        return HTTPAdapter(**self._pool_kwargs())
+
+    def request(self, method: str, url: str, cloudflare: bool = False, retry: bool = True, **kwargs) -> requests.Response:
+        """
+        Make a request on the shared sessions.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            cloudflare: Use the cloudscraper session (for hianime pages behind Cloudflare)
+            retry: Retry transient failures of idempotent requests
+            **kwargs: Passed to requests; headers are merged over the session defaults
+
+        Returns:
+            The requests Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        session = self.scraper if cloudflare else self.session
+        return retrier.call_sync(method, url, lambda: self._send(session, method, url, **kwargs), enabled=retry)
+
+    def _send(self, session: requests.Session, method: str, url: str, timeout: Any = None, **kwargs) -> requests.Response:
+        """Make a single attempt, paced by the rate limiter and bounded by the caller's deadline."""
+        with self._lock:
+            self._requests_per_host[urlparse(url).hostname] += 1
+        rate_limiter.acquire_sync(url)
+        response = session.request(method, url, timeout=retrier.attempt_timeout(timeout), **kwargs)
+        if response.status_code == 429:
+            rate_limiter.throttled_by_upstream(url, response.headers.get("Retry-After"))
+        return response
+
+    def get(self, url: str, cloudflare: bool = False, cache: bool = False, **kwargs) -> requests.Response:
+        """
+        Make a GET request with default headers and timeout.
+
+        Args:
+            url: Request URL
+            cloudflare: Use the cloudscraper session (for hianime pages behind Cloudflare)
+            cache: Serve and store the response through the disk cache, if enabled
+            **kwargs: Passed to requests
+        """
+        if cache and self.disk_cache is not None:
+            return self._cached_get(url, cloudflare, **kwargs)
+        return self.request("GET", url, cloudflare=cloudflare, **kwargs)
+
+    def _cached_get(self, url: str, cloudflare: bool, **kwargs) -> requests.Response:
+        entry = self.disk_cache.get(url)
+        if entry is not None and entry.is_fresh():
+            self.disk_cache.record(hit=True)
+            return entry.to_response()
+        self.disk_cache.record(hit=False)
+
+        if entry is not None and entry.can_revalidate():
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **entry.conditional_headers()}
+        response = self.request("GET", url, cloudflare=cloudflare, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            return self.disk_cache.refresh(entry, response).to_response()
+        self.disk_cache.put(url, response)
+        return response
+
+    def post(self, url: str, cloudflare: bool = False, **kwargs) -> requests.Response:
+        """Make a POST request with default headers and timeout."""
+        return self.request("POST", url, cloudflare=cloudflare, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool sizing and the number of requests made per host."""
+        with self._lock:
+            requests_per_host = dict(self._requests_per_host)
+        stats = {
+            "poolConnections": self.pool_connections,
+            "poolMaxSize": self.pool_maxsize,
+            "requestsPerHost": requests_per_host
+        }
+        if self.disk_cache is not None:
+            stats["diskCache"] = self.disk_cache.stats()
+        return stats
+
+
+@dataclass
+class AsyncResponse:
+    """Fully read aiohttp response with the parts of the requests API the scrapers use."""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    encoding: Optional[str] = None
+    request_info: Optional[aiohttp.RequestInfo] = field(default=None, repr=False)
+    history: Tuple = field(default=(), repr=False)
+    streamed: Any = field(default=None, repr=False)  # What AsyncClient.stream() read from the body instead
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        """Raise aiohttp.ClientResponseError for 4xx and 5xx responses."""
+        if self.status_code >= 400:
+            raise aiohttp.ClientResponseError(
+                self.request_info,
+                self.history,
+                status=self.status_code,
+                message=f"{self.status_code} error for url: {self.url}",
+                headers=self.headers
+            )
+
+
+class AsyncClient:
+    """
+    Non-blocking counterpart of Client for code running on the event loop.
+
+    Wraps one aiohttp.ClientSession per event loop whose connector keeps
+    Config.HTTP_POOL_MAXSIZE keep-alive connections per host. Every request has
+    its own timeout and is cancelled cleanly together with the awaiting task.
+    Requests wait for the shared per-host rate limiter without blocking the loop.
+
+    A session is closed while its loop shuts down: asyncio.run() cancels the
+    leftover tasks on the way out, including the one guarding the session.
+    """
+
+    def __init__(self, limit: int = None, limit_per_host: int = None, timeout: float = None):
+        self.limit = limit or Config.HTTP_POOL_CONNECTIONS * Config.HTTP_POOL_MAXSIZE
+        self.limit_per_host = limit_per_host or Config.HTTP_POOL_MAXSIZE
+        self.timeout = timeout or Config.REQUEST_TIMEOUT
+
+        # aiohttp picks Accept-Encoding itself based on the installed decoders
+        self.headers = {
+            key: value for key, value in Config.get_headers().items()
+            if key not in ("Accept-Encoding", "Connection")
+        }
+
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        # The loop only keeps weak references to tasks, so hold on to each session's closer
+        self._closers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self._requests_per_host = Counter()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the session for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            self._forget_closed_loops()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300
+            )
+            session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+            self._sessions[loop] = session
+            self._closers[loop] = loop.create_task(self._close_on_shutdown(session))
+        return session
+
+    async def _close_on_shutdown(self, session: aiohttp.ClientSession):
+        """Wait until the loop cancels this task while shutting down, then close the session."""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.create_future()
+        finally:
+            if self._sessions.get(loop) is session:
+                del self._sessions[loop]
+                del self._closers[loop]
+            await session.close()
+
+    def _forget_closed_loops(self):
+        """Drop sessions whose loop was closed without cancelling its tasks."""
+        for loop, session in list(self._sessions.items()):
+            if loop.is_closed():
+                # Nothing can run on the loop any more; detach so the session is not reported as leaked
+                session.detach()
+                del self._sessions[loop]
+                del self._closers[loop]
+
+    async def request(self, method: str, url: str, timeout: float = None, retry: bool = True, **kwargs) -> AsyncResponse:
+        """
+        Make a request and read the whole body.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            timeout: Total seconds allowed per attempt (defaults to Config.REQUEST_TIMEOUT)
+            retry: Retry transient failures of idempotent requests
+            **kwargs: Passed to aiohttp; headers are merged over the session defaults
+
+        Returns:
+            AsyncResponse with the body already read
+        """
+        return await retrier.call(
+            method, url, lambda: self._send(method, url, timeout or self.timeout, **kwargs), enabled=retry
+        )
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        timeout: float,
+        consume: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
+        **kwargs
+    ) -> AsyncResponse:
+        """Make a single attempt, paced by the rate limiter and bounded by the caller's deadline."""
+        await rate_limiter.acquire(url)
+        session = self._get_session()
+        self._requests_per_host[urlparse(url).hostname] += 1
+        client_timeout = aiohttp.ClientTimeout(total=retrier.attempt_timeout(timeout))
+        async with session.request(method, url, timeout=client_timeout, **kwargs) as response:
+            if response.status == 429:
+                rate_limiter.throttled_by_upstream(url, response.headers.get("Retry-After"))
+            content, streamed = b"", None
+            if consume is not None and response.status < 400:
+                streamed = await consume(response)
+            else:
+                content = await response.read()
+            return AsyncResponse(
+                url=str(response.url),
+                status_code=response.status,
+                headers=dict(response.headers),
+                content=content,
+                encoding=response.charset,
+                request_info=response.request_info,
+                history=response.history,
+                streamed=streamed
+            )
+
+    async def get(self, url: str, timeout: float = None, **kwargs) -> AsyncResponse:
+        """Make a GET request with default headers, timeout and retries."""
+        return await self.request("GET", url, timeout=timeout, **kwargs)
+
+    async def stream(
+        self,
+        url: str,
+        consume: Callable[[aiohttp.ClientResponse], Awaitable[Any]],
+        timeout: float = None,
+        retry: bool = True,
+        **kwargs
+    ) -> Any:
+        """
+        GET a URL and let consume read the body of a successful response as it arrives.
+
+        Error responses are read whole and retried like request(). A failed attempt
+        is repeated from the start, so consume must not keep state between calls.
+
+        Returns:
+            Whatever consume returned
+
+        Raises:
+            aiohttp.ClientResponseError: The response had a 4xx or 5xx status
+        """
+        response = await retrier.call(
+            "GET", url, lambda: self._send("GET", url, timeout or self.timeout, consume=consume, **kwargs), enabled=retry
+        )
+        response.raise_for_status()
+        return response.streamed
+
+    async def first_byte(self, url: str, timeout: float = None, **kwargs) -> Tuple[int, float]:
+        """
+        GET a URL but read only the first chunk of its body, without retries.
+
+        The wait for the rate limiter counts against the timeout, so a probe of
+        a busy host fails in time instead of queueing behind its other requests.
+
+        Returns:
+            Tuple of the status code and the seconds until the first byte arrived
+        """
+        total = retrier.attempt_timeout(timeout or self.timeout)
+        async with asyncio.timeout(total):
+            await rate_limiter.acquire(url)
+            session = self._get_session()
+            self._requests_per_host[urlparse(url).hostname] += 1
+            client_timeout = aiohttp.ClientTimeout(total=total)
+            started_at = asyncio.get_running_loop().time()
+            async with session.get(url, timeout=client_timeout, **kwargs) as response:
+                if response.status == 429:
+                    rate_limiter.throttled_by_upstream(url, response.headers.get("Retry-After"))
+                await response.content.readany()
+                return response.status, asyncio.get_running_loop().time() - started_at
+
+    async def close(self):
+        """Close the session of the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None:
+            self._closers.pop(loop).cancel()
+            await session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool sizing and the number of requests made per host."""
+        return {
+            "limit": self.limit,
+            "limitPerHost": self.limit_per_host,
+            "requestsPerHost": dict(self._requests_per_host)
+        }
+
+# Create singleton client instances
+client = Client()
+async_client = AsyncClient()
@@ -3,16 +3,114 @@
 class Config:
     # Scraping settings
     REQUEST_TIMEOUT = 30
-    MAX_RETRIES = 3
-    RETRY_DELAY = 5
+    MAX_RETRIES = 3  # Retries of an idempotent request that failed transiently
+    RETRY_DELAY = 5  # Max seconds between two attempts
+    RETRY_BASE_DELAY = 0.25  # Max seconds before the first retry, doubled on every attempt (full jitter)
+    RETRY_BUDGET_RATIO = 0.2  # Retries allowed per request made, across all hosts
+    RETRY_BUDGET_MIN_PER_SECOND = 1  # Retries allowed regardless of traffic
+    RETRY_BUDGET_WINDOW = 10  # Seconds of traffic the retry budget is computed over
     
     # Browser emulation
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.234"
     MOBILE = False
     
-    # Rate limiting
-    RATE_LIMIT = 1  # requests per second
-    
+    # HTTP transport
+    HTTP_POOL_CONNECTIONS = 10  # Number of hosts to keep a connection pool for
+    HTTP_POOL_MAXSIZE = 20  # Max keep-alive connections per host
+    HTTP_POOL_BLOCK = False  # Wait for a free pooled connection instead of opening an extra one
+    HTTP_KEEPALIVE_TIMEOUT = 30  # Seconds an idle async connection is kept open
+    EXTRACTOR_REQUEST_TIMEOUT = 15  # Seconds allowed per extractor request
+
+    # On-disk HTTP response cache for hianime pages
+    HTTP_DISK_CACHE_ENABLED = False  # Keep page responses on disk across restarts
+    HTTP_DISK_CACHE_DIR = "cache/http"
+    HTTP_DISK_CACHE_TTL = 300  # Seconds a stored response is used before revalidating it
+    HTTP_DISK_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200MB, least recently used entries are evicted
+
+    # Decryption keys
+    DECRYPTION_KEY_TTL = 1800  # Seconds a downloaded key is used before refreshing it
+    DECRYPTION_KEY_STALE_TTL = 86400  # Seconds past the TTL an old key is used while it refreshes
+    DECRYPTION_KEY_MIN_REFRESH_INTERVAL = 60  # Min seconds between refetches caused by padding errors
+
+    # Rate limiting, one token bucket per upstream host
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT = 1  # Requests per second to each upstream host
+    RATE_LIMIT_BURST = 10  # Requests a host may receive at once after being idle, enough for one episode's fan-out
+    RATE_LIMIT_HOSTS = {  # Host name suffix: (requests per second, burst), to tune one host on its own
+        "hianime.sx": (RATE_LIMIT, RATE_LIMIT_BURST),
+        "megacloud.blog": (RATE_LIMIT, RATE_LIMIT_BURST),
+        "megacloud.tv": (RATE_LIMIT, RATE_LIMIT_BURST),
+        "rapid-cloud.co": (RATE_LIMIT, RATE_LIMIT_BURST),
+        "raw.githubusercontent.com": (RATE_LIMIT, 4),
+        "127.0.0.1": (1000, 1000),  # Local stand-ins (benchmarks/standin.py) and test servers
+        "localhost": (1000, 1000),
+    }
+    RATE_LIMIT_429_PAUSE = 10  # Seconds a host is paused after a 429 without Retry-After
+
+    # Circuit breakers, one per extractor host and extractor
+    CIRCUIT_BREAKER_ENABLED = True
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failures that open a circuit
+    CIRCUIT_BREAKER_RECOVERY_TIME = 30  # Seconds an open circuit waits before probing the host
+    CIRCUIT_BREAKER_MAX_RECOVERY_TIME = 300  # Upper bound as the wait doubles on every failed probe
+    CIRCUIT_BREAKER_PROBE_TIMEOUT = 5  # Seconds a background probe may take
+
+    # Episode source extraction
+    SOURCES_CONCURRENT_FANOUT = True  # Extract all servers at once instead of one by one
+    SOURCES_MAX_CONCURRENCY = 4  # Max servers extracted at the same time
+    SOURCES_SERVER_TIMEOUT = 45  # Seconds allowed per server
+    SOURCES_TOTAL_TIMEOUT = 80  # Seconds allowed for all servers of one episode
+    SOURCES_CACHE_ENABLED = True  # Reuse extracted sources until their signed URLs expire
+    SOURCES_CACHE_DEFAULT_TTL = 300  # Seconds to cache sources whose URLs carry no expiry
+    SOURCES_CACHE_MAX_TTL = 3600  # Upper bound on the cache time, whatever the URLs say
+    SOURCES_CACHE_EXPIRY_MARGIN = 120  # Seconds before URL expiry that cached sources are dropped
+    SOURCES_CACHE_MAX_ENTRIES = 2000  # Max (episode, server, category) results kept
+    SOURCES_HEDGING_ENABLED = True  # Race a duplicate extraction against a server slower than usual
+    SOURCES_HEDGE_PERCENTILE = 95  # A server is slow once it runs past this percentile of its latency
+    SOURCES_HEDGE_MIN_SAMPLES = 20  # Latencies needed per server before it is hedged
+    SOURCES_HEDGE_MIN_DELAY = 0.5  # Never hedge sooner than this many seconds
+    SOURCES_HEDGE_BUDGET_RATIO = 0.1  # Hedged attempts allowed per extraction, over the last minute
+    SOURCES_HEDGE_LATENCY_WINDOW = 200  # Recent latencies kept per server
+    SOURCES_ENOUGH_SERVERS = 0  # Stop once this many servers returned sources, 0 tries every server
+
+    # Server health, used to try the healthiest servers first
+    SERVER_HEALTH_HALF_LIFE = 1800  # Seconds after which old outcomes count half
+    SERVER_HEALTH_LATENCY_REF = 10  # Seconds of mean latency that halve a server's score
+
+    # Parsed HLS playlists
+    M3U8_CACHE_TTL = 300  # Seconds a parsed playlist is reused for the same URL
+    M3U8_CACHE_MAX_ENTRIES = 1000
+    M3U8_FETCH_TIMEOUT = 10  # Seconds allowed per playlist request
+    RAPIDCLOUD_PLAYLIST_CONCURRENCY = 4  # Master playlists of one RapidCloud episode fetched at the same time
+
+    # Liveness probing of extracted source and subtitle URLs
+    SOURCE_PROBE_ENABLED = False  # Probe every returned URL unless a caller asks otherwise
+    SOURCE_PROBE_CONCURRENCY = 8  # URLs probed at the same time per request
+    SOURCE_PROBE_TIMEOUT = 5  # Seconds allowed per probe
+    SOURCE_PROBE_CACHE_TTL = 60  # Seconds a probe result is reused for the same URL and Referer
+    SOURCE_PROBE_CACHE_MAX_ENTRIES = 5000
+
+    # Home page cache
+    HOME_PAGE_CACHE_TTL = 300  # Seconds the home page is served without refreshing
+    HOME_PAGE_STALE_TTL = 3600  # Seconds past the TTL a stale home page is served while it refreshes
+
+    # HTML parsing
+    HOME_PAGE_SINGLE_PASS = True  # Extract all home page sections in one walk of a BeautifulSoup tree
+    HTML_PARSER = "lxml"  # "lxml" (native lxml.html tree), "bs4-lxml" or "bs4-html.parser"
+    HTML_PARSER_OVERRIDES = {}  # Backend per scraper: "home", "about", "servers", "watch", "streamtape"
+
+    # Blocking scraper execution
+    EXECUTOR_MAX_WORKERS = 8  # Threads shared by all blocking scrapers
+    DEFAULT_TOOL_CONCURRENCY = 4  # Max concurrent calls per tool unless listed below
+    TOOL_CONCURRENCY_LIMITS = {
+        "get_home_page": 2,
+        "get_trending_anime": 2,
+        "get_anime_genres": 2,
+        "get_anime_recommendations": 2,
+        "get_anime_about_info": 4,
+        "get_episode_servers": 4,
+        "get_all_episode_servers": 4,
+    }
+
     # Debug settings
     DEBUG_MODE = True
     SAVE_HTML = True
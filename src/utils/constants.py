@@ -1,3 +1,5 @@
+import os
+
 ACCEPT_ENCODING_HEADER = "gzip, deflate, br"
 USER_AGENT_HEADER = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
 ACCEPT_HEADER = "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9"
@@ -5,11 +7,24 @@ ACCEPT_HEADER = "text/html,application/xhtml+xml,application/xml;q=0.9,image/avi
 # previously zoro.to -> aniwatch.to -> aniwatchtv.to -> hianimez.to
 DOMAIN = "hianime.sx"
 
-SRC_BASE_URL = f"https://{DOMAIN}"
+# Upstream hosts can be pointed elsewhere through the environment, e.g. at the
+# local stand-in in benchmarks/standin.py for load testing
+SRC_BASE_URL = os.getenv("SRC_BASE_URL", f"https://{DOMAIN}").rstrip("/")
 SRC_AJAX_URL = f"{SRC_BASE_URL}/ajax"
 SRC_HOME_URL = f"{SRC_BASE_URL}/home"
 SRC_SEARCH_URL = f"{SRC_BASE_URL}/search"
 
+# Embed hosts; RapidCloud defaults to the host of the embed link itself
+MEGACLOUD_URL = os.getenv("MEGACLOUD_URL", "https://megacloud.blog").rstrip("/")
+RAPIDCLOUD_URL = os.getenv("RAPIDCLOUD_URL", "").rstrip("/")
+
+# Decryption keys published for the embed hosts
+MEGACLOUD_KEY_URL = os.getenv(
+    "MEGACLOUD_KEY_URL",
+    "https://raw.githubusercontent.com/itzzzme/megacloud-keys/refs/heads/main/key.txt"
+)
+RAPIDCLOUD_KEY_URL = os.getenv("RAPIDCLOUD_KEY_URL", "https://raw.githubusercontent.com/cinemaxhq/keys/e1/key")
+
 # Search page filters
 SEARCH_PAGE_FILTERS = {
     "GENRES_ID_MAP": {
@@ -0,0 +1,151 @@
+"""Bounded thread pool for running blocking scrapers off the event loop."""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from src.management import get_logger
+from src.utils.config import Config
+
+# Configure logging
+logger = get_logger("ScraperExecutor")
+
+
+class ScraperExecutor:
+    """
+    Run synchronous (cloudscraper/requests based) scrapers on a shared thread pool.
+
+    Every call is tagged with a tool name. Each tool gets its own concurrency limit so
+    one slow tool cannot take every worker, and the number of calls waiting per tool
+    and in the pool itself is tracked for reporting.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, tool_limits: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers or Config.EXECUTOR_MAX_WORKERS
+        self.tool_limits = dict(Config.TOOL_CONCURRENCY_LIMITS)
+        if tool_limits:
+            self.tool_limits.update(tool_limits)
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, tuple] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._pool_pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """Thread pool, created on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scraper")
+            return self._pool
+
+    def _get_semaphore(self, tool: str) -> asyncio.Semaphore:
+        """Get the per-tool semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        entry = self._semaphores.get(tool)
+        if entry is None or entry[0] is not loop:
+            limit = self.tool_limits.get(tool, Config.DEFAULT_TOOL_CONCURRENCY)
+            entry = (loop, asyncio.Semaphore(limit))
+            self._semaphores[tool] = entry
+        return entry[1]
+
+    def _tool_stats(self, tool: str) -> Dict[str, int]:
+        if tool not in self._stats:
+            self._stats[tool] = {
+                "queued": 0,
+                "running": 0,
+                "completed": 0,
+                "failed": 0,
+                "maxQueued": 0
+            }
+        return self._stats[tool]
+
+    def _started(self, state: Dict[str, bool], func: Callable[[], Any]) -> Any:
+        """Runs on the worker thread; marks the call as no longer waiting for a worker."""
+        with self._lock:
+            if not state["released"]:
+                state["released"] = True
+                self._pool_pending -= 1
+        return func()
+
+    async def run(self, tool: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function on the thread pool.
+
+        Args:
+            tool: Name used for the per-tool concurrency limit and stats
+            func: Blocking callable to run
+            *args, **kwargs: Arguments passed to func
+
+        Returns:
+            Whatever func returns; exceptions raised by func propagate unchanged
+        """
+        stats = self._tool_stats(tool)
+        semaphore = self._get_semaphore(tool)
+
+        stats["queued"] += 1
+        stats["maxQueued"] = max(stats["maxQueued"], stats["queued"])
+        if semaphore.locked():
+            logger.debug(f"{tool}: waiting for a free slot ({stats['queued']} queued)")
+
+        acquired = False
+        try:
+            async with semaphore:
+                acquired = True
+                stats["queued"] -= 1
+                stats["running"] += 1
+                state = {"released": False}
+                try:
+                    with self._lock:
+                        self._pool_pending += 1
+                    # Carry context variables such as the caller's deadline into the worker
+                    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        self.pool, self._started, state, call
+                    )
+                    stats["completed"] += 1
+                    return result
+                except Exception:
+                    stats["failed"] += 1
+                    raise
+                finally:
+                    stats["running"] -= 1
+                    # Cancelled before a worker picked the call up
+                    with self._lock:
+                        if not state["released"]:
+                            state["released"] = True
+                            self._pool_pending -= 1
+        finally:
+            # Cancelled while still waiting for a slot
+            if not acquired:
+                stats["queued"] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and call counts for the pool and every tool."""
+        with self._lock:
+            pool_pending = self._pool_pending
+        return {
+            "maxWorkers": self.max_workers,
+            "poolQueueDepth": pool_pending,
+            "tools": {
+                tool: {
+                    **stats,
+                    "limit": self.tool_limits.get(tool, Config.DEFAULT_TOOL_CONCURRENCY)
+                }
+                for tool, stats in self._stats.items()
+            }
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the thread pool."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+# Create a singleton executor instance
+executor = ScraperExecutor()
@@ -1,5 +1,6 @@
 """Utility functions for extracting anime data from HTML elements."""
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple, TypeVar
 from bs4 import BeautifulSoup, Tag, ResultSet
 from dataclasses import dataclass
 from src.management import get_logger
@@ -33,13 +34,106 @@ def safe_select_one(element: Tag, selector: str) -> Optional[Tag]:
         logger.error(f"Failed to use selector '{selector}': {str(e)}")
         return None
 
-def extract_episodes(element: Tag) -> EpisodeInfo:
-    """Extract episode information from an HTML element."""
+T = TypeVar("T")
+
+class SelectorChain:
+    """
+    Fallback CSS selectors that remember which one matched last.
+
+    The selector that matched last time is tried first and the others follow in
+    their declared order, so once the site layout drifts away from the first
+    selector the misses are paid once instead of on every scrape. Hits and
+    misses are counted per selector for diagnostics.
+    """
+
+    def __init__(self, name: str, selectors: Iterable[str]):
+        self.name = name
+        self.selectors = tuple(selectors)
+        self._preferred = self.selectors[0]
+        self._hits = {selector: 0 for selector in self.selectors}
+        self._misses = {selector: 0 for selector in self.selectors}
+        self._lock = threading.Lock()
+
+    def candidates(self) -> List[str]:
+        """Selectors in the order they will be tried."""
+        preferred = self._preferred
+        return [preferred] + [selector for selector in self.selectors if selector != preferred]
+
+    def resolve(self, match: Callable[[str], T]) -> Tuple[Optional[str], Optional[T]]:
+        """
+        Try the selectors until match(selector) returns something truthy.
+
+        Args:
+            match: Runs one selector, e.g. lambda selector: soup.select_one(selector)
+
+        Returns:
+            The matching selector and match's result, or (None, None) if none matched
+        """
+        for selector in self.candidates():
+            result = match(selector)
+            with self._lock:
+                if result:
+                    self._hits[selector] += 1
+                    self._preferred = selector
+                else:
+                    self._misses[selector] += 1
+            if result:
+                return selector, result
+        return None, None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "preferred": self._preferred,
+                "selectors": [
+                    {"selector": selector, "hits": self._hits[selector], "misses": self._misses[selector]}
+                    for selector in self.selectors
+                ]
+            }
+
+# Selectors behind extract_episodes and extract_base_anime_info, by field
+EPISODE_FIELDS = {
+    "sub": ".tick-sub, .tick .sub",
+    "dub": ".tick-dub, .tick .dub",
+    "total": ".tick-eps, .tick .total",
+}
+BASE_ANIME_FIELDS = {
+    "name": ".dynamic-name, .film-name, .flw-item .film-detail .film-name",
+    "title": "a[title]",
+    "poster": ".film-poster-img, .poster-img, img, .film-poster img",
+    "type": ".fd-infor .tick-item.tick-type, .tick .type, .fdi-type",
+    "link": "a[href]",
+}
+
+class SelectLookup:
+    """
+    Finds named fields inside an element with one CSS query per lookup.
+
+    The single-pass extractor (src.utils.singlepass.ItemLookup) offers the same
+    first/all interface with the fields found during its tree walk, so item
+    parsers written against a lookup work with either.
+    """
+
+    def __init__(self, element: Tag, fields: Dict[str, str]):
+        self.element = element
+        self.fields = fields
+
+    def first(self, field: str) -> Optional[Tag]:
+        """First element matching the field's selector, in document order."""
+        return safe_select_one(self.element, self.fields[field])
+
+    def all(self, field: str) -> List[Tag]:
+        """Every element matching the field's selector, in document order."""
+        return safe_select(self.element, self.fields[field])
+
+def episode_info(lookup) -> EpisodeInfo:
+    """Extract episode information from a lookup over EPISODE_FIELDS."""
     try:
-        sub_ep = safe_select_one(element, ".tick-sub, .tick .sub")
-        dub_ep = safe_select_one(element, ".tick-dub, .tick .dub")
-        total_ep = safe_select_one(element, ".tick-eps, .tick .total")
-        
+        sub_ep = lookup.first("sub")
+        dub_ep = lookup.first("dub")
+        total_ep = lookup.first("total")
+
         return EpisodeInfo(
             sub=safe_int_extract(sub_ep.text if sub_ep else None),
             dub=safe_int_extract(dub_ep.text if dub_ep else None),
@@ -49,13 +143,13 @@ def extract_episodes(element: Tag) -> EpisodeInfo:
         logger.error(f"Failed to extract episodes: {str(e)}")
         return EpisodeInfo()
 
-def extract_base_anime_info(element: Tag) -> Dict[str, Any]:
-    """Extract common anime information from an HTML element."""
+def base_anime_info(lookup) -> Dict[str, Any]:
+    """Extract common anime information from a lookup over BASE_ANIME_FIELDS."""
     info = {}
     
     try:
         # Extract name with multiple selector possibilities
-        name_elem = safe_select_one(element, ".dynamic-name, .film-name, .flw-item .film-detail .film-name")
+        name_elem = lookup.first("name")
         if name_elem:
             info["name"] = name_elem.text.strip()
             if hasattr(name_elem, 'attrs') and "data-jname" in name_elem.attrs:
@@ -63,12 +157,12 @@ def extract_base_anime_info(element: Tag) -> Dict[str, Any]:
             
         # If no name found, try a more generic approach
         if not info.get("name"):
-            any_title = safe_select_one(element, "a[title]")
+            any_title = lookup.first("title")
             if any_title and "title" in any_title.attrs:
                 info["name"] = any_title["title"].strip()
         
         # Extract poster with fallback selectors
-        poster = safe_select_one(element, ".film-poster-img, .poster-img, img, .film-poster img")
+        poster = lookup.first("poster")
         if poster:
             if hasattr(poster, 'attrs'):
                 if "src" in poster.attrs:
@@ -79,12 +173,12 @@ def extract_base_anime_info(element: Tag) -> Dict[str, Any]:
                     info["poster"] = poster["data-original"].strip()
         
         # Extract type with fallback selectors
-        type_elem = safe_select_one(element, ".fd-infor .tick-item.tick-type, .tick .type, .fdi-type")
+        type_elem = lookup.first("type")
         if type_elem:
             info["type"] = type_elem.text.strip()
         
         # Extract ID from href
-        link = safe_select_one(element, "a[href]")
+        link = lookup.first("link")
         if link and hasattr(link, 'attrs') and "href" in link.attrs:
             href = link["href"]
             if href.startswith("/"):
@@ -95,6 +189,14 @@ def extract_base_anime_info(element: Tag) -> Dict[str, Any]:
         logger.error(f"Failed to extract base anime info: {str(e)}")
         return info
 
+def extract_episodes(element: Tag) -> EpisodeInfo:
+    """Extract episode information from an HTML element."""
+    return episode_info(SelectLookup(element, EPISODE_FIELDS))
+
+def extract_base_anime_info(element: Tag) -> Dict[str, Any]:
+    """Extract common anime information from an HTML element."""
+    return base_anime_info(SelectLookup(element, BASE_ANIME_FIELDS))
+
 def safe_int_extract(text: Optional[str]) -> Optional[int]:
     """Safely extract integer from text."""
     if not text:
@@ -0,0 +1,130 @@
+"""Decaying health scores of the streaming servers, used to order source extraction."""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypeVar
+
+from .config import Config
+
+T = TypeVar("T")
+
+
+class HealthScore:
+    """
+    Exponentially decayed outcome counts and latency of one server.
+
+    Every count halves after `half_life` seconds without new outcomes, so a
+    server that failed an hour ago is judged mostly on what it did since.
+    """
+
+    def __init__(self, half_life: float):
+        self.half_life = half_life
+        self.successes = 0.0
+        self.failures = 0.0
+        self.decryption_failures = 0.0
+        self.latency: Optional[float] = None  # Decayed mean of successful extractions, seconds
+        self._latency_weight = 0.0
+        self.updated_at = time.monotonic()
+        self.last_error: Optional[str] = None
+
+    def _decay(self, now: float):
+        factor = 0.5 ** ((now - self.updated_at) / self.half_life)
+        self.successes *= factor
+        self.failures *= factor
+        self.decryption_failures *= factor
+        self._latency_weight *= factor
+        self.updated_at = now
+
+    def record(self, ok: bool, latency: Optional[float] = None, decryption_failure: bool = False, error: str = None):
+        self._decay(time.monotonic())
+        if ok:
+            self.successes += 1
+            if latency is not None:
+                # Weighted mean where older samples lose weight as they decay
+                self._latency_weight += 1
+                previous = self.latency if self.latency is not None else latency
+                self.latency = previous + (latency - previous) / self._latency_weight
+        else:
+            self.failures += 1
+            self.last_error = error
+            if decryption_failure:
+                self.decryption_failures += 1
+
+    def score(self, latency_ref: float) -> float:
+        """
+        Score between 0 and 1, higher is healthier.
+
+        The success rate is smoothed towards 1/2 so that a server seen once is
+        not ranked above one with a long good record, then divided by a latency
+        penalty that doubles the divisor at `latency_ref` seconds.
+        """
+        self._decay(time.monotonic())
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        penalty = 1 + (self.latency or 0) / latency_ref
+        return success_rate / penalty
+
+    def summary(self, latency_ref: float) -> Dict[str, Any]:
+        score = self.score(latency_ref)
+        total = self.successes + self.failures
+        return {
+            "score": round(score, 3),
+            "successRate": round(self.successes / total, 3) if total else None,
+            "successes": round(self.successes, 2),
+            "failures": round(self.failures, 2),
+            "decryptionFailures": round(self.decryption_failures, 2),
+            "latencyMs": round(self.latency * 1000) if self.latency is not None else None,
+            "lastError": self.last_error
+        }
+
+
+class ServerHealth:
+    """
+    Health registry keyed by server ID.
+
+    Extractions report their outcome with record(); order() then puts the
+    healthiest servers first, keeping the site's order for servers that score
+    the same, e.g. before anything was recorded.
+    """
+
+    def __init__(
+        self,
+        names: Optional[Dict[Hashable, str]] = None,
+        half_life: float = None,
+        latency_ref: float = None
+    ):
+        self.names = names or {}
+        self.half_life = half_life or Config.SERVER_HEALTH_HALF_LIFE
+        self.latency_ref = latency_ref or Config.SERVER_HEALTH_LATENCY_REF
+        self._scores: Dict[Hashable, HealthScore] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        server_id: Hashable,
+        ok: bool,
+        latency: Optional[float] = None,
+        decryption_failure: bool = False,
+        error: str = None
+    ):
+        """Record the outcome of one extraction from a server."""
+        with self._lock:
+            if server_id not in self._scores:
+                self._scores[server_id] = HealthScore(self.half_life)
+            self._scores[server_id].record(ok, latency, decryption_failure, error)
+
+    def score(self, server_id: Hashable) -> float:
+        with self._lock:
+            health = self._scores.get(server_id)
+            return health.score(self.latency_ref) if health else 0.5
+
+    def order(self, servers: List[T], key: Callable[[T], Hashable]) -> List[T]:
+        """Sort servers healthiest first; the sort is stable."""
+        return sorted(servers, key=lambda server: -self.score(key(server)))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Get the health of every server that has been recorded, healthiest first."""
+        with self._lock:
+            entries = [
+                {"serverId": server_id, "serverName": self.names.get(server_id), **health.summary(self.latency_ref)}
+                for server_id, health in self._scores.items()
+            ]
+        return sorted(entries, key=lambda entry: -entry["score"])
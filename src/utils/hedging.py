@@ -0,0 +1,138 @@
+"""Hedged calls: start a duplicate when the first attempt runs past the observed tail latency."""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional
+
+from src.management import get_logger
+from .retry import RetryBudget
+
+# Configure logging
+logger = get_logger("Hedging")
+
+
+class LatencyWindow:
+    """The most recent latencies of one kind of call."""
+
+    def __init__(self, size: int):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[max(0, math.ceil(pct / 100 * len(samples)) - 1)]
+
+
+class Hedger:
+    """
+    Cut tail latency by racing a second attempt against a slow first one.
+
+    Latencies of successful calls are tracked per key. Once a key has enough
+    samples, a call still running after the key's percentile latency gets a
+    duplicate attempt and whichever succeeds first wins; the other is cancelled.
+    Hedges are limited to a fraction of calls by a budget so a slow upstream is
+    not hit twice as hard.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 95,
+        min_samples: int = 20,
+        min_delay: float = 0,
+        budget_ratio: float = 0.1,
+        window: int = 200
+    ):
+        self.name = name
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self.budget = RetryBudget(ratio=budget_ratio, min_per_second=0, window=60)
+        self._latencies: Dict[Hashable, LatencyWindow] = {}
+        self._stats = {
+            "calls": 0,
+            "hedged": 0,
+            "hedgeWins": 0,
+            "budgetDenied": 0
+        }
+
+    def _window(self, key: Hashable) -> LatencyWindow:
+        if key not in self._latencies:
+            self._latencies[key] = LatencyWindow(self.window)
+        return self._latencies[key]
+
+    def record(self, key: Hashable, seconds: float):
+        """Add the latency of a successful call made without run()."""
+        self._window(key).record(seconds)
+
+    def hedge_delay(self, key: Hashable) -> Optional[float]:
+        """Seconds after which a call for key gets a duplicate, or None while too few samples exist."""
+        window = self._window(key)
+        if len(window) < self.min_samples:
+            return None
+        return max(self.min_delay, window.percentile(self.percentile))
+
+    async def run(self, key: Hashable, attempt: Callable[[bool], Awaitable[Any]]) -> Any:
+        """
+        Run attempt(False), hedging with attempt(True) if it is slow.
+
+        Args:
+            key: What the latency is tracked by, e.g. the server name
+            attempt: Coroutine function making one attempt; its argument tells whether it is the hedge
+
+        Returns:
+            The result of the first successful attempt; if both fail, the first attempt's error
+        """
+        self._stats["calls"] += 1
+        self.budget.record_request()
+        started_at = time.monotonic()
+        primary = asyncio.ensure_future(attempt(False))
+        tasks = [primary]
+        try:
+            delay = self.hedge_delay(key)
+            if delay is not None:
+                done, _ = await asyncio.wait([primary], timeout=delay)
+                if not done:
+                    if self.budget.try_spend():
+                        self._stats["hedged"] += 1
+                        logger.info(f"{self.name}: {key} slower than {delay:.2f}s, starting a hedged attempt")
+                        tasks.append(asyncio.ensure_future(attempt(True)))
+                    else:
+                        self._stats["budgetDenied"] += 1
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task in done and not task.cancelled() and task.exception() is None:
+                        if task is not primary:
+                            self._stats["hedgeWins"] += 1
+                        self._window(key).record(time.monotonic() - started_at)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    # Retrieve the outcome so a late failure is not reported as unhandled
+                    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hedging counters and the current hedge delay per key."""
+        return {
+            **self._stats,
+            "hedgeDelays": {
+                str(key): round(delay, 3)
+                for key in self._latencies
+                if (delay := self.hedge_delay(key)) is not None
+            }
+        }
@@ -0,0 +1,251 @@
+"""Persistent on-disk HTTP response cache with conditional revalidation."""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.management import get_logger
+from .config import Config
+
+# Configure logging
+logger = get_logger("HttpCache")
+
+# Response headers kept with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date")
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body and the validators needed to revalidate it."""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    encoding: Optional[str]
+    stored_at: float
+    expires_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("Last-Modified")
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers asking the server to answer 304 if the body did not change."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Build a requests Response serving the stored body."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = "OK"
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response._content = self.content
+        return response
+
+
+class DiskCache:
+    """
+    Store GET responses on disk so they survive restarts.
+
+    Every entry is a body file plus a small JSON metadata file holding the URL,
+    validators and expiry. Entries stay fresh for a fixed TTL; after that the
+    transport revalidates them with If-None-Match / If-Modified-Since and only
+    downloads the body again if the server reports a change. The total size on
+    disk is kept under max_bytes by evicting the least recently used entries.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = None, ttl: float = None):
+        self.directory = directory or Config.HTTP_DISK_CACHE_DIR
+        self.max_bytes = max_bytes or Config.HTTP_DISK_CACHE_MAX_BYTES
+        self.ttl = Config.HTTP_DISK_CACHE_TTL if ttl is None else ttl
+
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "evictions": 0
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load_index(self):
+        """Rebuild the LRU order and size accounting from the files on disk."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-5]
+            meta_path, body_path = self._paths(key)
+            try:
+                size = os.path.getsize(meta_path) + os.path.getsize(body_path)
+                entries.append((os.path.getmtime(meta_path), key, size))
+            except OSError:
+                self._remove_files(key)
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total_bytes += size
+        if entries:
+            logger.info(f"Loaded {len(entries)} cached responses ({self._total_bytes} bytes) from {self.directory}")
+
+    def _remove_files(self, key: str):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Get the stored response for url, fresh or not, or None."""
+        key = self._key(url)
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                with open(body_path, "rb") as f:
+                    content = f.read()
+                # The metadata mtime doubles as the last access time for eviction
+                os.utime(meta_path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+                self._drop(key)
+                return None
+            self._sizes.move_to_end(key)
+        return CachedResponse(content=content, **meta)
+
+    def put(self, url: str, response: requests.Response) -> Optional[CachedResponse]:
+        """Store a 200 response; other responses are ignored."""
+        if response.status_code != 200:
+            return None
+        now = time.time()
+        entry = CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            headers={name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            content=response.content,
+            encoding=response.encoding,
+            stored_at=now,
+            expires_at=now + self.ttl
+        )
+        if self._store(entry):
+            with self._lock:
+                self._stats["stores"] += 1
+        return entry
+
+    def refresh(self, entry: CachedResponse, response: requests.Response) -> CachedResponse:
+        """Extend an entry after a 304 Not Modified, taking any updated validators."""
+        for name in ("ETag", "Last-Modified", "Date"):
+            if name in response.headers:
+                entry.headers[name] = response.headers[name]
+        entry.stored_at = time.time()
+        entry.expires_at = entry.stored_at + self.ttl
+        self._store(entry)
+        with self._lock:
+            self._stats["revalidated"] += 1
+        return entry
+
+    def _store(self, entry: CachedResponse) -> bool:
+        """Write an entry to disk, returning whether it was stored."""
+        key = self._key(entry.url)
+        meta_path, body_path = self._paths(key)
+        meta = {
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "encoding": entry.encoding,
+            "stored_at": entry.stored_at,
+            "expires_at": entry.expires_at
+        }
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        size = len(meta_bytes) + len(entry.content)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {entry.url}: {size} bytes exceeds the cache size")
+            return False
+
+        with self._lock:
+            try:
+                self._write_atomic(body_path, entry.content)
+                self._write_atomic(meta_path, meta_bytes)
+            except OSError as e:
+                logger.warning(f"Failed to cache {entry.url}: {e}")
+                self._drop(key)
+                return False
+            self._total_bytes += size - self._sizes.pop(key, 0)
+            self._sizes[key] = size
+            self._evict()
+        return True
+
+    def _drop(self, key: str):
+        self._remove_files(key)
+        self._total_bytes -= self._sizes.pop(key, 0)
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        while self._total_bytes > self.max_bytes and self._sizes:
+            key = next(iter(self._sizes))
+            self._drop(key)
+            self._stats["evictions"] += 1
+
+    def record(self, hit: bool):
+        with self._lock:
+            self._stats["hits" if hit else "misses"] += 1
+
+    def clear(self):
+        """Remove every stored response."""
+        with self._lock:
+            for key in list(self._sizes):
+                self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the disk usage of the cache."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._sizes),
+                "bytes": self._total_bytes,
+                "maxBytes": self.max_bytes
+            }
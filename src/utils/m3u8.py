@@ -0,0 +1,313 @@
+"""Streaming parser for HLS (M3U8) master and media playlists, with variant selection."""
+import io
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from src.management import get_logger
+from .cache import TTLCache
+from .client import async_client
+from .config import Config
+
+# Configure logging
+logger = get_logger("M3U8")
+
+# KEY=VALUE pairs of an attribute list; quoted values may contain commas (CODECS="avc1,mp4a")
+_ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+@dataclass(frozen=True, slots=True)
+class Variant:
+    """One rendition listed in a master playlist."""
+    url: str
+    bandwidth: Optional[int] = None
+    average_bandwidth: Optional[int] = None
+    resolution: Optional[Tuple[int, int]] = None
+    codecs: Optional[str] = None
+    frame_rate: Optional[float] = None
+    iframe: bool = False
+
+    @property
+    def height(self) -> Optional[int]:
+        return self.resolution[1] if self.resolution else None
+
+    @property
+    def quality(self) -> str:
+        """Quality label such as "720p", or "auto" without a resolution."""
+        return f"{self.height}p" if self.height else "auto"
+
+
+@dataclass(frozen=True, slots=True)
+class MediaInfo:
+    """Summary of a media playlist; segments are counted, not kept."""
+    segments: int = 0
+    duration: float = 0.0
+    target_duration: Optional[float] = None
+    media_sequence: int = 0
+    ended: bool = False
+    first_segment: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Playlist:
+    """A parsed playlist: variants for a master playlist, a summary for a media playlist."""
+    url: str
+    variants: Tuple[Variant, ...] = ()
+    iframe_variants: Tuple[Variant, ...] = ()
+    media: Optional[MediaInfo] = None
+
+    @property
+    def is_master(self) -> bool:
+        return bool(self.variants or self.iframe_variants)
+
+
+def parse_attributes(text: str) -> Dict[str, str]:
+    """Parse an EXT-X attribute list into a dict, unquoting quoted values."""
+    return {
+        name: value[1:-1] if value.startswith('"') else value
+        for name, value in _ATTRIBUTE.findall(text)
+    }
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _variant(attributes: Dict[str, str], url: str, iframe: bool) -> Variant:
+    resolution = None
+    width, _, height = attributes.get("RESOLUTION", "").partition("x")
+    if width.isdigit() and height.isdigit():
+        resolution = (int(width), int(height))
+    try:
+        frame_rate = float(attributes["FRAME-RATE"]) if "FRAME-RATE" in attributes else None
+    except ValueError:
+        frame_rate = None
+    return Variant(
+        url=url,
+        bandwidth=_int(attributes.get("BANDWIDTH")),
+        average_bandwidth=_int(attributes.get("AVERAGE-BANDWIDTH")),
+        resolution=resolution,
+        codecs=attributes.get("CODECS"),
+        frame_rate=frame_rate,
+        iframe=iframe
+    )
+
+
+class PlaylistParser:
+    """
+    Single-pass parser fed one playlist line at a time, e.g. as the playlist downloads.
+
+    Only variants are kept; the segments of a media playlist are summarized as
+    they go by, so memory does not grow with the length of the playlist.
+    """
+
+    def __init__(self, base_url: str = ""):
+        self.base_url = base_url
+        self.variants: List[Variant] = []
+        self.iframe_variants: List[Variant] = []
+        self._pending: Optional[Dict[str, str]] = None  # Attributes of a STREAM-INF awaiting its URI line
+
+        self.segments = 0
+        self.duration = 0.0
+        self.target_duration = None
+        self.media_sequence = 0
+        self.ended = False
+        self.first_segment = None
+
+    def feed(self, raw_line: str):
+        """Parse the next line of the playlist."""
+        line = raw_line.strip()
+        if not line:
+            return
+        if line[0] != "#":
+            # Only URIs that are kept get resolved; segments are just counted
+            if self._pending is not None:
+                self.variants.append(_variant(self._pending, urljoin(self.base_url, line), iframe=False))
+                self._pending = None
+            else:
+                self.segments += 1
+                if self.first_segment is None:
+                    self.first_segment = urljoin(self.base_url, line)
+            return
+
+        tag, _, value = line.partition(":")
+        if tag == "#EXT-X-STREAM-INF":
+            self._pending = parse_attributes(value)
+        elif tag == "#EXT-X-I-FRAME-STREAM-INF":
+            attributes = parse_attributes(value)
+            if attributes.get("URI"):
+                self.iframe_variants.append(_variant(attributes, urljoin(self.base_url, attributes["URI"]), iframe=True))
+        elif tag == "#EXTINF":
+            try:
+                self.duration += float(value.split(",", 1)[0])
+            except ValueError:
+                pass
+        elif tag == "#EXT-X-TARGETDURATION":
+            self.target_duration = float(value) if value.replace(".", "", 1).isdigit() else None
+        elif tag == "#EXT-X-MEDIA-SEQUENCE":
+            self.media_sequence = _int(value) or 0
+        elif tag == "#EXT-X-ENDLIST":
+            self.ended = True
+
+    def result(self) -> Playlist:
+        """The playlist parsed from the lines fed so far."""
+        media = None
+        if not self.variants and not self.iframe_variants:
+            media = MediaInfo(
+                self.segments, round(self.duration, 3), self.target_duration,
+                self.media_sequence, self.ended, self.first_segment
+            )
+        return Playlist(self.base_url, tuple(self.variants), tuple(self.iframe_variants), media)
+
+
+def parse_playlist(source: Union[str, Iterable[str]], base_url: str = "") -> Playlist:
+    """
+    Parse a master or media playlist in a single pass over its lines.
+
+    Args:
+        source: Playlist text, or any iterable of its lines
+        base_url: URL of the playlist, used to make relative URIs absolute
+
+    Returns:
+        The parsed playlist; URIs are resolved against base_url
+    """
+    lines = io.StringIO(source) if isinstance(source, str) else source
+    parser = PlaylistParser(base_url)
+    for line in lines:
+        parser.feed(line)
+    return parser.result()
+
+
+def _rank(variant: Variant) -> Tuple[int, int]:
+    return (variant.height or 0, variant.bandwidth or variant.average_bandwidth or 0)
+
+
+def sort_variants(variants: Iterable[Variant]) -> List[Variant]:
+    """Order variants from the highest resolution and bandwidth to the lowest."""
+    return sorted(variants, key=_rank, reverse=True)
+
+
+def parse_quality(quality: Union[str, int]) -> Union[str, int]:
+    """
+    Normalize a requested quality to "best", "worst" or a height in pixels.
+
+    Raises:
+        ValueError: The quality is neither of those nor a height such as 720 or "720p"
+    """
+    if isinstance(quality, int):
+        return quality
+    label = str(quality).strip().lower()
+    if label in ("best", "worst"):
+        return label
+    height = label[:-1] if label.endswith("p") else label
+    if not height.isdigit():
+        raise ValueError(f"quality must be best, worst or a height such as 720p, not {quality!r}")
+    return int(height)
+
+
+def select_variant(
+    variants: Iterable[Variant],
+    quality: Union[str, int] = "best",
+    max_bandwidth: Optional[int] = None
+) -> Optional[Variant]:
+    """
+    Pick one variant.
+
+    Args:
+        variants: Candidates, typically Playlist.variants
+        quality: "best", "worst", or a height such as 720 or "720p"; for a height the
+            highest variant not above it is chosen, else the lowest one above it
+        max_bandwidth: Ignore variants needing more bits per second, unless none is left
+
+    Returns:
+        The chosen variant, or None if there are no variants
+    """
+    ranked = sort_variants(variants)
+    if max_bandwidth:
+        affordable = [variant for variant in ranked if (variant.bandwidth or 0) <= max_bandwidth]
+        ranked = affordable or ranked
+    if not ranked:
+        return None
+    target = parse_quality(quality)
+    if target == "best":
+        return ranked[0]
+    if target == "worst":
+        return ranked[-1]
+
+    for variant in ranked:
+        if variant.height is not None and variant.height <= target:
+            return variant
+    return ranked[-1]
+
+
+def select_sources(sources: List[Dict[str, Any]], quality: Union[str, int]) -> List[Dict[str, Any]]:
+    """
+    Keep the one extracted source closest to the requested quality.
+
+    Sources are ranked by their "quality" label, such as "720p" for the variants
+    the extractors expand master playlists into. Sources without a height, such
+    as an adaptive "auto" playlist, are only chosen when no source has one.
+
+    Args:
+        sources: The "sources" of an extraction result
+        quality: As for select_variant()
+
+    Returns:
+        A list holding the chosen source, or the sources as they are if there are none
+    """
+    by_variant = {}
+    for source in sources or []:
+        label = str(source.get("quality") or "").lower()
+        height = int(label[:-1]) if label.endswith("p") and label[:-1].isdigit() else None
+        by_variant.setdefault(Variant(url=source.get("url") or "", resolution=(0, height) if height else None), source)
+    with_height = [variant for variant in by_variant if variant.height]
+    chosen = select_variant(with_height or by_variant, quality)
+    return [by_variant[chosen]] if chosen is not None else list(sources or [])
+
+
+# Parsed playlists by URL; signed URLs give every token its own entry
+playlist_cache = TTLCache(
+    "m3u8_playlists",
+    ttl=Config.M3U8_CACHE_TTL,
+    max_entries=Config.M3U8_CACHE_MAX_ENTRIES
+)
+
+
+async def fetch_playlist(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    cache: bool = True,
+    timeout: Optional[float] = None
+) -> Playlist:
+    """
+    Download and parse a playlist line by line, reusing a cached parse of the same URL.
+
+    Args:
+        url: Playlist URL
+        headers: Extra request headers, e.g. the Referer the host expects
+        cache: Reuse a parse cached for the same URL
+        timeout: Seconds allowed per request (defaults to Config.EXTRACTOR_REQUEST_TIMEOUT)
+
+    Raises:
+        Whatever the transport raises for network errors and non-2xx responses
+    """
+    async def parse(response) -> Playlist:
+        parser = PlaylistParser(url)
+        encoding = response.charset or "utf-8"
+        async for line in response.content:
+            parser.feed(line.decode(encoding, errors="replace"))
+        return parser.result()
+
+    async def load() -> Playlist:
+        return await async_client.stream(url, parse, headers=headers, timeout=timeout or Config.EXTRACTOR_REQUEST_TIMEOUT)
+
+    if not cache:
+        return await load()
+    playlist, info = await playlist_cache.get_or_load(url, load)
+    if info.hit:
+        logger.debug(f"Using cached playlist for {url}")
+    return playlist
@@ -0,0 +1,386 @@
+"""Pluggable HTML parser backends behind the BeautifulSoup interface the scrapers use."""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import lxml.html
+from bs4 import BeautifulSoup, FeatureNotFound
+from bs4.builder import HTMLTreeBuilder
+from lxml import etree
+
+from src.management import get_logger
+from .config import Config
+from .singlepass import UnsupportedSelector
+
+# Configure logging
+logger = get_logger("HtmlParsing")
+
+# "lxml" builds a native lxml.html tree, the others a BeautifulSoup tree with that builder
+BACKENDS = ("lxml", "bs4-lxml", "bs4-html.parser")
+
+# Attributes BeautifulSoup splits into a list of values, by tag name ("*" for any tag)
+_LIST_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+# Elements whose text BeautifulSoup leaves out of an ancestor's get_text()
+_SEPARATE_TEXT = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+
+# Elements inside which BeautifulSoup keeps whitespace-only text as it is
+_PRESERVE_WHITESPACE = frozenset(HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS)
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# One token of a selector: a combinator, or one part of a compound
+_SELECTOR_TOKEN = re.compile(r"""
+    \s*(?P<combinator>[>,])\s*
+  | (?P<descendant>\s+)
+  | (?P<tag>[a-zA-Z][\w-]*|\*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+))\s*)?\]
+""", re.VERBOSE)
+
+Node = Union[BeautifulSoup, "LxmlNode"]
+
+
+def _literal(value: str) -> str:
+    """An XPath string literal for value."""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+def _parse_selector(selector: str) -> List[List[Tuple[str, Optional[str], List[str]]]]:
+    """Split a selector group into compounds of (preceding combinator, tag name, XPath predicates)."""
+    groups = []
+    steps = []
+    combinator = " "
+    compound = None
+    text = selector.strip()
+    pos = 0
+    while pos < len(text):
+        match = _SELECTOR_TOKEN.match(text, pos)
+        if not match:
+            raise UnsupportedSelector(f"Unsupported selector '{selector}'")
+        pos = match.end()
+
+        if match.group("combinator") or match.group("descendant"):
+            if compound is None:
+                raise UnsupportedSelector(f"Unsupported selector '{selector}'")
+            steps.append(compound)
+            compound = None
+            combinator = match.group("combinator") or " "
+            if combinator == ",":
+                groups.append(steps)
+                steps = []
+                combinator = " "
+            continue
+
+        if compound is None:
+            compound = (combinator, None, [])
+        if match.group("tag"):
+            if compound[1] or compound[2]:
+                raise UnsupportedSelector(f"Unsupported selector '{selector}'")
+            compound = (combinator, match.group("tag").lower(), [])
+        elif match.group("id"):
+            compound[2].append(f"@id={_literal(match.group('id'))}")
+        elif match.group("cls"):
+            compound[2].append(f"contains(concat(' ', normalize-space(@class), ' '), {_literal(' ' + match.group('cls') + ' ')})")
+        else:
+            attribute = match.group("attr").lower()
+            value = next((value for value in match.group("dq", "sq", "bare") if value is not None), None)
+            compound[2].append(f"@{attribute}" if value is None else f"@{attribute}={_literal(value)}")
+
+    if compound is None:
+        raise UnsupportedSelector(f"Unsupported selector '{selector}'")
+    steps.append(compound)
+    groups.append(steps)
+    return groups
+
+
+def css_to_xpath(selector: str, axis: str = "descendant") -> str:
+    """
+    Translate a CSS selector group into an XPath expression.
+
+    Supports tag names, #id, .class, [attribute] and [attribute="value"] joined
+    by descendant and child combinators, which covers every selector the
+    scrapers use. Each compound is matched on the element itself and the
+    previous ones on its ancestors, so, as with BeautifulSoup's select(),
+    ancestors outside the searched subtree count.
+
+    Raises:
+        UnsupportedSelector: For sibling combinators, attribute operators or pseudo-classes
+    """
+    expressions = []
+    for steps in _parse_selector(selector):
+        expression = None
+        for combinator, name, predicates in steps:
+            test = (name or "*") + "".join(f"[{predicate}]" for predicate in predicates)
+            if expression is not None:
+                test += f"[{'parent' if combinator == '>' else 'ancestor'}::{expression}]"
+            expression = test
+        expressions.append(f"{axis}::{expression}")
+    return " | ".join(expressions)
+
+
+@lru_cache(maxsize=None)
+def _compiled_selector(selector: str, axis: str, first: bool) -> etree.XPath:
+    expression = css_to_xpath(selector, axis)
+    return etree.XPath(f"({expression})[1]" if first else expression)
+
+
+def _normalized(text: str, preserve: bool) -> str:
+    """Text as BeautifulSoup stores it: whitespace-only text collapses to one newline or space."""
+    if preserve or text.strip(_ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _preserves_whitespace(element) -> bool:
+    return element.tag in _PRESERVE_WHITESPACE or next(element.iterancestors(*_PRESERVE_WHITESPACE), None) is not None
+
+
+def _text_pieces(element, preserve: bool) -> Iterator[str]:
+    """Text of an element in document order, without comments or nested script/style text."""
+    if element.text:
+        yield _normalized(element.text, preserve)
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _SEPARATE_TEXT:
+            yield from _text_pieces(child, preserve or child.tag in _PRESERVE_WHITESPACE)
+        if child.tail:
+            yield _normalized(child.tail, preserve)
+
+
+def _value_matches(actual: Any, expected: Any) -> bool:
+    """Match an attribute value or string the way BeautifulSoup's find() does."""
+    if expected is True:
+        return actual is not None
+    if expected is None:
+        return actual is None
+    candidates = [*actual, " ".join(actual)] if isinstance(actual, list) else [actual]
+    if callable(expected):
+        return any(expected(candidate) for candidate in candidates)
+    if hasattr(expected, "search"):
+        return any(candidate is not None and expected.search(candidate) for candidate in candidates)
+    return expected in candidates
+
+
+class LxmlNode:
+    """
+    An lxml.html element behind the subset of BeautifulSoup's Tag interface the
+    scrapers use: name, attrs, get/[], text, get_text(), string, parent,
+    contents, select(), select_one(), find() and find_all().
+
+    Nodes are created through their document, which hands out the same node for
+    the same element every time, so nodes can be compared with `is`.
+    """
+    __slots__ = ("element", "document", "_attrs")
+
+    def __init__(self, element, document: "LxmlDocument"):
+        self.element = element
+        self.document = document
+        self._attrs = None
+
+    # Axis select() searches along, relative to the element
+    _axis = "descendant"
+
+    @property
+    def name(self) -> str:
+        return self.element.tag
+
+    @property
+    def attrs(self) -> Dict[str, Union[str, List[str]]]:
+        if self._attrs is None:
+            attrs = dict(self.element.attrib)
+            for key in (*_LIST_ATTRIBUTES["*"], *_LIST_ATTRIBUTES.get(self.element.tag, ())):
+                if key in attrs:
+                    attrs[key] = attrs[key].split()
+            self._attrs = attrs
+        return self._attrs
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> Union[str, List[str]]:
+        return self.attrs[key]
+
+    def has_attr(self, key: str) -> bool:
+        return key in self.attrs
+
+    @property
+    def parent(self) -> Optional["LxmlNode"]:
+        parent = self.element.getparent()
+        return self.document if parent is None else self.document.wrap(parent)
+
+    @property
+    def contents(self) -> List[Union[str, "LxmlNode"]]:
+        """Child elements and text, in document order; comments are left out."""
+        element = self.element
+        preserve = _preserves_whitespace(element)
+        contents = [_normalized(element.text, preserve)] if element.text else []
+        for child in element:
+            if isinstance(child.tag, str):
+                contents.append(self.document.wrap(child))
+            if child.tail:
+                contents.append(_normalized(child.tail, preserve))
+        return contents
+
+    @property
+    def children(self) -> Iterator[Union[str, "LxmlNode"]]:
+        return iter(self.contents)
+
+    def _strings(self) -> Iterator[str]:
+        return _text_pieces(self.element, _preserves_whitespace(self.element))
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        strings = self._strings()
+        if strip:
+            strings = (text for text in (string.strip() for string in strings) if text)
+        return separator.join(strings)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    @property
+    def string(self) -> Optional[str]:
+        """The only text inside the element, descending through single children, like Tag.string."""
+        element = self.element
+        while True:
+            if len(element) == 0:
+                return element.text and _normalized(element.text, _preserves_whitespace(element))
+            child = element[0]
+            if len(element) > 1 or element.text or child.tail:
+                return None
+            if not isinstance(child.tag, str):
+                return child.text
+            element = child
+
+    def select(self, selector: str) -> List["LxmlNode"]:
+        wrap = self.document.wrap
+        return [wrap(element) for element in _compiled_selector(selector, self._axis, False)(self.element)]
+
+    def select_one(self, selector: str) -> Optional["LxmlNode"]:
+        found = _compiled_selector(selector, self._axis, True)(self.element)
+        return self.document.wrap(found[0]) if found else None
+
+    def _descendants(self, name: Optional[str]) -> Iterator:
+        return self.element.iterdescendants(name) if name else self.element.iterdescendants()
+
+    def find_all(
+        self,
+        name: Optional[str] = None,
+        attrs: Optional[Dict[str, Any]] = None,
+        string: Any = None,
+        limit: Optional[int] = None,
+        **kwargs
+    ) -> List["LxmlNode"]:
+        """Descendants with the tag name, attribute values and string given, as Tag.find_all() matches them."""
+        conditions = {**(attrs or {}), **{key.rstrip("_"): value for key, value in kwargs.items()}}
+        found = []
+        for element in self._descendants(name):
+            if not isinstance(element.tag, str):
+                continue
+            node = self.document.wrap(element)
+            if string is not None and not _value_matches(node.string, string):
+                continue
+            if all(_value_matches(node.get(key), value) for key, value in conditions.items()):
+                found.append(node)
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        attrs: Optional[Dict[str, Any]] = None,
+        string: Any = None,
+        **kwargs
+    ) -> Optional["LxmlNode"]:
+        found = self.find_all(name, attrs, string, limit=1, **kwargs)
+        return found[0] if found else None
+
+    def __str__(self) -> str:
+        return lxml.html.tostring(self.element, encoding="unicode", with_tail=False)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class LxmlDocument(LxmlNode):
+    """A page parsed with lxml.html, standing in for the BeautifulSoup object."""
+    __slots__ = ("_nodes",)
+
+    # The root element is searched too, as BeautifulSoup searches <html>
+    _axis = "descendant-or-self"
+
+    def __init__(self, root):
+        self._nodes: Dict[Any, LxmlNode] = {}
+        super().__init__(root, self)
+
+    def wrap(self, element) -> LxmlNode:
+        """The node of an element of this document."""
+        node = self._nodes.get(element)
+        if node is None:
+            node = self._nodes[element] = LxmlNode(element, self)
+        return node
+
+    @property
+    def name(self) -> str:
+        return "[document]"
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        return {}
+
+    @property
+    def parent(self) -> None:
+        return None
+
+    @property
+    def contents(self) -> List[LxmlNode]:
+        return [self.wrap(self.element)]
+
+    def _strings(self) -> Iterator[str]:
+        if self.element.tag in _SEPARATE_TEXT:
+            return iter(())
+        return _text_pieces(self.element, self.element.tag in _PRESERVE_WHITESPACE)
+
+    @property
+    def string(self) -> Optional[str]:
+        return self.wrap(self.element).string
+
+    def _descendants(self, name: Optional[str]) -> Iterator:
+        return self.element.iter(name) if name else self.element.iter()
+
+
+def parse_html(markup: str, backend: Optional[str] = None, scraper: Optional[str] = None) -> Node:
+    """
+    Parse a page or fragment with the configured backend.
+
+    Args:
+        markup: HTML to parse
+        backend: One of BACKENDS; by default the scraper's entry in
+            Config.HTML_PARSER_OVERRIDES, else Config.HTML_PARSER
+        scraper: Name of the calling scraper, used to look up its backend
+
+    Returns:
+        A BeautifulSoup object, or an LxmlDocument offering the same interface
+    """
+    backend = backend or Config.HTML_PARSER_OVERRIDES.get(scraper) or Config.HTML_PARSER
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+    if backend == "lxml":
+        try:
+            return LxmlDocument(lxml.html.document_fromstring(markup))
+        except (etree.ParserError, ValueError) as e:
+            # Empty documents, or strings carrying an encoding declaration
+            logger.debug(f"lxml could not parse the page, using html.parser: {str(e)}")
+            backend = "bs4-html.parser"
+
+    try:
+        return BeautifulSoup(markup, backend[len("bs4-"):])
+    except FeatureNotFound:
+        logger.debug(f"No {backend} tree builder, using html.parser")
+        return BeautifulSoup(markup, "html.parser")
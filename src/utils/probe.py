@@ -0,0 +1,99 @@
+"""Liveness probing of extracted source and subtitle URLs."""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from src.management import get_logger
+from .cache import TTLCache
+from .client import async_client
+from .config import Config
+
+# Configure logging
+logger = get_logger("SourceProbe")
+
+# Fields of an extraction result whose items carry a URL to probe
+PROBED_FIELDS = ("sources", "subtitles", "tracks")
+
+MISSING_URL = {"alive": False, "status": None, "ttfbMs": None, "error": "missing url"}
+
+
+class SourceProber:
+    """
+    Check that extracted URLs answer before they are handed out.
+
+    Each URL is fetched with the headers the extractor returned (the embed
+    hosts check the Referer) and only its first bytes are read. Results are
+    cached per URL and Referer for a short time, so repeated requests for the
+    same episode do not probe the CDN again.
+    """
+
+    def __init__(self, concurrency: int = None, timeout: float = None, cache_ttl: float = None):
+        self.concurrency = concurrency or Config.SOURCE_PROBE_CONCURRENCY
+        self.timeout = timeout or Config.SOURCE_PROBE_TIMEOUT
+        self.cache = TTLCache(
+            "source_probes",
+            ttl=cache_ttl or Config.SOURCE_PROBE_CACHE_TTL,
+            max_entries=Config.SOURCE_PROBE_CACHE_MAX_ENTRIES
+        )
+
+    async def probe(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Probe one URL.
+
+        Returns:
+            Dictionary with alive, status, ttfbMs, error and whether the result was cached
+        """
+        headers = headers or {}
+
+        async def load() -> Dict[str, Any]:
+            try:
+                status, ttfb = await async_client.first_byte(url, timeout=self.timeout, headers=headers)
+                return {"alive": status < 400, "status": status, "ttfbMs": round(ttfb * 1000), "error": None}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Probe of {url} failed: {e!r}")
+                return {"alive": False, "status": None, "ttfbMs": None, "error": str(e) or type(e).__name__}
+
+        result, info = await self.cache.get_or_load((url, headers.get("Referer")), load)
+        return {**result, "cached": info.hit}
+
+    async def annotate(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Probe the sources and subtitles of extraction results.
+
+        Every URL of every entry is probed at once, at most `concurrency` at a time,
+        each with the headers of its own entry.
+
+        Args:
+            entries: Results carrying "sources", "headers" and optionally "subtitles" or "tracks"
+
+        Returns:
+            Copies of the entries whose items carry a "probe" result, plus the
+            number of live sources in "liveSources"
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(item: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+            if not item.get("url"):
+                return {**item, "probe": {**MISSING_URL, "cached": False}}
+            async with semaphore:
+                return {**item, "probe": await self.probe(item["url"], headers)}
+
+        async def annotate_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+            headers = entry.get("headers") or {}
+            fields = [field for field in PROBED_FIELDS if entry.get(field)]
+            checked = await asyncio.gather(*(
+                asyncio.gather(*(check(item, headers) for item in entry[field])) for field in fields
+            ))
+            annotated = {**entry, **{field: list(items) for field, items in zip(fields, checked)}}
+            annotated["liveSources"] = sum(1 for source in annotated.get("sources") or [] if source["probe"]["alive"])
+            return annotated
+
+        return list(await asyncio.gather(*(annotate_entry(entry) for entry in entries)))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+# Create singleton source prober instance
+source_prober = SourceProber()
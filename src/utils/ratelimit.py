@@ -0,0 +1,177 @@
+"""Per-host token-bucket rate limiting shared by every upstream request."""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.management import get_logger
+from .config import Config
+
+# Configure logging
+logger = get_logger("RateLimiter")
+
+# Recent waits kept per host for the percentiles in stats()
+WAIT_SAMPLES = 1000
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second with bursts of up to `burst`.
+
+    Tokens are reserved rather than polled: a caller takes a token immediately,
+    letting the balance go negative, and is told how long to wait for it. Callers
+    are therefore served in arrival order and the same bucket can be shared by
+    threads and event loops, each waiting in its own way.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self):
+        """Give back a token reserved by a caller that gave up waiting."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for at least `seconds`, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+class HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.pauses = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def record(self, wait: float):
+        self.requests += 1
+        self.waits.append(wait)
+        if wait > 0:
+            self.throttled += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "totalWaitSeconds": round(self.total_wait, 3),
+            "maxWaitSeconds": round(self.max_wait, 3),
+            "p50WaitSeconds": round(waits[len(waits) // 2], 3) if waits else 0.0,
+            "p95WaitSeconds": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3) if waits else 0.0,
+            "pauses": self.pauses
+        }
+
+
+class RateLimiter:
+    """
+    One token bucket per upstream host, shared by the sync and async transports.
+
+    Limits come from Config.RATE_LIMIT_HOSTS, matched on the end of the host name,
+    and default to Config.RATE_LIMIT / Config.RATE_LIMIT_BURST. Async callers wait
+    with asyncio.sleep so the event loop keeps running; sync callers sleep in the
+    executor thread they already run on.
+    """
+
+    def __init__(self, enabled: bool = None, host_limits: Dict[str, Tuple[float, float]] = None):
+        self.enabled = Config.RATE_LIMIT_ENABLED if enabled is None else enabled
+        self.host_limits = Config.RATE_LIMIT_HOSTS if host_limits is None else host_limits
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    def limits_for(self, host: str) -> Tuple[float, float]:
+        """(requests per second, burst) for a host."""
+        for suffix, limits in self.host_limits.items():
+            if host == suffix or host.endswith(f".{suffix}"):
+                return limits
+        return Config.RATE_LIMIT, Config.RATE_LIMIT_BURST
+
+    def _bucket(self, url: str) -> Tuple[Optional[TokenBucket], Optional[HostStats]]:
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.limits_for(host)
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+                self._stats[host] = HostStats()
+            return bucket, self._stats[host]
+
+    async def acquire(self, url: str) -> float:
+        """Wait for the host of url to allow one more request; returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        bucket, stats = self._bucket(url)
+        wait = bucket.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                bucket.refund()
+                raise
+        stats.record(wait)
+        return wait
+
+    def acquire_sync(self, url: str) -> float:
+        """Blocking variant of acquire() for code running in executor threads."""
+        if not self.enabled:
+            return 0.0
+        bucket, stats = self._bucket(url)
+        wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        stats.record(wait)
+        return wait
+
+    def throttled_by_upstream(self, url: str, retry_after: Optional[str]):
+        """Slow the host down after it answered 429, honouring Retry-After when given in seconds."""
+        if not self.enabled:
+            return
+        try:
+            seconds = float(retry_after) if retry_after else Config.RATE_LIMIT_429_PAUSE
+        except ValueError:
+            seconds = Config.RATE_LIMIT_429_PAUSE
+        bucket, stats = self._bucket(url)
+        bucket.pause(seconds)
+        stats.pauses += 1
+        logger.warning(f"{urlparse(url).hostname} answered 429, pausing it for {seconds:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the limits and wait times per host."""
+        with self._lock:
+            hosts = {
+                host: {
+                    "rate": self._buckets[host].rate,
+                    "burst": self._buckets[host].burst,
+                    **stats.to_dict()
+                }
+                for host, stats in self._stats.items()
+            }
+        return {"enabled": self.enabled, "hosts": hosts}
+
+
+# Create singleton rate limiter instance
+rate_limiter = RateLimiter()
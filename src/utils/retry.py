@@ -0,0 +1,264 @@
+"""Retries of transient upstream failures with jittered backoff, a retry budget and deadlines."""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional
+
+import aiohttp
+import requests
+
+from src.management import get_logger
+from .config import Config
+
+# Configure logging
+logger = get_logger("Retry")
+
+# Status codes worth another attempt: the upstream or something in front of it hiccuped
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Only requests that can be repeated without side effects are retried
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+# Monotonic time by which the current operation must finish, if the caller set one
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """
+    Bound every upstream request made inside the block, retries included.
+
+    Nested scopes keep the earlier deadline. The deadline follows tasks created
+    inside the block and calls handed to the scraper executor.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def current_deadline() -> Optional[float]:
+    """Monotonic time by which the current operation must finish, or None without one."""
+    return _deadline.get()
+
+
+def extend_deadline(deadline: Optional[float]):
+    """
+    Push the current deadline back to `deadline`, or lift it with None.
+
+    An earlier deadline is ignored. Run inside the context of an operation shared
+    by several callers so it lasts as long as the most patient of them.
+    """
+    current = _deadline.get()
+    if current is not None and (deadline is None or deadline > current):
+        _deadline.set(deadline)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised instead of starting a request once the caller's deadline has passed."""
+
+
+class RetryBudget:
+    """
+    Cap retries to a fraction of recent traffic so retries cannot amplify an outage.
+
+    Within a sliding window, retries are allowed while they stay below
+    `ratio` times the requests made plus `min_per_second` times the window.
+    """
+
+    def __init__(self, ratio: float = None, min_per_second: float = None, window: float = None):
+        self.ratio = Config.RETRY_BUDGET_RATIO if ratio is None else ratio
+        self.min_per_second = Config.RETRY_BUDGET_MIN_PER_SECOND if min_per_second is None else min_per_second
+        self.window = window or Config.RETRY_BUDGET_WINDOW
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        for events in (self._requests, self._retries):
+            while events and events[0] < now - self.window:
+                events.popleft()
+
+    def record_request(self):
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget if any is left."""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            allowed = self.min_per_second * self.window + self.ratio * len(self._requests)
+            if len(self._retries) + 1 > allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+    def available(self) -> float:
+        with self._lock:
+            self._prune(time.monotonic())
+            return max(0.0, self.min_per_second * self.window + self.ratio * len(self._requests) - len(self._retries))
+
+
+class Retrier:
+    """
+    Repeat idempotent requests that failed transiently.
+
+    Delays grow exponentially from Config.RETRY_BASE_DELAY up to Config.RETRY_DELAY
+    with full jitter, and a Retry-After header is honoured when it asks for longer.
+    A retry is only made if the shared RetryBudget allows it and it can still
+    finish before the caller's deadline (see deadline_scope); otherwise the last
+    response or error is returned to the caller as is.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = None,
+        base_delay: float = None,
+        max_delay: float = None,
+        budget: RetryBudget = None,
+        seed: Optional[int] = None
+    ):
+        self.max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = Config.RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = Config.RETRY_DELAY if max_delay is None else max_delay
+        self.budget = budget or RetryBudget()
+        self.random = random.Random(seed)
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "recovered": 0,
+            "exhausted": 0,
+            "budgetDenied": 0,
+            "deadlineDenied": 0
+        }
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number `attempt` (0 based)."""
+        delay = self.random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.max_delay))
+            except ValueError:
+                pass
+        return delay
+
+    def attempt_timeout(self, timeout: Any) -> Any:
+        """Shrink a per-attempt timeout to the time left before the deadline."""
+        remaining = remaining_time()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("deadline exceeded before the request was sent")
+        if isinstance(timeout, (int, float)):
+            return min(timeout, remaining)
+        return timeout
+
+    def _retry_delay(self, method: str, url: str, attempt: int, response: Any, error: Optional[BaseException]) -> Optional[float]:
+        """Delay before the next attempt, or None if the outcome should be returned."""
+        if error is not None:
+            if isinstance(error, DeadlineExceeded) or not isinstance(error, TRANSIENT_ERRORS):
+                return None
+            retry_after, reason = None, type(error).__name__
+        else:
+            if response.status_code not in RETRYABLE_STATUSES:
+                if attempt:
+                    self._stats["recovered"] += 1
+                return None
+            retry_after, reason = response.headers.get("Retry-After"), f"HTTP {response.status_code}"
+
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return None
+        if attempt >= self.max_retries:
+            self._stats["exhausted"] += 1
+            return None
+
+        delay = self.backoff(attempt, retry_after)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            self._stats["deadlineDenied"] += 1
+            return None
+        if not self.budget.try_spend():
+            self._stats["budgetDenied"] += 1
+            logger.warning(f"Retry budget exhausted, not retrying {url} after {reason}")
+            return None
+
+        self._stats["retries"] += 1
+        logger.info(f"Retrying {url} in {delay:.2f}s after {reason} (retry {attempt + 1}/{self.max_retries})")
+        return delay
+
+    async def call(self, method: str, url: str, send: Callable[[], Awaitable[Any]], enabled: bool = True) -> Any:
+        """Run an async request function, retrying transient failures."""
+        self._stats["requests"] += 1
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await send()
+            except Exception as e:
+                error = e
+            delay = self._retry_delay(method, url, attempt, response, error) if enabled else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def call_sync(self, method: str, url: str, send: Callable[[], Any], enabled: bool = True) -> Any:
+        """Blocking variant of call() for the requests based transport."""
+        self._stats["requests"] += 1
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = send()
+            except Exception as e:
+                error = e
+            delay = self._retry_delay(method, url, attempt, response, error) if enabled else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get retry counters and the retries currently left in the budget."""
+        return {
+            **self._stats,
+            "budgetAvailable": round(self.budget.available(), 1)
+        }
+
+
+# Create singleton retrier instance
+retrier = Retrier()
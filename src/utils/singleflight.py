@@ -0,0 +1,104 @@
+"""Coalescing of identical concurrent operations into a single in-flight call."""
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from src.management import get_logger
+from .retry import current_deadline, extend_deadline
+
+# Configure logging
+logger = get_logger("SingleFlight")
+
+
+def normalize_key(*args: Any) -> tuple:
+    """Build a coalescing key, ignoring surrounding whitespace in string arguments."""
+    return tuple(arg.strip() if isinstance(arg, str) else arg for arg in args)
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers asking for the same key.
+
+    The first caller for a key starts the operation; callers arriving while it is
+    still running await the same task and receive its result or exception. Nothing
+    is kept once the call finishes, so a later call starts a fresh operation.
+
+    A caller giving up leaves the call running for the others, but once the last
+    caller has given up the call is cancelled, so abandoned work stops sending
+    upstream requests.
+
+    The call runs under the deadline of the first caller (see retry.deadline_scope),
+    pushed back whenever a caller with a later deadline, or none, joins it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._stats = {
+            "calls": 0,
+            "coalesced": 0,
+            "maxWaiters": 0,
+            "abandoned": 0
+        }
+        self._waiters: Dict[Hashable, int] = {}
+        self._contexts: Dict[Hashable, contextvars.Context] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn for key, or join the call already running for it.
+
+        Args:
+            key: Normalized arguments identifying the operation
+            fn: Coroutine function starting the operation
+
+        Returns:
+            Whatever fn returns; exceptions raised by fn reach every caller
+        """
+        self._stats["calls"] += 1
+        task = self._calls.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._stats["coalesced"] += 1
+            logger.debug(f"{self.name}: joining in-flight call for {key!r}")
+            # Tasks the call has already started keep the deadline they were started with
+            self._contexts[key].run(extend_deadline, current_deadline())
+        else:
+            context = contextvars.copy_context()
+            task = asyncio.get_running_loop().create_task(fn(), context=context)
+            self._calls[key] = task
+            self._contexts[key] = context
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        self._waiters[key] += 1
+        self._stats["maxWaiters"] = max(self._stats["maxWaiters"], self._waiters[key])
+        try:
+            # Shield so one caller giving up does not cancel the call for the others
+            return await asyncio.shield(task)
+        finally:
+            if self._calls.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    self._stats["abandoned"] += 1
+                    logger.debug(f"{self.name}: every caller gave up on {key!r}, cancelling it")
+                    # Forget it at once so a call arriving while it unwinds starts afresh
+                    # instead of receiving its cancellation
+                    del self._calls[key]
+                    del self._waiters[key]
+                    del self._contexts[key]
+                    task.cancel()
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+            del self._contexts[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get call counters and the number of operations currently in flight."""
+        return {
+            **self._stats,
+            "inFlight": len(self._calls)
+        }
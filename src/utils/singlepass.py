@@ -0,0 +1,309 @@
+"""Single-pass extraction over a parsed HTML tree."""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bs4 import Tag
+
+# One compound selector: optional tag name, then any #id, .class and [attribute] parts
+_COMPOUND = re.compile(r"^([a-zA-Z][\w-]*|\*)?((?:[#.][\w-]+|\[[\w-]+\])*)$")
+_COMPOUND_PART = re.compile(r"([#.])([\w-]+)|\[([\w-]+)\]")
+
+
+class UnsupportedSelector(ValueError):
+    """Raised for selectors the single-pass matcher cannot evaluate."""
+
+
+class _Compound:
+    """Tag name, id, classes and attribute names one element must all have."""
+    __slots__ = ("name", "id", "classes", "attributes", "key")
+
+    def __init__(self, name: Optional[str], id: Optional[str], classes: frozenset, attributes: Tuple[str, ...]):
+        self.name = name
+        self.id = id
+        self.classes = classes
+        self.attributes = attributes
+        # One token a matching element must carry, used to skip selectors that cannot match
+        if classes:
+            self.key = "." + min(classes)
+        elif id:
+            self.key = "#" + id
+        else:
+            self.key = name or "*"
+
+    def matches(self, tag: Tag) -> bool:
+        if self.name and tag.name != self.name:
+            return False
+        attrs = tag.attrs
+        if self.id and attrs.get("id") != self.id:
+            return False
+        if self.classes and not self.classes.issubset(attrs.get("class") or ()):
+            return False
+        return all(attribute in attrs for attribute in self.attributes)
+
+
+class SimpleSelector:
+    """
+    A CSS selector made of compounds joined by descendant combinators,
+    such as ".fd-infor .tick-item.tick-type" or ".film-detail a[href]".
+
+    The element itself is matched against the last compound and its ancestors
+    against the others, so ancestors outside the searched subtree count, as
+    they do for BeautifulSoup's select().
+    """
+    __slots__ = ("text", "compounds", "key", "ancestor_keys")
+
+    def __init__(self, text: str, compounds: Sequence[_Compound]):
+        self.text = text
+        self.compounds = tuple(compounds)
+        self.key = self.compounds[-1].key
+        self.ancestor_keys = tuple(compound.key for compound in self.compounds[:-1])
+
+    def matches(self, tag: Tag, open_keys: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Whether the element matches; open_keys, the dispatch keys of the element's
+        ancestors with their counts, lets a missing ancestor fail without walking up.
+        """
+        compounds = self.compounds
+        if not compounds[-1].matches(tag):
+            return False
+        if open_keys is not None and not all(open_keys.get(key) for key in self.ancestor_keys):
+            return False
+        index = len(compounds) - 2
+        parent = tag.parent
+        while index >= 0 and parent is not None:
+            if parent.name != "[document]" and compounds[index].matches(parent):
+                index -= 1
+            parent = parent.parent
+        return index < 0
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str) -> Tuple[SimpleSelector, ...]:
+    """
+    Compile a selector group such as ".tick-sub, .tick .sub".
+
+    Raises:
+        UnsupportedSelector: For child/sibling combinators, attribute values or pseudo-classes
+    """
+    compiled = []
+    for text in selector.split(","):
+        compounds = []
+        for part in text.split():
+            match = _COMPOUND.match(part)
+            if not match or (not match.group(1) and not match.group(2)):
+                raise UnsupportedSelector(f"Unsupported selector '{selector}'")
+            name = match.group(1) if match.group(1) != "*" else None
+            id = None
+            classes = []
+            attributes = []
+            for kind, value, attribute in _COMPOUND_PART.findall(match.group(2)):
+                if attribute:
+                    attributes.append(attribute)
+                elif kind == "#":
+                    id = value
+                else:
+                    classes.append(value)
+            compounds.append(_Compound(name and name.lower(), id, frozenset(classes), tuple(attributes)))
+        if not compounds:
+            raise UnsupportedSelector(f"Unsupported selector '{selector}'")
+        compiled.append(SimpleSelector(text.strip(), compounds))
+    return tuple(compiled)
+
+
+def _tag_keys(tag: Tag) -> List[str]:
+    """Dispatch keys of an element: its classes, id and tag name."""
+    attrs = tag.attrs
+    keys = ["." + name for name in attrs.get("class") or ()]
+    if "id" in attrs:
+        keys.append("#" + attrs["id"])
+    keys.append(tag.name)
+    keys.append("*")
+    return keys
+
+
+def _dispatch(selectors: Dict[str, str]) -> Dict[str, List[Tuple[str, SimpleSelector]]]:
+    """Index the compiled selectors of named selector groups by their dispatch key."""
+    table: Dict[str, List[Tuple[str, SimpleSelector]]] = {}
+    for name, selector in selectors.items():
+        for compiled in compile_selector(selector):
+            table.setdefault(compiled.key, []).append((name, compiled))
+    return table
+
+
+class ItemLookup:
+    """
+    Named fields of one item, filled in while the walk passes through the item.
+
+    Offers the first/all interface of src.utils.extractors.SelectLookup, so the
+    same item parser works on either.
+    """
+    __slots__ = ("element", "_dispatch", "_many", "_first", "_all")
+
+    def __init__(self, element: Tag, dispatch: Dict[str, List[Tuple[str, SimpleSelector]]], many: frozenset):
+        self.element = element
+        self._dispatch = dispatch
+        self._many = many
+        self._first: Dict[str, Tag] = {}
+        self._all: Dict[str, List[Tag]] = {field: [] for field in many}
+
+    def _feed(self, tag: Tag, keys: List[str], open_keys: Dict[str, int]):
+        for key in keys:
+            for field, selector in self._dispatch.get(key, ()):
+                if field in self._many:
+                    found = self._all[field]
+                    if (not found or found[-1] is not tag) and selector.matches(tag, open_keys):
+                        found.append(tag)
+                elif field not in self._first and selector.matches(tag, open_keys):
+                    self._first[field] = tag
+
+    def first(self, field: str) -> Optional[Tag]:
+        """First element matching the field's selector, in document order."""
+        if field in self._many:
+            found = self._all[field]
+            return found[0] if found else None
+        return self._first.get(field)
+
+    def all(self, field: str) -> List[Tag]:
+        """Every element matching the field's selector; only for fields declared as many."""
+        return self._all[field]
+
+
+class Container:
+    """An element matching a section selector, with the items found inside it."""
+    __slots__ = ("element", "items")
+
+    def __init__(self, element: Tag):
+        self.element = element
+        self.items: List[ItemLookup] = []
+
+
+class ContainerSection:
+    """
+    Items inside the containers matching any of a list of selectors,
+    like the slides of a carousel or the cards of a list.
+
+    Once a container of a selector has items, later containers of that selector
+    are ignored, since callers take the first one.
+    """
+
+    def __init__(
+        self,
+        selectors: Iterable[str],
+        item_selector: str,
+        fields: Dict[str, str],
+        many: Iterable[str] = ()
+    ):
+        self.selectors = tuple(selectors)
+        self._container_dispatch = _dispatch({selector: selector for selector in self.selectors})
+        self._item_selectors = compile_selector(item_selector)
+        self._field_dispatch = _dispatch(fields)
+        self._many = frozenset(many)
+        self.reset()
+
+    def reset(self):
+        self._containers: Dict[str, List[Container]] = {selector: [] for selector in self.selectors}
+        self._open_containers: List[Container] = []
+        self._open_items: List[ItemLookup] = []
+
+    def enter(self, tag: Tag, keys: List[str], open_keys: Dict[str, int]) -> list:
+        closers = []
+        for item in self._open_items:
+            item._feed(tag, keys, open_keys)
+
+        if self._open_containers and any(
+            selector.key in keys and selector.matches(tag, open_keys) for selector in self._item_selectors
+        ):
+            item = ItemLookup(tag, self._field_dispatch, self._many)
+            for container in self._open_containers:
+                container.items.append(item)
+            self._open_items.append(item)
+            closers.append(self._open_items.pop)
+
+        container = None
+        for key in keys:
+            for selector, compiled in self._container_dispatch.get(key, ()):
+                found = self._containers[selector]
+                if any(previous.items for previous in found) or (found and found[-1].element is tag):
+                    continue
+                if compiled.matches(tag, open_keys):
+                    if container is None:
+                        container = Container(tag)
+                        self._open_containers.append(container)
+                        closers.append(self._open_containers.pop)
+                    found.append(container)
+        return closers
+
+    def first_container(self, selector: str) -> Optional[Container]:
+        """The first container matching the selector, with or without items."""
+        found = self._containers[selector]
+        return found[0] if found else None
+
+    def first_with_items(self, selector: str) -> Optional[Container]:
+        """The first container matching the selector that has any items."""
+        return next((container for container in self._containers[selector] if container.items), None)
+
+
+class MatchSection:
+    """Every element matching each of a list of selectors."""
+
+    def __init__(self, selectors: Iterable[str]):
+        self.selectors = tuple(selectors)
+        self._dispatch = _dispatch({selector: selector for selector in self.selectors})
+        self.reset()
+
+    def reset(self):
+        self._matches: Dict[str, List[Tag]] = {selector: [] for selector in self.selectors}
+
+    def enter(self, tag: Tag, keys: List[str], open_keys: Dict[str, int]) -> list:
+        for key in keys:
+            for selector, compiled in self._dispatch.get(key, ()):
+                found = self._matches[selector]
+                if (not found or found[-1] is not tag) and compiled.matches(tag, open_keys):
+                    found.append(tag)
+        return []
+
+    def matches(self, selector: str) -> List[Tag]:
+        return self._matches[selector]
+
+
+class SinglePassExtractor:
+    """
+    Walks a tree once and dispatches every element to a set of sections.
+
+    Each section sees every element in document order, together with the
+    dispatch keys of the element's open ancestors; what it opens at an element
+    (a container, an item) is closed again once the walk leaves that element's
+    subtree.
+
+    Works on BeautifulSoup trees and src.utils.parsing.LxmlNode trees alike:
+    text and comment nodes are strings on both.
+    """
+
+    def __init__(self, sections: Sequence):
+        self.sections = tuple(sections)
+
+    def walk(self, root: Tag):
+        for section in self.sections:
+            section.reset()
+
+        open_keys: Dict[str, int] = {}
+        stack = [(iter(root.contents), (), ())]
+        while stack:
+            node = next(stack[-1][0], None)
+            if node is None:
+                _, keys, closers = stack.pop()
+                for close in reversed(closers):
+                    close()
+                for key in keys:
+                    open_keys[key] -= 1
+                continue
+            if isinstance(node, str):
+                continue
+            keys = _tag_keys(node)
+            closers = []
+            for section in self.sections:
+                closers.extend(section.enter(node, keys, open_keys))
+            for key in keys:
+                open_keys[key] = open_keys.get(key, 0) + 1
+            stack.append((iter(node.contents), keys, closers))
@@ -0,0 +1,186 @@
+"""Test the aiohttp transport and extractors against a local server."""
+import asyncio
+import gc
+import sys
+import os
+import time
+import warnings
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from src.management import get_logger
+from src.utils.client import AsyncClient
+import src.scrapers.extractor.streamtape as streamtape
+
+# Configure logging
+logger = get_logger("TestAsyncExtractors")
+
+STREAMTAPE_PAGE = """<html><body>
+<div id="robotlink"></div>
+<script>document.getElementById('robotlink').innerHTML = ('//streamtape.com/get_video?id=abc&expires=1' + ('xcd&token=xyz').substring(3));</script>
+</body></html>"""
+
+
+async def slow_handler(request):
+    await asyncio.sleep(float(request.query.get("delay", "0.3")))
+    return web.json_response({"sources": [], "tracks": []})
+
+
+async def streamtape_handler(request):
+    return web.Response(text=STREAMTAPE_PAGE, content_type="text/html")
+
+
+async def start_server():
+    app = web.Application()
+    app.router.add_get("/slow", slow_handler)
+    app.router.add_get("/e/{video_id}", streamtape_handler)
+    runner = web.AppRunner(app, shutdown_timeout=0.1)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_requests_run_concurrently():
+    """Several slow requests should overlap instead of running one after another."""
+    async def run():
+        runner, base_url = await start_server()
+        client = AsyncClient()
+        try:
+            started_at = time.perf_counter()
+            responses = await asyncio.gather(*(client.get(f"{base_url}/slow?delay=0.3") for _ in range(5)))
+            return responses, time.perf_counter() - started_at
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    responses, elapsed = asyncio.run(run())
+    logger.info(f"5 concurrent requests took {elapsed:.2f}s")
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[0].json() == {"sources": [], "tracks": []}
+    assert elapsed < 1.0
+
+
+def test_per_request_timeout():
+    """A request slower than its timeout should raise asyncio.TimeoutError."""
+    async def run():
+        runner, base_url = await start_server()
+        client = AsyncClient()
+        started_at = time.perf_counter()
+        try:
+            await client.get(f"{base_url}/slow?delay=2", timeout=0.2, retry=False)
+        except asyncio.TimeoutError:
+            return time.perf_counter() - started_at
+        finally:
+            await client.close()
+            await runner.cleanup()
+        raise AssertionError("Expected a timeout")
+
+    elapsed = asyncio.run(run())
+    assert elapsed < 1.0
+
+
+def test_cancellation():
+    """Cancelling the awaiting task should abort the request right away."""
+    async def run():
+        runner, base_url = await start_server()
+        client = AsyncClient()
+        try:
+            task = asyncio.create_task(client.get(f"{base_url}/slow?delay=5"))
+            await asyncio.sleep(0.1)
+            started_at = time.perf_counter()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return time.perf_counter() - started_at
+            raise AssertionError("Expected cancellation")
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    elapsed = asyncio.run(run())
+    assert elapsed < 0.5
+
+
+def test_streamtape_extract():
+    """StreamTape extraction should run on the event loop and find the robotlink source."""
+    async def run():
+        runner, base_url = await start_server()
+        client = AsyncClient()
+        original_client = streamtape.async_client
+        streamtape.async_client = client
+        try:
+            return await streamtape.StreamTape().extract(f"{base_url}/e/abc")
+        finally:
+            streamtape.async_client = original_client
+            await client.close()
+            await runner.cleanup()
+
+    sources = asyncio.run(run())
+    logger.info(f"StreamTape sources: {sources}")
+    assert len(sources) == 1
+    assert sources[0]["url"].startswith("https:")
+    assert sources[0]["isM3U8"] is False
+
+
+def test_session_closed_with_its_loop():
+    """A session left open should be closed when its loop shuts down, not leaked."""
+    client = AsyncClient()
+
+    async def run():
+        runner, base_url = await start_server()
+        try:
+            response = await client.get(f"{base_url}/slow?delay=0")
+            assert response.status_code == 200
+            return client._get_session()
+        finally:
+            await runner.cleanup()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        first = asyncio.run(run())
+        second = asyncio.run(run())
+        gc.collect()
+
+    assert first is not second
+    assert first.closed and second.closed
+    assert not client._sessions and not client._closers
+    leaks = [str(warning.message) for warning in caught if issubclass(warning.category, ResourceWarning)]
+    assert not leaks, leaks
+
+
+def main():
+    """Run async transport and extractor tests."""
+    logger.info("Starting async extractor tests...")
+
+    tests = [
+        ("Requests Run Concurrently", test_requests_run_concurrently),
+        ("Per-request Timeout", test_per_request_timeout),
+        ("Cancellation", test_cancellation),
+        ("StreamTape Extract", test_streamtape_extract),
+        ("Session Closed With Its Loop", test_session_closed_with_its_loop),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Async Extractor Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Test racing all servers for the first playable episode source."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.models import ScrapedEpisodeServers, EpisodeServer
+import src.scrapers.animeEpisodeSrcs as episode_srcs
+from src.scrapers.episodeContext import EpisodeContext
+
+# Configure logging
+logger = get_logger("TestBestSource")
+
+EPISODE_ID = "jujutsu-kaisen-534?ep=10789"
+
+SERVERS = [
+    EpisodeServer(serverName="vidstreaming", serverId=4, hianimeid="hd-1"),
+    EpisodeServer(serverName="vidcloud", serverId=1, hianimeid="hd-2"),
+    EpisodeServer(serverName="streamtape", serverId=3, hianimeid="hd-4"),
+]
+
+
+async def fake_get_servers(self) -> ScrapedEpisodeServers:
+    return ScrapedEpisodeServers(sub=SERVERS, episodeId=self.episode_id, episodeNo=1)
+
+
+def race(behaviour, **kwargs):
+    """Run get_best_anime_episode_source with extraction faked by behaviour(server)."""
+    started = []
+    cancelled = []
+
+    async def fake_get_sources(episode_id, server, category, *args, **kwargs):
+        started.append(server)
+        try:
+            return await behaviour(server)
+        except asyncio.CancelledError:
+            cancelled.append(server)
+            raise
+
+    originals = (EpisodeContext.get_servers, episode_srcs.getAnimeEpisodeSources)
+    EpisodeContext.get_servers = fake_get_servers
+    episode_srcs.getAnimeEpisodeSources = fake_get_sources
+    try:
+        start = time.perf_counter()
+        result = asyncio.run(episode_srcs.get_best_anime_episode_source(EPISODE_ID, "sub", **kwargs))
+        elapsed = time.perf_counter() - start
+    finally:
+        EpisodeContext.get_servers, episode_srcs.getAnimeEpisodeSources = originals
+    logger.info(f"Race took {elapsed:.2f}s: {result}")
+    return result, elapsed, started, cancelled
+
+
+def sources(url: str):
+    return {"headers": {"Referer": "https://example.com/"}, "sources": [{"url": url, "isM3U8": True}]}
+
+
+def test_fastest_server_wins():
+    """The fastest playable server should be returned and the slower ones cancelled."""
+    delays = {"VidStreaming": 2, "VidCloud": 0.05, "StreamTape": 2}
+
+    async def behaviour(server):
+        await asyncio.sleep(delays[server])
+        return sources(f"https://cdn.example.com/{server}/master.m3u8")
+
+    result, elapsed, started, cancelled = race(behaviour)
+    data = result["data"]
+
+    assert result["success"]
+    assert data["serverName"] == "vidcloud"
+    assert data["sources"][0]["url"] == "https://cdn.example.com/VidCloud/master.m3u8"
+    assert sorted(started) == ["StreamTape", "VidCloud", "VidStreaming"]
+    assert sorted(cancelled) == ["StreamTape", "VidStreaming"]
+    assert data["skippedServers"] == ["vidstreaming", "streamtape"]
+    assert elapsed < 1
+
+
+def test_unplayable_and_failed_servers_do_not_win():
+    """Errors and sources without a usable URL should be passed over for a slower valid one."""
+    async def behaviour(server):
+        if server == "VidStreaming":
+            raise Exception("Decryption failed due to incorrect padding")
+        if server == "VidCloud":
+            return sources("")
+        await asyncio.sleep(0.1)
+        return sources("https://cdn.example.com/tape.mp4")
+
+    result, _, _, cancelled = race(behaviour)
+    data = result["data"]
+    failed = {entry["serverName"]: entry["error"] for entry in data["failedServersList"]}
+
+    assert result["success"]
+    assert data["serverName"] == "streamtape"
+    assert cancelled == []
+    assert "Decryption failed" in failed["vidstreaming"]
+    assert failed["vidcloud"] == "No playable sources returned"
+
+
+def test_quality_selects_one_source():
+    """With a quality, only the winner's source closest to it should be returned."""
+    async def behaviour(server):
+        if server != "VidCloud":
+            await asyncio.sleep(2)
+        return {"headers": {}, "sources": [
+            {"url": "https://cdn.example.com/master.m3u8", "quality": "auto"},
+            {"url": "https://cdn.example.com/1080p/index.m3u8", "quality": "1080p"},
+            {"url": "https://cdn.example.com/720p/index.m3u8", "quality": "720p"},
+        ]}
+
+    result, _, _, _ = race(behaviour, quality="720p")
+    assert result["success"]
+    assert [source["quality"] for source in result["data"]["sources"]] == ["720p"]
+
+    result, _, started, _ = race(behaviour, quality="hd")
+    assert not result["success"] and result["status_code"] == 400
+    assert started == []
+
+
+def test_losers_extraction_is_cancelled():
+    """The losing servers' extraction, shared through the single flight, should stop once the race is won."""
+    episode_id = "frieren-18542?ep=107257"
+    delays = {"VidStreaming": 2, "VidCloud": 0.05, "StreamTape": 2}
+    cancelled = []
+
+    async def fake_fetch(episode_id, server, category, context):
+        try:
+            await asyncio.sleep(delays[server])
+        except asyncio.CancelledError:
+            cancelled.append(server)
+            raise
+        return {**sources(f"https://cdn.example.com/{server}/master.m3u8"), "anilistID": None, "malID": None}
+
+    async def run():
+        result = await episode_srcs.get_best_anime_episode_source(episode_id, "sub")
+        # Let the cancelled extractions unwind; checked before asyncio.run cancels leftover tasks
+        await asyncio.sleep(0.05)
+        return result, list(cancelled), episode_srcs.episode_sources_flight.stats()["inFlight"]
+
+    originals = (EpisodeContext.get_servers, episode_srcs._fetchAnimeEpisodeSources)
+    EpisodeContext.get_servers = fake_get_servers
+    episode_srcs._fetchAnimeEpisodeSources = fake_fetch
+    try:
+        result, cancelled_in_race, in_flight = asyncio.run(run())
+    finally:
+        EpisodeContext.get_servers, episode_srcs._fetchAnimeEpisodeSources = originals
+        episode_srcs.episode_sources_cache.invalidate()
+
+    assert result["data"]["serverName"] == "vidcloud"
+    assert sorted(cancelled_in_race) == ["StreamTape", "VidStreaming"]
+    assert in_flight == 0
+
+
+def test_finished_servers_are_not_skipped():
+    """Servers that finished alongside the winner should be reported, not listed as skipped."""
+    finished = []
+
+    async def fake_fetch_server(context, server, category, deadline):
+        # Every server starts before any of them finishes
+        await asyncio.sleep(2 if server.serverName == "streamtape" else 0)
+        finished.append(server.serverName)
+        # The first server to finish wins; the other finishes in the same loop iteration and fails
+        if len(finished) > 1:
+            return {"serverName": server.serverName, "error": "down"}, True
+        return {"serverName": server.serverName, "sources": [{"url": "https://cdn.example.com/a.m3u8"}]}, False
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        return await episode_srcs._extract_servers(
+            EpisodeContext(EPISODE_ID), SERVERS, "sub", loop.time() + 10, limit=3, enough_servers=1
+        )
+
+    original = episode_srcs._fetch_server_sources
+    episode_srcs._fetch_server_sources = fake_fetch_server
+    try:
+        sources_data, failed, skipped = asyncio.run(run())
+    finally:
+        episode_srcs._fetch_server_sources = original
+
+    assert list(sources_data) == finished[:1]
+    assert [entry["serverName"] for entry in failed] == finished[1:]
+    assert skipped == ["streamtape"]
+
+
+def test_no_playable_source():
+    """A race nobody wins should fail and explain what each server did."""
+    async def behaviour(server):
+        raise Exception(f"{server} is down")
+
+    result, _, _, _ = race(behaviour)
+    assert not result["success"]
+    assert len(result["failedServersList"]) == 3
+
+
+def main():
+    """Run best source tests."""
+    logger.info("Starting best source tests...")
+
+    tests = [
+        ("Fastest Server Wins", test_fastest_server_wins),
+        ("Unplayable And Failed Servers Do Not Win", test_unplayable_and_failed_servers_do_not_win),
+        ("Quality Selects One Source", test_quality_selects_one_source),
+        ("Losers Extraction Is Cancelled", test_losers_extraction_is_cancelled),
+        ("Finished Servers Are Not Skipped", test_finished_servers_are_not_skipped),
+        ("No Playable Source", test_no_playable_source),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Best Source Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Test the TTL cache and its stale-while-revalidate behaviour."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.utils.cache import TTLCache
+
+# Configure logging
+logger = get_logger("TestCache")
+
+
+class SlowLoader:
+    """Loader that counts calls and takes a while to produce a value."""
+
+    def __init__(self, delay: float = 0.2, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"home-v{self.calls}"
+
+
+def test_fresh_hits_do_not_reload():
+    """Values younger than the TTL should come from the cache."""
+    cache = TTLCache("test", ttl=10)
+    loader = SlowLoader()
+
+    async def run():
+        first = await cache.get_or_load("home", loader)
+        second = await cache.get_or_load("home", loader)
+        return first, second
+
+    (value1, info1), (value2, info2) = asyncio.run(run())
+    assert value1 == value2 == "home-v1"
+    assert info1.hit is False and info2.hit is True and info2.stale is False
+    assert loader.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_stale_served_instantly_with_one_refresh():
+    """Stale values should return right away while a single background refresh runs."""
+    cache = TTLCache("test", ttl=0.2, stale_ttl=10)
+    loader = SlowLoader(delay=0.3)
+
+    async def run():
+        await cache.get_or_load("home", loader)
+        await asyncio.sleep(0.25)
+
+        started_at = time.perf_counter()
+        results = await asyncio.gather(*(cache.get_or_load("home", loader) for _ in range(5)))
+        elapsed = time.perf_counter() - started_at
+
+        await asyncio.sleep(0.35)
+        refreshed = await cache.get_or_load("home", loader)
+        return results, elapsed, refreshed
+
+    results, elapsed, refreshed = asyncio.run(run())
+    logger.info(f"5 stale reads took {elapsed * 1000:.1f}ms")
+
+    assert elapsed < 0.05
+    assert all(value == "home-v1" and info.stale for value, info in results)
+    assert all(info.to_dict()["ageSeconds"] >= 0.25 for _, info in results)
+    assert loader.calls == 2
+    assert refreshed[0] == "home-v2" and refreshed[1].stale is False
+
+
+def test_expired_past_stale_window_loads_inline():
+    """Values older than ttl + stale_ttl should be reloaded before returning."""
+    cache = TTLCache("test", ttl=0.05, stale_ttl=0.05)
+    loader = SlowLoader(delay=0.05)
+
+    async def run():
+        await cache.get_or_load("home", loader)
+        await asyncio.sleep(0.15)
+        return await cache.get_or_load("home", loader)
+
+    value, info = asyncio.run(run())
+    assert value == "home-v2"
+    assert info.hit is False
+
+
+def test_failed_refresh_keeps_stale_value():
+    """A failing background refresh should keep serving the stale value."""
+    cache = TTLCache("test", ttl=0.05, stale_ttl=10)
+    loader = SlowLoader(delay=0.01)
+
+    async def run():
+        await cache.get_or_load("home", loader)
+        await asyncio.sleep(0.1)
+        loader.fail = True
+        await cache.get_or_load("home", loader)
+        await asyncio.sleep(0.05)
+        return await cache.get_or_load("home", loader)
+
+    value, info = asyncio.run(run())
+    assert value == "home-v1" and info.stale
+    assert cache.stats()["refreshErrors"] >= 1
+
+
+def test_miss_error_propagates():
+    """Errors loading a missing value should reach the caller."""
+    cache = TTLCache("test", ttl=10)
+    try:
+        asyncio.run(cache.get_or_load("home", SlowLoader(delay=0.01, fail=True)))
+        raise AssertionError("Expected RuntimeError")
+    except RuntimeError as e:
+        assert "upstream down" in str(e)
+    assert cache.get("home") is None
+
+
+def main():
+    """Run cache tests."""
+    logger.info("Starting cache tests...")
+
+    tests = [
+        ("Fresh Hits Do Not Reload", test_fresh_hits_do_not_reload),
+        ("Stale Served Instantly With One Refresh", test_stale_served_instantly_with_one_refresh),
+        ("Expired Past Stale Window Loads Inline", test_expired_past_stale_window_loads_inline),
+        ("Failed Refresh Keeps Stale Value", test_failed_refresh_keeps_stale_value),
+        ("Miss Error Propagates", test_miss_error_propagates),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Cache Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
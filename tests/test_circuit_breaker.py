@@ -0,0 +1,290 @@
+"""Test the per-host circuit breakers of the extractor endpoints."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.models import EpisodeServer
+import src.scrapers.animeEpisodeSrcs as episode_srcs
+from src.scrapers.episodeContext import EpisodeContext
+from src.scrapers.extractor.streamtape import StreamTape
+from src.utils.circuitbreaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, CircuitOpenError
+from src.utils.config import Config
+from src.utils.retry import deadline_scope
+
+# Configure logging
+logger = get_logger("TestCircuitBreaker")
+
+URL = "https://watchsb.com/e/abc123"
+
+
+class FakeProbe:
+    """Probe answering with the queued results in order, then the last one."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.urls = []
+
+    async def __call__(self, url: str) -> bool:
+        self.urls.append(url)
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+def breakers(probe=None, recovery_time=0.1) -> CircuitBreakers:
+    return CircuitBreakers(
+        enabled=True,
+        failure_threshold=3,
+        recovery_time=recovery_time,
+        max_recovery_time=1,
+        probe=probe or FakeProbe(False)
+    )
+
+
+async def call(registry: CircuitBreakers, outcome, url: str = URL, extractor: str = "StreamSB"):
+    """Make one guarded call that raises or returns outcome."""
+    async with registry.guard(url, extractor):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+async def fail(registry: CircuitBreakers, times: int, **kwargs):
+    for _ in range(times):
+        try:
+            await call(registry, ConnectionError("connection refused"), **kwargs)
+        except ConnectionError:
+            pass
+
+
+def test_trips_after_consecutive_failures():
+    """The circuit should open after the threshold and then reject calls at once."""
+    registry = breakers(recovery_time=10)
+
+    async def run():
+        await fail(registry, 2)
+        await call(registry, "ok")
+        await fail(registry, 2)
+        assert registry.breaker(URL, "StreamSB").state == CLOSED
+        await fail(registry, 1)
+        start = time.perf_counter()
+        try:
+            await call(registry, "ok")
+            raise AssertionError("Expected the open circuit to reject the call")
+        except CircuitOpenError as e:
+            return time.perf_counter() - start, e
+
+    elapsed, error = asyncio.run(run())
+    stats = registry.stats()["breakers"]["StreamSB@watchsb.com"]
+
+    assert elapsed < 0.01
+    assert error.retry_in > 9
+    assert stats["state"] == OPEN
+    assert stats["trips"] == 1 and stats["rejected"] == 1
+    assert "connection refused" in stats["lastError"]
+
+
+def test_hosts_and_extractors_are_independent():
+    """An open circuit should only affect its own host and extractor."""
+    registry = breakers(recovery_time=10)
+
+    async def run():
+        await fail(registry, 3)
+        return (
+            await call(registry, "other host", url="https://streamsss.net/e/abc123"),
+            await call(registry, "other extractor", extractor="StreamTape"),
+        )
+
+    assert asyncio.run(run()) == ("other host", "other extractor")
+    assert registry.breaker("https://www.watchsb.com/x", "StreamSB").state == OPEN
+
+
+def test_background_probe_half_opens_the_circuit():
+    """A successful probe should let one trial through, which closes the circuit on success."""
+    probe = FakeProbe(False, True)
+    registry = breakers(probe=probe)
+    breaker = registry.breaker(URL, "StreamSB")
+
+    async def slow_trial():
+        async with registry.guard(URL, "StreamSB"):
+            await asyncio.sleep(0.05)
+            return "trial"
+
+    async def run():
+        await fail(registry, 3)
+        # The first probe fails and doubles the wait, the second one succeeds
+        await asyncio.sleep(0.45)
+        assert breaker.state == HALF_OPEN
+        trial = asyncio.ensure_future(slow_trial())
+        await asyncio.sleep(0)
+        try:
+            await call(registry, "second caller")
+            raise AssertionError("Expected only one trial call")
+        except CircuitOpenError:
+            pass
+        return await trial
+
+    assert asyncio.run(run()) == "trial"
+    assert breaker.state == CLOSED
+    assert probe.urls == ["https://watchsb.com/", "https://watchsb.com/"]
+    assert breaker.stats()["probeFailures"] == 1
+
+
+def test_failed_trial_reopens_the_circuit():
+    """A trial that fails should open the circuit again for longer."""
+    registry = breakers(probe=FakeProbe(True))
+    breaker = registry.breaker(URL, "StreamSB")
+
+    async def run():
+        await fail(registry, 3)
+        await asyncio.sleep(0.15)
+        assert breaker.state == HALF_OPEN
+        await fail(registry, 1)
+
+    asyncio.run(run())
+    assert breaker.state == OPEN
+    assert breaker.cooldown == 0.2
+    assert breaker.stats()["trips"] == 2
+
+
+def test_only_timeouts_count_as_cancelled_failures():
+    """Cancellation at the caller's deadline should count, other cancellations should not."""
+    registry = breakers(recovery_time=10)
+    breaker = registry.breaker(URL, "StreamSB")
+
+    async def slow_call():
+        async with registry.guard(URL, "StreamSB"):
+            await asyncio.sleep(5)
+
+    async def run():
+        task = asyncio.ensure_future(slow_call())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert breaker.failures == 0
+
+        with deadline_scope(0.05):
+            try:
+                await asyncio.wait_for(slow_call(), timeout=0.05)
+            except asyncio.TimeoutError:
+                pass
+
+    asyncio.run(run())
+    assert breaker.failures == 1
+
+
+def test_open_circuit_skips_extraction():
+    """Episode sources from a dead mirror should fail fast without calling the extractor."""
+    registry = breakers(recovery_time=10)
+    calls = 0
+
+    async def dead_extract(self, url):
+        nonlocal calls
+        calls += 1
+        raise Exception("Video not found or network error: Cannot connect to host")
+
+    originals = (StreamTape.extract, episode_srcs.circuit_breakers)
+    StreamTape.extract = dead_extract
+    episode_srcs.circuit_breakers = registry
+
+    async def run():
+        errors = []
+        for _ in range(5):
+            try:
+                await episode_srcs._getAnimeEpisodeSources("https://streamtape.com/e/abc", episode_srcs.Servers.StreamTape)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    try:
+        errors = asyncio.run(run())
+    finally:
+        StreamTape.extract, episode_srcs.circuit_breakers = originals
+
+    assert calls == 3
+    assert len(errors) == 5
+    assert all(isinstance(error, CircuitOpenError) for error in errors[3:])
+
+
+def test_server_timeouts_open_the_circuit():
+    """Timeouts of a hung mirror, through the shared extraction, should open its circuit."""
+    registry = breakers(recovery_time=10)
+    calls = 0
+
+    async def hung_extract(self, url):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(5)
+
+    async def fetch(episode_id, server, category, context):
+        return await episode_srcs._getAnimeEpisodeSources("https://streamtape.com/e/abc", server)
+
+    async def run():
+        context = EpisodeContext("frieren-18542?ep=107258")
+        server = EpisodeServer(serverName="streamtape", serverId=3, hianimeid="hd-4")
+        results = []
+        for _ in range(5):
+            deadline = asyncio.get_running_loop().time() + 10
+            results.append(await episode_srcs._fetch_server_sources(context, server, "sub", deadline))
+        return results
+
+    originals = (
+        StreamTape.extract, episode_srcs.circuit_breakers, episode_srcs._fetchAnimeEpisodeSources,
+        Config.SOURCES_SERVER_TIMEOUT, Config.SOURCES_HEDGING_ENABLED
+    )
+    StreamTape.extract = hung_extract
+    episode_srcs.circuit_breakers = registry
+    episode_srcs._fetchAnimeEpisodeSources = fetch
+    Config.SOURCES_SERVER_TIMEOUT = 0.1
+    Config.SOURCES_HEDGING_ENABLED = False
+    try:
+        results = asyncio.run(run())
+    finally:
+        (
+            StreamTape.extract, episode_srcs.circuit_breakers, episode_srcs._fetchAnimeEpisodeSources,
+            Config.SOURCES_SERVER_TIMEOUT, Config.SOURCES_HEDGING_ENABLED
+        ) = originals
+
+    stats = registry.stats()["breakers"]["StreamTape@streamtape.com"]
+    assert calls == 3
+    assert all(failed for _, failed in results)
+    assert results[0][0]["error"] == "Request timed out after 0.1 seconds"
+    assert stats["state"] == OPEN and stats["lastError"] == "timed out"
+    assert "skipped for the next" in results[-1][0]["error"]
+
+
+def main():
+    """Run circuit breaker tests."""
+    logger.info("Starting circuit breaker tests...")
+
+    tests = [
+        ("Trips After Consecutive Failures", test_trips_after_consecutive_failures),
+        ("Hosts And Extractors Are Independent", test_hosts_and_extractors_are_independent),
+        ("Background Probe Half-Opens The Circuit", test_background_probe_half_opens_the_circuit),
+        ("Failed Trial Reopens The Circuit", test_failed_trial_reopens_the_circuit),
+        ("Only Timeouts Count As Cancelled Failures", test_only_timeouts_count_as_cancelled_failures),
+        ("Open Circuit Skips Extraction", test_open_circuit_skips_extraction),
+        ("Server Timeouts Open The Circuit", test_server_timeouts_open_the_circuit),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Circuit Breaker Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Test the concurrent server fan-out in get_all_anime_episode_sources without network access."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.models import ScrapedEpisodeServers, EpisodeServer
+from src.utils.config import Config
+import src.scrapers.animeEpisodeSrcs as episode_srcs
+from src.scrapers.episodeContext import EpisodeContext
+
+# Configure logging
+logger = get_logger("TestConcurrentSources")
+
+EPISODE_ID = "attack-on-titan-112?ep=3303"
+
+# Simulated extraction time per scraper server name
+SERVER_DELAYS = {
+    episode_srcs.Servers.VidCloud: 0.3,
+    episode_srcs.Servers.VidStreaming: 0.3,
+    episode_srcs.Servers.StreamTape: 0.3,
+}
+
+
+async def fake_get_servers(self) -> ScrapedEpisodeServers:
+    return ScrapedEpisodeServers(
+        sub=[
+            EpisodeServer(serverName="rapidcloud", serverId=1, hianimeid="hd-1"),
+            EpisodeServer(serverName="vidstreaming", serverId=4, hianimeid="hd-2"),
+            EpisodeServer(serverName="streamtape", serverId=3, hianimeid="streamtape"),
+        ],
+        episodeId=self.episode_id,
+        episodeNo=1
+    )
+
+
+async def fake_get_anime_episode_sources(episode_id: str, server: str, category: str, *args, **kwargs):
+    await asyncio.sleep(SERVER_DELAYS[server])
+    return {
+        "headers": {"Referer": "https://example.com/"},
+        "sources": [{"url": f"https://example.com/{server}.m3u8", "isM3U8": True}],
+        "anilistID": 1,
+        "malID": 2
+    }
+
+
+def run_all_sources(**kwargs):
+    original_servers = EpisodeContext.get_servers
+    original_sources = episode_srcs.getAnimeEpisodeSources
+    EpisodeContext.get_servers = fake_get_servers
+    episode_srcs.getAnimeEpisodeSources = fake_get_anime_episode_sources
+    try:
+        started_at = time.perf_counter()
+        result = asyncio.run(episode_srcs.get_all_anime_episode_sources(EPISODE_ID, "sub", **kwargs))
+        return result, time.perf_counter() - started_at
+    finally:
+        EpisodeContext.get_servers = original_servers
+        episode_srcs.getAnimeEpisodeSources = original_sources
+
+
+def test_concurrent_fanout_wall_clock():
+    """Concurrent mode should take about as long as the slowest server."""
+    result, elapsed = run_all_sources(concurrent=True, max_concurrency=3)
+    logger.info(f"Concurrent fan-out took {elapsed:.2f}s")
+
+    assert result["success"], result
+    data = result["data"]
+    assert data["successfulServers"] == 3
+    assert data["concurrency"] == 3
+    assert elapsed < 0.6, f"Expected about 0.3s, took {elapsed:.2f}s"
+    for server_data in data["sources"].values():
+        assert server_data["latencyMs"] >= 250
+
+
+def test_sequential_mode():
+    """Sequential mode should add up per-server latencies."""
+    result, elapsed = run_all_sources(concurrent=False)
+    logger.info(f"Sequential mode took {elapsed:.2f}s")
+
+    assert result["data"]["concurrency"] == 1
+    assert result["data"]["successfulServers"] == 3
+    assert elapsed >= 0.85, f"Expected about 0.9s, took {elapsed:.2f}s"
+
+
+def test_partial_results_on_timeout():
+    """Slow servers should time out without dropping the servers that answered."""
+    original_timeout = Config.SOURCES_SERVER_TIMEOUT
+    SERVER_DELAYS[episode_srcs.Servers.StreamTape] = 5.0
+    Config.SOURCES_SERVER_TIMEOUT = 0.5
+    try:
+        result, elapsed = run_all_sources(concurrent=True)
+    finally:
+        Config.SOURCES_SERVER_TIMEOUT = original_timeout
+        SERVER_DELAYS[episode_srcs.Servers.StreamTape] = 0.3
+
+    data = result["data"]
+    logger.info(f"Partial results: {data['successfulServers']} ok, {data['failedServers']} failed in {elapsed:.2f}s")
+
+    assert result["success"], result
+    assert data["successfulServers"] == 2
+    assert data["failedServers"] == 1
+    failed = data["failedServersList"][0]
+    assert failed["serverName"] == "streamtape"
+    assert "timed out" in failed["error"]
+    assert "latencyMs" in failed
+    assert elapsed < 1.5
+
+
+def main():
+    """Run concurrent fan-out tests."""
+    logger.info("Starting concurrent fan-out tests...")
+
+    tests = [
+        ("Concurrent Fan-out Wall Clock", test_concurrent_fanout_wall_clock),
+        ("Sequential Mode", test_sequential_mode),
+        ("Partial Results On Timeout", test_partial_results_on_timeout),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Concurrent Fan-out Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Test the cached decryption key provider used by MegaCloud and RapidCloud."""
+import asyncio
+import base64
+import json
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+from src.management import get_logger
+from src.utils.config import Config
+import src.scrapers.extractor.keys as keys
+from src.scrapers.extractor.keys import KeyProvider
+from src.scrapers.extractor.megacloud import MegaCloud
+
+# Configure logging
+logger = get_logger("TestDecryptionKeys")
+
+SOURCES = [{"file": "https://cdn.example.com/master.m3u8", "type": "hls"}]
+
+
+def encrypt(plaintext: str, secret: str) -> str:
+    """Encrypt the way MegaCloud does (OpenSSL salted AES-256-CBC)."""
+    salt = b"01234567"
+    key, iv = MegaCloud()._evp_bytes_to_key(secret, salt, 32, 16)
+    cipher = AES.new(key, AES.MODE_CBC, iv=iv)
+    return base64.b64encode(b"Salted__" + salt + cipher.encrypt(pad(plaintext.encode(), AES.block_size))).decode()
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class KeyServer:
+    """Stand-in for the key host that counts downloads."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.downloads = 0
+
+    async def get(self, url, **kwargs):
+        self.downloads += 1
+        await asyncio.sleep(0.02)
+        return FakeResponse(self.key + "\n")
+
+
+def with_key_server(key_server: KeyServer, coro_factory):
+    original_client = keys.async_client
+    keys.async_client = key_server
+    try:
+        return asyncio.run(coro_factory())
+    finally:
+        keys.async_client = original_client
+
+
+def test_key_is_downloaded_once():
+    """Many extractions should share one key download."""
+    key_server = KeyServer("good-key")
+    provider = KeyProvider("test", "https://keys.example.com/key.txt")
+    encrypted = encrypt(json.dumps(SOURCES), "good-key")
+
+    async def run():
+        return await asyncio.gather(*(
+            provider.decrypt(lambda key: MegaCloud().decrypt(encrypted, key)) for _ in range(10)
+        ))
+
+    results = with_key_server(key_server, run)
+    assert all(json.loads(result) == SOURCES for result in results)
+    assert key_server.downloads == 1
+
+
+def test_padding_error_refetches_once():
+    """A rotated key should be picked up by one refetch shared by concurrent failures."""
+    key_server = KeyServer("old-key")
+    provider = KeyProvider("test", "https://keys.example.com/key.txt")
+    encrypted = encrypt(json.dumps(SOURCES), "new-key")
+
+    async def run():
+        await provider.get()
+        key_server.key = "new-key"
+        return await asyncio.gather(*(
+            provider.decrypt(lambda key: MegaCloud().decrypt(encrypted, key)) for _ in range(5)
+        ))
+
+    results = with_key_server(key_server, run)
+    logger.info(f"Provider stats: {provider.stats()}")
+    assert all(json.loads(result) == SOURCES for result in results)
+    assert key_server.downloads == 2
+    assert provider.stats()["forcedRefreshes"] == 1
+
+
+def test_bad_data_does_not_flood_refetches():
+    """Data no key can decrypt should cause at most one refetch per interval."""
+    key_server = KeyServer("good-key")
+    provider = KeyProvider("test", "https://keys.example.com/key.txt")
+    encrypted = encrypt(json.dumps(SOURCES), "unpublished-key")
+    original_interval = Config.DECRYPTION_KEY_MIN_REFRESH_INTERVAL
+    Config.DECRYPTION_KEY_MIN_REFRESH_INTERVAL = 60
+
+    async def run():
+        failures = 0
+        for _ in range(20):
+            try:
+                await provider.decrypt(lambda key: MegaCloud().decrypt(encrypted, key))
+            except Exception as e:
+                assert "padding" in str(e).lower()
+                failures += 1
+        return failures
+
+    try:
+        failures = with_key_server(key_server, run)
+    finally:
+        Config.DECRYPTION_KEY_MIN_REFRESH_INTERVAL = original_interval
+
+    assert failures == 20
+    assert key_server.downloads == 2
+    assert provider.stats()["suppressedRefreshes"] >= 18
+
+
+def test_other_errors_do_not_refetch():
+    """Errors other than bad padding should propagate without touching the key."""
+    key_server = KeyServer("good-key")
+    provider = KeyProvider("test", "https://keys.example.com/key.txt")
+
+    def broken_decrypt(key):
+        raise ValueError("Decrypted data is not valid JSON")
+
+    async def run():
+        try:
+            await provider.decrypt(broken_decrypt)
+        except ValueError:
+            return True
+        return False
+
+    assert with_key_server(key_server, run)
+    assert key_server.downloads == 1
+
+
+def main():
+    """Run decryption key tests."""
+    logger.info("Starting decryption key tests...")
+
+    tests = [
+        ("Key Is Downloaded Once", test_key_is_downloaded_once),
+        ("Padding Error Refetches Once", test_padding_error_refetches_once),
+        ("Bad Data Does Not Flood Refetches", test_bad_data_does_not_flood_refetches),
+        ("Other Errors Do Not Refetch", test_other_errors_do_not_refetch),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Decryption Key Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
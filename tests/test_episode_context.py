@@ -0,0 +1,134 @@
+"""Test that one EpisodeContext fetches each shared upstream page only once."""
+import asyncio
+import json
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+import src.scrapers.episodeContext as episode_context
+from src.scrapers.episodeContext import EpisodeContext
+
+# Configure logging
+logger = get_logger("TestEpisodeContext")
+
+EPISODE_ID = "attack-on-titan-112?ep=3303"
+
+SERVERS_HTML = """
+<div class="server-notice"><strong>Episode 1</strong></div>
+<div class="ps_-block ps_-block-sub servers-sub">
+  <div class="ps__-list">
+    <div class="server-item" data-type="sub" data-id="1" data-server-id="1"><a>HD-1</a></div>
+    <div class="server-item" data-type="sub" data-id="2" data-server-id="4"><a>HD-2</a></div>
+  </div>
+</div>
+"""
+
+WATCH_HTML = '<html><script id="syncData">{"anilist_id": "16498", "mal_id": "16498"}</script></html>'
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+        self.status_code = 200
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        pass
+
+
+class CountingClient:
+    def __init__(self):
+        self.urls = []
+
+    async def get(self, url, **kwargs):
+        self.urls.append(url)
+        await asyncio.sleep(0.05)
+        if "/ajax/v2/episode/servers" in url:
+            return FakeResponse(json.dumps({"html": SERVERS_HTML}))
+        return FakeResponse(WATCH_HTML)
+
+
+def run_with_client(coro_factory):
+    fake_client = CountingClient()
+    original_client = episode_context.async_client
+    episode_context.async_client = fake_client
+    try:
+        return asyncio.run(coro_factory()), fake_client.urls
+    finally:
+        episode_context.async_client = original_client
+
+
+def test_concurrent_callers_share_fetches():
+    """Concurrent servers should trigger one servers fetch and one watch page fetch."""
+    async def run():
+        context = EpisodeContext(EPISODE_ID)
+        servers = await context.get_servers()
+        results = await asyncio.gather(*(
+            asyncio.gather(context.get_servers_soup(), context.get_sync_ids())
+            for _ in servers.sub
+        ))
+        return servers, results
+
+    (servers, results), urls = run_with_client(run)
+    logger.info(f"Upstream requests: {urls}")
+
+    assert len(servers.sub) == 2
+    assert all(sync_ids == (16498, 16498) for _, sync_ids in results)
+    assert len(urls) == 2
+
+
+def test_errors_are_shared():
+    """A failed fetch should surface the same error to every caller without refetching."""
+    class FailingClient(CountingClient):
+        async def get(self, url, **kwargs):
+            self.urls.append(url)
+            raise RuntimeError("upstream down")
+
+    async def run():
+        context = EpisodeContext(EPISODE_ID)
+        return await asyncio.gather(*(context.get_servers() for _ in range(3)), return_exceptions=True)
+
+    fake_client = FailingClient()
+    original_client = episode_context.async_client
+    episode_context.async_client = fake_client
+    try:
+        results = asyncio.run(run())
+    finally:
+        episode_context.async_client = original_client
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(fake_client.urls) == 1
+
+
+def main():
+    """Run episode context tests."""
+    logger.info("Starting episode context tests...")
+
+    tests = [
+        ("Concurrent Callers Share Fetches", test_concurrent_callers_share_fetches),
+        ("Errors Are Shared", test_errors_are_shared),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Episode Context Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Test the thread pool execution layer used for blocking scrapers."""
+import asyncio
+import sys
+import os
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.utils.executor import ScraperExecutor
+
+# Configure logging
+logger = get_logger("TestExecutor")
+
+
+def blocking_scrape(delay: float) -> str:
+    time.sleep(delay)
+    return threading.current_thread().name
+
+
+def test_event_loop_not_blocked():
+    """Blocking work should run on worker threads while the loop keeps ticking."""
+    executor = ScraperExecutor(max_workers=4)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        thread_name = await executor.run("scrape", blocking_scrape, 0.3)
+        ticker_task.cancel()
+        return thread_name, ticks
+
+    try:
+        thread_name, ticks = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    logger.info(f"Worker thread: {thread_name}, loop ticks while blocked: {ticks}")
+    assert thread_name.startswith("scraper")
+    assert ticks >= 10, f"Event loop only ticked {ticks} times"
+
+
+def test_per_tool_limit_and_queue_depth():
+    """Calls beyond the per-tool limit should queue and show up in the stats."""
+    executor = ScraperExecutor(max_workers=8, tool_limits={"slow_tool": 2})
+
+    async def run():
+        tasks = [asyncio.create_task(executor.run("slow_tool", blocking_scrape, 0.2)) for _ in range(6)]
+        await asyncio.sleep(0.05)
+        during = executor.stats()["tools"]["slow_tool"]
+        started_at = time.perf_counter()
+        await asyncio.gather(*tasks)
+        return during, time.perf_counter() - started_at
+
+    try:
+        during, elapsed = asyncio.run(run())
+        after = executor.stats()["tools"]["slow_tool"]
+    finally:
+        executor.shutdown()
+
+    logger.info(f"Stats while running: {during}")
+    assert during["running"] == 2
+    assert during["queued"] == 4
+    assert after["completed"] == 6
+    assert after["queued"] == 0 and after["running"] == 0
+    assert after["maxQueued"] >= 4
+    # Six 0.2s calls two at a time take about three rounds
+    assert elapsed >= 0.5
+
+
+def test_errors_propagate():
+    """Exceptions raised by the scraper should reach the caller and be counted."""
+    executor = ScraperExecutor(max_workers=2)
+
+    def failing_scrape():
+        raise ValueError("Invalid anime id")
+
+    try:
+        asyncio.run(executor.run("failing_tool", failing_scrape))
+        raise AssertionError("Expected ValueError")
+    except ValueError as e:
+        assert "Invalid anime id" in str(e)
+    finally:
+        executor.shutdown()
+
+    assert executor.stats()["tools"]["failing_tool"]["failed"] == 1
+
+
+def main():
+    """Run executor tests."""
+    logger.info("Starting executor tests...")
+
+    tests = [
+        ("Event Loop Not Blocked", test_event_loop_not_blocked),
+        ("Per-tool Limit And Queue Depth", test_per_tool_limit_and_queue_depth),
+        ("Errors Propagate", test_errors_propagate),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Executor Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
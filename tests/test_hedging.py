@@ -0,0 +1,162 @@
+"""Test hedged attempts for slow calls and their use in the all-servers sources scraper."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.models import ScrapedEpisodeServers, EpisodeServer
+import src.scrapers.animeEpisodeSrcs as episode_srcs
+from src.scrapers.episodeContext import EpisodeContext
+from src.utils.hedging import Hedger
+
+# Configure logging
+logger = get_logger("TestHedging")
+
+EPISODE_ID = "attack-on-titan-112?ep=3303"
+
+
+def warmed_hedger(**kwargs) -> Hedger:
+    """Hedger that has already seen 20 calls of 50ms for key "server"."""
+    kwargs.setdefault("budget_ratio", 1)
+    hedger = Hedger("test", min_samples=20, **kwargs)
+    for _ in range(20):
+        hedger.record("server", 0.05)
+    return hedger
+
+
+def test_slow_call_is_hedged():
+    """A call past the p95 latency should be raced by a duplicate that wins."""
+    hedger = warmed_hedger()
+    attempts = []
+
+    async def attempt(hedged: bool):
+        attempts.append(hedged)
+        await asyncio.sleep(0.02 if hedged else 2)
+        return "hedge" if hedged else "primary"
+
+    async def run():
+        start = time.perf_counter()
+        result = await hedger.run("server", attempt)
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(run())
+    stats = hedger.stats()
+
+    assert result == "hedge"
+    assert attempts == [False, True]
+    assert elapsed < 0.5
+    assert stats["hedged"] == 1 and stats["hedgeWins"] == 1
+    assert stats["hedgeDelays"] == {"server": 0.05}
+
+
+def test_no_hedge_without_history_or_budget():
+    """Keys without enough samples, or an empty budget, should not be hedged."""
+    cold = Hedger("test", min_samples=20, budget_ratio=1)
+    broke = warmed_hedger(budget_ratio=0)
+    attempts = []
+
+    async def attempt(hedged: bool):
+        attempts.append(hedged)
+        await asyncio.sleep(0.15)
+        return "done"
+
+    async def run():
+        return await cold.run("server", attempt), await broke.run("server", attempt)
+
+    assert asyncio.run(run()) == ("done", "done")
+    assert attempts == [False, False]
+    assert broke.stats()["budgetDenied"] == 1
+
+
+def test_failures_fall_back_to_the_other_attempt():
+    """One failing attempt should not fail the call; two should raise the first error."""
+    async def primary_fails(hedged: bool):
+        if hedged:
+            await asyncio.sleep(0.05)
+            return "hedge"
+        await asyncio.sleep(0.1)
+        raise RuntimeError("primary failed")
+
+    async def both_fail(hedged: bool):
+        await asyncio.sleep(0.1)
+        raise RuntimeError("hedge failed" if hedged else "primary failed")
+
+    assert asyncio.run(warmed_hedger().run("server", primary_fails)) == "hedge"
+    try:
+        asyncio.run(warmed_hedger().run("server", both_fail))
+        raise AssertionError("Expected the primary's error")
+    except RuntimeError as e:
+        assert str(e) == "primary failed"
+
+
+def test_all_sources_hedges_slow_server():
+    """get_all_anime_episode_sources should race a slow server with an uncoalesced attempt."""
+    calls = []
+
+    async def fake_get_servers(self) -> ScrapedEpisodeServers:
+        return ScrapedEpisodeServers(
+            sub=[EpisodeServer(serverName="vidstreaming", serverId=4, hianimeid="hd-1")],
+            episodeId=self.episode_id,
+            episodeNo=1
+        )
+
+    async def fake_get_sources(episode_id, server, category, context=None, coalesce=True):
+        calls.append(coalesce)
+        await asyncio.sleep(5 if coalesce else 0.05)
+        return {"headers": {}, "sources": [{"url": "https://example.com/a.m3u8", "isM3U8": True}]}
+
+    hedger = warmed_hedger()
+    for _ in range(20):
+        hedger.record("vidstreaming", 0.1)
+
+    originals = (EpisodeContext.get_servers, episode_srcs.getAnimeEpisodeSources, episode_srcs.episode_sources_hedger)
+    EpisodeContext.get_servers = fake_get_servers
+    episode_srcs.getAnimeEpisodeSources = fake_get_sources
+    episode_srcs.episode_sources_hedger = hedger
+    try:
+        start = time.perf_counter()
+        result = asyncio.run(episode_srcs.get_all_anime_episode_sources(EPISODE_ID, "sub"))
+        elapsed = time.perf_counter() - start
+    finally:
+        EpisodeContext.get_servers, episode_srcs.getAnimeEpisodeSources, episode_srcs.episode_sources_hedger = originals
+
+    logger.info(f"Hedged all-sources call took {elapsed:.2f}s")
+    assert result["success"], result
+    assert result["data"]["successfulServers"] == 1
+    assert calls == [True, False]
+    assert elapsed < 1
+
+
+def main():
+    """Run hedging tests."""
+    logger.info("Starting hedging tests...")
+
+    tests = [
+        ("Slow Call Is Hedged", test_slow_call_is_hedged),
+        ("No Hedge Without History Or Budget", test_no_hedge_without_history_or_budget),
+        ("Failures Fall Back To The Other Attempt", test_failures_fall_back_to_the_other_attempt),
+        ("All Sources Hedges Slow Server", test_all_sources_hedges_slow_server),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Hedging Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
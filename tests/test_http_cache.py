@@ -0,0 +1,189 @@
+"""Test the on-disk HTTP response cache against a local server with ETags."""
+import sys
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.utils.client import Client
+from src.utils.httpcache import DiskCache
+
+# Configure logging
+logger = get_logger("TestHttpCache")
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"<html>home v1</html>"
+    etag = '"v1"'
+    requests_seen = []
+
+    def do_GET(self):
+        ETagHandler.requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETagHandler.etag:
+            self.send_response(304)
+            self.send_header("ETag", ETagHandler.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", ETagHandler.etag)
+        self.send_header("Content-Length", str(len(ETagHandler.body)))
+        self.end_headers()
+        self.wfile.write(ETagHandler.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    ETagHandler.requests_seen = []
+    ETagHandler.body = b"<html>home v1</html>"
+    ETagHandler.etag = '"v1"'
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_fresh_entries_skip_the_network():
+    """A fresh cached response should be served without a request."""
+    server = start_server()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            client = Client(disk_cache=DiskCache(directory, ttl=60))
+            url = f"http://127.0.0.1:{server.server_port}/home"
+            first = client.get(url, cache=True)
+            second = client.get(url, cache=True)
+        finally:
+            server.shutdown()
+
+        assert first.text == second.text == "<html>home v1</html>"
+        assert len(ETagHandler.requests_seen) == 1
+        assert client.stats()["diskCache"]["hits"] == 1
+
+
+def test_expired_entries_revalidate_with_etag():
+    """Expired entries should be revalidated with If-None-Match and reused on 304."""
+    server = start_server()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            client = Client(disk_cache=DiskCache(directory, ttl=0))
+            url = f"http://127.0.0.1:{server.server_port}/home"
+            client.get(url, cache=True)
+            revalidated = client.get(url, cache=True)
+            ETagHandler.body = b"<html>home v2</html>"
+            ETagHandler.etag = '"v2"'
+            changed = client.get(url, cache=True)
+        finally:
+            server.shutdown()
+
+        assert ETagHandler.requests_seen[1]["If-None-Match"] == '"v1"'
+        assert revalidated.status_code == 200
+        assert revalidated.text == "<html>home v1</html>"
+        assert changed.text == "<html>home v2</html>"
+        assert client.disk_cache.stats()["revalidated"] == 1
+
+
+def test_cache_survives_restart():
+    """A new cache over the same directory should serve what the old one stored."""
+    server = start_server()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/home"
+            Client(disk_cache=DiskCache(directory, ttl=60)).get(url, cache=True)
+            restarted = Client(disk_cache=DiskCache(directory, ttl=60))
+            response = restarted.get(url, cache=True)
+        finally:
+            server.shutdown()
+
+        assert response.text == "<html>home v1</html>"
+        assert len(ETagHandler.requests_seen) == 1
+        assert restarted.disk_cache.stats()["entries"] == 1
+
+
+def test_size_bounded_eviction():
+    """The least recently used entries should be evicted to stay under max_bytes."""
+    server = start_server()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            cache = DiskCache(directory, max_bytes=1200, ttl=60)
+            client = Client(disk_cache=cache)
+            base = f"http://127.0.0.1:{server.server_port}"
+            for page in range(10):
+                client.get(f"{base}/page-{page}", cache=True)
+                # Keep page 0 recently used so it survives
+                client.get(f"{base}/page-0", cache=True)
+                time.sleep(0.01)
+        finally:
+            server.shutdown()
+
+        stats = cache.stats()
+        logger.info(f"Disk cache stats: {stats}")
+        assert stats["bytes"] <= 1200
+        assert stats["evictions"] > 0
+        assert cache.get(f"{base}/page-0") is not None
+        assert cache.get(f"{base}/page-1") is None
+
+
+def make_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = "utf-8"
+    return response
+
+
+def test_counters_only_count_what_happened():
+    """Refused entries should not count as stores, and counters should add up across threads."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiskCache(directory, max_bytes=1200, ttl=60)
+        assert cache.put("http://example.test/big", make_response(b"x" * 2000)) is not None
+        assert cache.put("http://example.test/small", make_response(b"small")) is not None
+        stats = cache.stats()
+        assert stats["stores"] == 1 and stats["entries"] == 1
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: cache.record(i % 2 == 0), range(20000)))
+        stats = cache.stats()
+        assert stats["hits"] == 10000 and stats["misses"] == 10000
+
+
+def main():
+    """Run disk cache tests."""
+    logger.info("Starting disk cache tests...")
+
+    tests = [
+        ("Fresh Entries Skip The Network", test_fresh_entries_skip_the_network),
+        ("Expired Entries Revalidate With ETag", test_expired_entries_revalidate_with_etag),
+        ("Cache Survives Restart", test_cache_survives_restart),
+        ("Size Bounded Eviction", test_size_bounded_eviction),
+        ("Counters Only Count What Happened", test_counters_only_count_what_happened),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Disk Cache Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Test the MCP load-test harness against a server redirected to the stand-in."""
+import asyncio
+import sys
+import os
+from argparse import Namespace
+from types import SimpleNamespace
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.loadtest import ToolStats, call_error, parse_mix, run_load_test
+from src.management import get_logger
+
+# Configure logging
+logger = get_logger("TestLoadTest")
+
+
+def text_result(text: str, is_error: bool = False):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], isError=is_error)
+
+
+def test_mix_and_result_parsing():
+    """Workload weights should parse and success=false results should count as errors."""
+    assert parse_mix("get_home_page=3, get_anime_about_info") == {"get_home_page": 3.0, "get_anime_about_info": 1.0}
+    assert call_error(text_result('{"success": true, "data": {}}')) is None
+    assert call_error(text_result('{"success": false, "error": "boom"}')) == "boom"
+    assert call_error(text_result("Error executing tool", is_error=True)) == "Error executing tool"
+
+
+def test_percentile_summary():
+    """Percentiles should be reported in milliseconds over every recorded call."""
+    stats = ToolStats()
+    for index in range(100):
+        stats.record((index + 1) / 1000, "failed" if index % 10 == 0 else None)
+    summary = stats.summary(duration=10)
+
+    assert summary["calls"] == 100
+    assert summary["errorRate"] == 0.1
+    assert summary["throughput"] == 10
+    assert (summary["p50Ms"], summary["p95Ms"], summary["p99Ms"]) == (50.0, 95.0, 99.0)
+
+
+def test_spawned_load_test():
+    """A short spawned run should drive every tool of the mix through the stand-in."""
+    args = Namespace(
+        url=None, spawn=True, clients=3, rates="6", duration=2, mix="get_home_page=1,get_anime_about_info=1",
+        anime_id="frieren-beyond-journeys-end-18542", episode_id="frieren-beyond-journeys-end-18542?ep=107257",
+        call_timeout=30, upstream_latency_ms=20, upstream_jitter_ms=0, upstream_error_rate=0.0,
+        server_logs=False, seed=3
+    )
+    result = asyncio.run(run_load_test(args))
+    run = result["runs"][0]
+    logger.info(f"Load test overall: {run['overall']}")
+
+    assert run["connectedClients"] == 3
+    assert set(run["tools"]) == {"get_home_page", "get_anime_about_info"}
+    assert run["overall"]["calls"] == run["issued"] > 0
+    assert run["overall"]["errors"] == 0
+    assert result["upstreamRequests"]["/home"] >= 1
+    assert result["serverStats"]["success"]
+
+
+def main():
+    """Run load-test harness tests."""
+    logger.info("Starting load-test harness tests...")
+
+    tests = [
+        ("Mix And Result Parsing", test_mix_and_result_parsing),
+        ("Percentile Summary", test_percentile_summary),
+        ("Spawned Load Test", test_spawned_load_test),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Load-Test Harness Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
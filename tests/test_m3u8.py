@@ -0,0 +1,235 @@
+"""Test the HLS playlist parser, variant selection and playlist cache."""
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+from aiohttp import web
+
+from src.management import get_logger
+from src.utils.cache import TTLCache
+import src.utils.m3u8 as m3u8
+from src.utils.m3u8 import parse_attributes, parse_playlist, parse_quality, select_sources, select_variant, sort_variants
+
+# Configure logging
+logger = get_logger("TestM3U8")
+
+MASTER_URL = "https://cdn.example.com/hls/abc/master.m3u8?token=xyz"
+
+MASTER = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2"
+360p/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=5000000,AVERAGE-BANDWIDTH=4500000,RESOLUTION=1920x1080,FRAME-RATE=23.976
+https://other.example.com/1080p/index.m3u8
+
+#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720
+/hls/abc/720p/index.m3u8
+#EXT-X-I-FRAME-STREAM-INF:BANDWIDTH=80000,RESOLUTION=640x360,URI="360p/iframes.m3u8"
+"""
+
+MEDIA = """#EXTM3U
+#EXT-X-TARGETDURATION:6
+#EXT-X-MEDIA-SEQUENCE:42
+#EXTINF:6.006,
+seg-0.ts
+#EXTINF:5.5,
+seg-1.ts
+#EXTINF:2.0,
+seg-2.ts
+#EXT-X-ENDLIST
+"""
+
+
+def test_master_playlist():
+    """Variants should carry their attributes and absolute URLs."""
+    playlist = parse_playlist(MASTER, MASTER_URL)
+    by_quality = {variant.quality: variant for variant in playlist.variants}
+
+    assert playlist.is_master and playlist.media is None
+    assert [variant.quality for variant in playlist.variants] == ["360p", "1080p", "720p"]
+    assert by_quality["360p"].url == "https://cdn.example.com/hls/abc/360p/index.m3u8"
+    assert by_quality["360p"].codecs == "avc1.4d401e,mp4a.40.2"
+    assert by_quality["1080p"].url == "https://other.example.com/1080p/index.m3u8"
+    assert by_quality["1080p"].average_bandwidth == 4500000
+    assert by_quality["1080p"].frame_rate == 23.976
+    assert by_quality["720p"].url == "https://cdn.example.com/hls/abc/720p/index.m3u8"
+    assert playlist.iframe_variants[0].url == "https://cdn.example.com/hls/abc/360p/iframes.m3u8"
+    assert playlist.iframe_variants[0].iframe
+
+
+def test_media_playlist():
+    """A media playlist should be summarized, also when fed line by line."""
+    lines = iter(MEDIA.splitlines(keepends=True))
+    playlist = parse_playlist(lines, "https://cdn.example.com/hls/abc/720p/index.m3u8")
+
+    assert not playlist.is_master
+    assert playlist.media.segments == 3
+    assert playlist.media.duration == 13.506
+    assert playlist.media.target_duration == 6
+    assert playlist.media.media_sequence == 42
+    assert playlist.media.ended
+    assert playlist.media.first_segment == "https://cdn.example.com/hls/abc/720p/seg-0.ts"
+
+
+def test_attribute_parsing():
+    """Quoted values may contain commas and equals signs."""
+    attributes = parse_attributes('BANDWIDTH=1,CODECS="a,b",URI="x.m3u8?a=b",NAME=plain')
+    assert attributes == {"BANDWIDTH": "1", "CODECS": "a,b", "URI": "x.m3u8?a=b", "NAME": "plain"}
+
+
+def test_variant_selection():
+    """Selection should honour quality targets and bandwidth caps."""
+    variants = parse_playlist(MASTER, MASTER_URL).variants
+
+    assert [variant.quality for variant in sort_variants(variants)] == ["1080p", "720p", "360p"]
+    assert select_variant(variants).quality == "1080p"
+    assert select_variant(variants, "worst").quality == "360p"
+    assert select_variant(variants, "720p").quality == "720p"
+    assert select_variant(variants, 900).quality == "720p"
+    assert select_variant(variants, 240).quality == "360p"
+    assert select_variant(variants, max_bandwidth=3000000).quality == "720p"
+    assert select_variant(variants, max_bandwidth=1).quality == "1080p"
+    assert select_variant([]) is None
+
+
+def test_source_selection():
+    """Extracted sources should be picked by their quality label, adaptive ones only as a last resort."""
+    sources = [
+        {"url": "https://cdn.example.com/master.m3u8", "quality": "auto"},
+        {"url": "https://cdn.example.com/1080p.m3u8", "quality": "1080p"},
+        {"url": "https://cdn.example.com/360p.m3u8", "quality": "360p"},
+        {"url": "https://cdn.example.com/720p.m3u8", "quality": "720p"},
+    ]
+
+    assert [source["quality"] for source in select_sources(sources, "best")] == ["1080p"]
+    assert [source["quality"] for source in select_sources(sources, "worst")] == ["360p"]
+    assert [source["quality"] for source in select_sources(sources, "720p")] == ["720p"]
+    assert [source["quality"] for source in select_sources(sources, 240)] == ["360p"]
+    assert select_sources(sources[:1], "720p") == sources[:1]
+    assert select_sources([], "best") == []
+
+    assert parse_quality(" 1080P ") == 1080 and parse_quality("Best") == "best"
+    try:
+        parse_quality("hd")
+        raise AssertionError("Expected an unknown quality to be refused")
+    except ValueError:
+        pass
+
+
+def test_fetch_playlist_streams():
+    """A long playlist arriving in chunks should parse as it would from the whole text."""
+    segments = "".join(f"#EXTINF:6.0,\r\nseg-{n}.ts?token={'x' * 200}\r\n" for n in range(5000))
+    media = f"#EXTM3U\r\n#EXT-X-TARGETDURATION:6\r\n{segments}#EXT-X-ENDLIST\r\n".encode()
+
+    async def handler(request):
+        if request.path.endswith("missing.m3u8"):
+            return web.Response(status=404)
+        response = web.StreamResponse(headers={"Content-Type": "application/vnd.apple.mpegurl"})
+        await response.prepare(request)
+        # Chunk boundaries fall in the middle of lines
+        for offset in range(0, len(media), 7777):
+            await response.write(media[offset:offset + 7777])
+        await response.write_eof()
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/hls/{name}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/hls"
+        try:
+            playlist = await m3u8.fetch_playlist(f"{base}/index.m3u8", cache=False)
+            try:
+                await m3u8.fetch_playlist(f"{base}/missing.m3u8", cache=False)
+                raise AssertionError("Expected a 404 to raise")
+            except aiohttp.ClientResponseError as e:
+                assert e.status == 404
+            return base, playlist
+        finally:
+            await m3u8.async_client.close()
+            await runner.cleanup()
+
+    base, playlist = asyncio.run(run())
+    assert playlist == parse_playlist(media.decode(), f"{base}/index.m3u8")
+    assert playlist.media.segments == 5000
+    assert playlist.media.duration == 30000
+    assert playlist.media.ended
+
+
+def test_fetch_playlist_is_cached():
+    """The same URL should be downloaded and parsed once."""
+    requests = 0
+
+    async def handler(request):
+        nonlocal requests
+        requests += 1
+        return web.Response(text=MASTER, content_type="application/vnd.apple.mpegurl")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/hls/master.m3u8", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/hls/master.m3u8"
+        try:
+            playlists = await asyncio.gather(*(m3u8.fetch_playlist(url) for _ in range(3)))
+            playlists.append(await m3u8.fetch_playlist(url))
+            await m3u8.fetch_playlist(url, cache=False)
+            return url, playlists
+        finally:
+            await m3u8.async_client.close()
+            await runner.cleanup()
+
+    original = m3u8.playlist_cache
+    m3u8.playlist_cache = TTLCache("test_playlists", ttl=60)
+    try:
+        url, playlists = asyncio.run(run())
+    finally:
+        m3u8.playlist_cache = original
+
+    assert requests == 2
+    assert all(playlist is playlists[0] for playlist in playlists)
+    assert playlists[0].variants[0].url == url.replace("master.m3u8", "360p/index.m3u8")
+
+
+def main():
+    """Run M3U8 tests."""
+    logger.info("Starting M3U8 tests...")
+
+    tests = [
+        ("Master Playlist", test_master_playlist),
+        ("Media Playlist", test_media_playlist),
+        ("Attribute Parsing", test_attribute_parsing),
+        ("Variant Selection", test_variant_selection),
+        ("Source Selection", test_source_selection),
+        ("Fetch Playlist Streams", test_fetch_playlist_streams),
+        ("Fetch Playlist Is Cached", test_fetch_playlist_is_cached),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- M3U8 Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Test that every HTML parser backend gives the scrapers the same results."""
+import sys
+import os
+import dataclasses
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup, Comment
+
+from benchmarks.fixtures import load_json, load_manifest, load_text
+from src.management import get_logger
+from src.models import HomePage
+from src.utils.config import Config
+from src.utils.parsing import BACKENDS, LxmlDocument, css_to_xpath, parse_html
+from src.utils.singlepass import UnsupportedSelector
+from src.scrapers.animeAboutInfo import parse_anime_about_info
+from src.scrapers.animeEpisodeServers import parse_episode_servers
+from src.scrapers.animeEpisodeSrcs import retrieveServerId
+from src.scrapers.homePages import HomePageScraper
+
+# Configure logging
+logger = get_logger("TestParsing")
+
+HTML = """
+<html><body>
+<div id="page" class="outer main">
+  <ul class="list">
+    <li class="card" id="first" data-server-id="4"><a href="/one" title="One" rel="nofollow noopener">One</a><span class="tick"><i class="sub">12</i></span></li>
+    <li class="card"><div class="film-detail"><a>no href</a><!-- note --><a href="/two">Two &amp; more</a></div></li>
+  </ul>
+  <ul class="list other"><li class="card"><a href="/three">  Three  </a></li></ul>
+  <p class="sub">outside <b>bold</b>
+     <script>var robotlink = 1;</script>tail</p>
+  <pre>
+     kept   </pre>
+</div>
+<script id="syncData" type="application/json">{"anilist_id": "154587"}</script>
+</body></html>
+"""
+
+SELECTORS = [
+    ".card", "li.card", "#first", ".outer .sub", ".tick .sub", ".list.other .card", "a[href]",
+    ".film-detail a[href]", "#page .list a", "ul li a[title]", "*[title]", "div .nope", "ul > li",
+    ".list > .card > a", "#page > .list", '.card[data-server-id="4"] a', "li[data-server-id='4']",
+    "a, .sub", ".sub, a", "html", "body > div", "script#syncData",
+]
+
+
+def signature(element) -> tuple:
+    """What identifies an element of HTML on either backend."""
+    return element.name, element.attrs, element.get_text()
+
+
+def test_selectors_match_like_beautifulsoup():
+    """select() on an lxml tree should find the same elements as BeautifulSoup, in the same order."""
+    soup = BeautifulSoup(HTML, "lxml")
+    document = parse_html(HTML, "lxml")
+    assert isinstance(document, LxmlDocument)
+
+    for selector in SELECTORS:
+        expected = [signature(tag) for tag in soup.select(selector)]
+        assert [signature(node) for node in document.select(selector)] == expected, selector
+        first = document.select_one(selector)
+        assert (signature(first) if first else None) == (expected[0] if expected else None), selector
+
+    # Ancestors outside the searched element count, as they do for BeautifulSoup
+    assert len(document.select_one(".film-detail").select(".outer a[href]")) == 1
+    assert document.select_one(".list").select_one("ul > li")["id"] == "first"
+
+
+def test_unsupported_selectors():
+    """Selectors outside the translated subset should be refused rather than mistranslated."""
+    for selector in ["li + li", "li ~ li", "li:first-child", 'a[href^="/"]', "", "a >", ", a"]:
+        try:
+            css_to_xpath(selector)
+            raise AssertionError(f"Expected '{selector}' to be unsupported")
+        except UnsupportedSelector:
+            pass
+
+
+def test_node_interface_matches_beautifulsoup():
+    """Text, attributes and navigation should read the same as on BeautifulSoup tags."""
+    soup = BeautifulSoup(HTML, "lxml")
+    document = parse_html(HTML, "lxml")
+
+    for selector in [".sub", "li.card", ".list.other a", "pre", "#page", "b", "script"]:
+        tag, node = soup.select_one(selector), document.select_one(selector)
+        assert node.text == tag.text, selector
+        assert node.get_text(strip=True) == tag.get_text(strip=True), selector
+        assert node.get_text(" ", strip=True) == tag.get_text(" ", strip=True), selector
+        assert node.string == tag.string, selector
+        assert node.attrs == tag.attrs, selector
+        assert [child if isinstance(child, str) else child.name for child in node.contents] == \
+            [child if isinstance(child, str) else child.name for child in tag.contents if not isinstance(child, Comment)], selector
+    # lxml drops the whitespace after </html>, which BeautifulSoup keeps at the top level
+    assert document.select_one("body").get_text() == soup.body.get_text()
+
+    link = document.select_one("#first a")
+    assert link["href"] == "/one" and link.get("rel") == ["nofollow", "noopener"]
+    assert link.get("missing", "default") == "default" and not link.has_attr("missing")
+    assert link.parent is document.select_one("#first") and link.parent.parent.name == "ul"
+    assert document.select_one("html").parent is document and document.parent is None
+
+    assert document.find("script", id="syncData").string == soup.find("script", id="syncData").string
+    assert document.find("script", string=lambda text: text and "robotlink" in text).string == "var robotlink = 1;"
+    assert [node["href"] for node in document.find_all("a", href=True)] == ["/one", "/two", "/three"]
+    assert [node.text for node in document.find_all(class_="card", limit=2)] == [tag.text for tag in soup.find_all(class_="card", limit=2)]
+    assert document.find("a", title="Nope") is None
+
+
+def test_empty_page_falls_back():
+    """Pages lxml refuses to build a tree for should still parse."""
+    assert isinstance(parse_html("", "lxml"), BeautifulSoup)
+    assert parse_html("", "lxml").select_one("a") is None
+
+
+def test_scrapers_match_across_backends():
+    """Every scraper should produce the same result on every backend."""
+    manifest = load_manifest()
+    home_html = load_text("home")
+    about_html = load_text("anime_about")
+    servers_html = load_json("episode_servers")["html"]
+    scraper = HomePageScraper()
+
+    expected_home = dataclasses.asdict(scraper.parse_home_page(home_html, "bs4-lxml"))
+    expected_about = parse_anime_about_info(about_html, manifest["animeId"], parser="bs4-lxml")
+    expected_servers = parse_episode_servers(BeautifulSoup(servers_html, "html.parser"), manifest["episodeId"])
+    assert expected_home["spotlightAnimes"] and expected_about["success"] and expected_servers.sub
+
+    for backend in BACKENDS:
+        assert dataclasses.asdict(scraper.parse_home_page(home_html, backend)) == expected_home, backend
+        assert parse_anime_about_info(about_html, manifest["animeId"], parser=backend) == expected_about, backend
+        servers = parse_html(servers_html, backend)
+        assert parse_episode_servers(servers, manifest["episodeId"]) == expected_servers, backend
+        assert retrieveServerId(servers, 4, "sub") == retrieveServerId(BeautifulSoup(servers_html, "html.parser"), 4, "sub"), backend
+
+
+def test_single_pass_runs_on_lxml_trees():
+    """The single-pass walker should give the same home page on an lxml tree."""
+    html = load_text("home")
+    scraper = HomePageScraper()
+
+    walked = HomePage()
+    scraper._extract_single_pass(parse_html(html, "lxml"), walked)
+    assert dataclasses.asdict(walked) == dataclasses.asdict(scraper.parse_home_page(html, "bs4-lxml"))
+
+
+def test_configured_backend_and_overrides():
+    """Scrapers should use their override if one is set, else the configured backend."""
+    original = (Config.HTML_PARSER, Config.HTML_PARSER_OVERRIDES)
+    try:
+        Config.HTML_PARSER = "bs4-html.parser"
+        Config.HTML_PARSER_OVERRIDES = {"servers": "lxml"}
+        assert isinstance(parse_html(HTML), BeautifulSoup)
+        assert isinstance(parse_html(HTML, scraper="home"), BeautifulSoup)
+        assert isinstance(parse_html(HTML, scraper="servers"), LxmlDocument)
+        assert isinstance(parse_html(HTML, "bs4-lxml", scraper="servers"), BeautifulSoup)
+    finally:
+        Config.HTML_PARSER, Config.HTML_PARSER_OVERRIDES = original
+
+    try:
+        parse_html(HTML, "html5lib")
+        raise AssertionError("Expected an unknown backend to be refused")
+    except ValueError:
+        pass
+
+
+def main():
+    """Run HTML parser backend tests."""
+    logger.info("Starting HTML parser backend tests...")
+
+    tests = [
+        ("Selectors Match Like BeautifulSoup", test_selectors_match_like_beautifulsoup),
+        ("Unsupported Selectors", test_unsupported_selectors),
+        ("Node Interface Matches BeautifulSoup", test_node_interface_matches_beautifulsoup),
+        ("Empty Page Falls Back", test_empty_page_falls_back),
+        ("Scrapers Match Across Backends", test_scrapers_match_across_backends),
+        ("Single Pass Runs On Lxml Trees", test_single_pass_runs_on_lxml_trees),
+        ("Configured Backend And Overrides", test_configured_backend_and_overrides),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- HTML Parser Backend Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Test concurrent, bounded and cached master playlist resolution in RapidCloud."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from src.management import get_logger
+from src.scrapers.extractor.rapidcloud import RapidCloud
+from src.utils.cache import TTLCache
+from src.utils.config import Config
+import src.utils.m3u8 as m3u8
+
+# Configure logging
+logger = get_logger("TestRapidCloudPlaylists")
+
+
+class PlaylistHost:
+    """Local host serving slow master playlists and counting concurrent requests."""
+
+    def __init__(self, delay: float = 0.2, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        source_id = request.match_info["source_id"]
+        if source_id in self.failing:
+            return web.Response(status=404)
+        return web.Response(text="\n".join([
+            "#EXTM3U",
+            "#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360",
+            "360p/index.m3u8",
+            "#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720",
+            "720p/index.m3u8",
+        ]))
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/{source_id}/master.m3u8", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        await m3u8.async_client.close()
+        await self.runner.cleanup()
+
+
+def resolve(host: PlaylistHost, source_ids, rounds: int = 1, concurrency: int = 4):
+    """Resolve the masters of source_ids `rounds` times; returns the last result and its time."""
+    async def run():
+        base_url = await host.start()
+        sources = [{"file": f"{base_url}/{source_id}/master.m3u8", "type": "hls"} for source_id in source_ids]
+        try:
+            for _ in range(rounds):
+                start = time.perf_counter()
+                resolved = await RapidCloud()._resolve_playlists(sources, {})
+            return base_url, resolved, time.perf_counter() - start
+        finally:
+            await host.stop()
+
+    originals = (m3u8.playlist_cache, Config.RAPIDCLOUD_PLAYLIST_CONCURRENCY)
+    m3u8.playlist_cache = TTLCache("test_playlists", ttl=60)
+    Config.RAPIDCLOUD_PLAYLIST_CONCURRENCY = concurrency
+    try:
+        return asyncio.run(run())
+    finally:
+        m3u8.playlist_cache, Config.RAPIDCLOUD_PLAYLIST_CONCURRENCY = originals
+
+
+def test_playlists_resolve_concurrently():
+    """Four masters should take about one round trip, keeping the sources' order."""
+    host = PlaylistHost()
+    base_url, resolved, elapsed = resolve(host, ["a", "b", "c", "d"])
+    logger.info(f"Resolved {len(resolved)} variants in {elapsed:.2f}s")
+
+    assert elapsed < 0.5
+    assert host.max_active == 4
+    assert len(resolved) == 8
+    assert resolved[0] == {"url": f"{base_url}/a/720p/index.m3u8", "quality": "720p", "isM3U8": True}
+    assert resolved[-1]["url"] == f"{base_url}/d/360p/index.m3u8"
+
+
+def test_concurrency_is_bounded():
+    """No more than the configured number of masters should be fetched at once."""
+    host = PlaylistHost(delay=0.1)
+    _, resolved, _ = resolve(host, ["a", "b", "c", "d", "e"], concurrency=2)
+
+    assert host.max_active == 2
+    assert len(resolved) == 10
+
+
+def test_playlists_are_cached():
+    """Resolving the same masters again should not refetch them."""
+    host = PlaylistHost()
+    _, resolved, elapsed = resolve(host, ["a", "b"], rounds=2)
+
+    assert host.requests == 2
+    assert elapsed < 0.05
+    assert len(resolved) == 4
+
+
+def test_failed_playlists_are_skipped():
+    """One broken master should not lose the others; all broken should raise."""
+    host = PlaylistHost(delay=0, failing={"b"})
+    _, resolved, _ = resolve(host, ["a", "b"])
+    assert [source["quality"] for source in resolved] == ["720p", "360p"]
+
+    try:
+        resolve(PlaylistHost(delay=0, failing={"a", "b"}), ["a", "b"])
+        raise AssertionError("Expected an error when no playlist resolves")
+    except Exception as e:
+        assert "404" in str(e)
+
+
+def main():
+    """Run RapidCloud playlist tests."""
+    logger.info("Starting RapidCloud playlist tests...")
+
+    tests = [
+        ("Playlists Resolve Concurrently", test_playlists_resolve_concurrently),
+        ("Concurrency Is Bounded", test_concurrency_is_bounded),
+        ("Playlists Are Cached", test_playlists_are_cached),
+        ("Failed Playlists Are Skipped", test_failed_playlists_are_skipped),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- RapidCloud Playlist Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Test the per-host token-bucket rate limiter."""
+import asyncio
+import sys
+import os
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+import src.utils.client as client_module
+from src.management import get_logger
+from src.utils.client import AsyncClient
+from src.utils.ratelimit import RateLimiter
+
+# Configure logging
+logger = get_logger("TestRateLimiter")
+
+
+def test_burst_then_paced():
+    """A burst should pass at once and the rest should be spread at the configured rate."""
+    limiter = RateLimiter(enabled=True, host_limits={"example.com": (20, 5)})
+
+    async def run():
+        start = time.perf_counter()
+        waits = await asyncio.gather(*(limiter.acquire("https://example.com/page") for _ in range(10)))
+        return waits, time.perf_counter() - start
+
+    waits, elapsed = asyncio.run(run())
+    stats = limiter.stats()["hosts"]["example.com"]
+    logger.info(f"Elapsed {elapsed:.3f}s, stats: {stats}")
+
+    assert sorted(waits)[:5] == [0.0] * 5
+    assert 0.22 <= elapsed < 0.5
+    assert stats["requests"] == 10
+    assert stats["throttled"] == 5
+    assert abs(stats["maxWaitSeconds"] - 0.25) < 0.02
+
+
+def test_hosts_are_independent():
+    """Throttling one host should not delay another."""
+    limiter = RateLimiter(enabled=True, host_limits={"slow.example": (1, 1), "fast.example": (100, 10)})
+
+    async def run():
+        await limiter.acquire("https://slow.example/a")
+        slow = asyncio.ensure_future(limiter.acquire("https://slow.example/b"))
+        start = time.perf_counter()
+        await limiter.acquire("https://fast.example/a")
+        fast_elapsed = time.perf_counter() - start
+        slow.cancel()
+        return fast_elapsed
+
+    assert asyncio.run(run()) < 0.05
+    assert limiter.limits_for("www.slow.example") == (1, 1)
+
+
+def test_waiting_does_not_block_the_loop():
+    """Callers waiting for a token should leave the event loop free."""
+    limiter = RateLimiter(enabled=True, host_limits={"example.com": (5, 1)})
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        await asyncio.gather(*(limiter.acquire("https://example.com/") for _ in range(3)))
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(run()) >= 20
+
+
+def test_threads_and_loop_share_a_bucket():
+    """Sync callers in threads and async callers should draw from the same bucket."""
+    limiter = RateLimiter(enabled=True, host_limits={"example.com": (20, 2)})
+    thread_waits = []
+
+    def worker():
+        thread_waits.append(limiter.acquire_sync("https://example.com/"))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    async_wait = asyncio.run(limiter.acquire("https://example.com/"))
+    assert thread_waits == [0.0, 0.0]
+    assert async_wait > 0
+    assert limiter.stats()["hosts"]["example.com"]["requests"] == 3
+
+
+def test_429_pauses_the_host():
+    """A 429 with Retry-After should hold back the next request to that host."""
+    limiter = RateLimiter(enabled=True, host_limits={"127.0.0.1": (100, 10)})
+
+    async def handler(request):
+        return web.Response(status=429, headers={"Retry-After": "0.3"})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+        http = AsyncClient()
+        try:
+            first = await http.get(url, retry=False)
+            start = time.perf_counter()
+            await http.get(url, retry=False)
+            return first.status_code, time.perf_counter() - start
+        finally:
+            await http.close()
+            await runner.cleanup()
+
+    original = client_module.rate_limiter
+    client_module.rate_limiter = limiter
+    try:
+        status, elapsed = asyncio.run(run())
+    finally:
+        client_module.rate_limiter = original
+
+    assert status == 429
+    assert elapsed >= 0.28
+    assert limiter.stats()["hosts"]["127.0.0.1"]["pauses"] == 2
+
+
+def main():
+    """Run rate limiter tests."""
+    logger.info("Starting rate limiter tests...")
+
+    tests = [
+        ("Burst Then Paced", test_burst_then_paced),
+        ("Hosts Are Independent", test_hosts_are_independent),
+        ("Waiting Does Not Block The Loop", test_waiting_does_not_block_the_loop),
+        ("Threads And Loop Share A Bucket", test_threads_and_loop_share_a_bucket),
+        ("429 Pauses The Host", test_429_pauses_the_host),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Rate Limiter Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
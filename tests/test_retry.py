@@ -0,0 +1,231 @@
+"""Test retries of transient upstream failures, the retry budget and deadlines."""
+import asyncio
+import sys
+import os
+import time
+from contextlib import contextmanager
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+import src.utils.client as client_module
+from src.management import get_logger
+from src.utils.client import AsyncClient, Client
+from src.utils.executor import ScraperExecutor
+from src.utils.retry import DeadlineExceeded, Retrier, RetryBudget, deadline_scope, remaining_time
+
+# Configure logging
+logger = get_logger("TestRetry")
+
+
+class FlakyUpstream:
+    """Local server answering the queued statuses in order, then 200."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        return web.Response(status=status, text="ok" if status == 200 else "upstream error")
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+@contextmanager
+def using_retrier(retrier: Retrier):
+    original = client_module.retrier
+    client_module.retrier = retrier
+    try:
+        yield retrier
+    finally:
+        client_module.retrier = original
+
+
+def fast_retrier(**kwargs) -> Retrier:
+    kwargs.setdefault("budget", RetryBudget(ratio=1, min_per_second=10, window=10))
+    return Retrier(max_retries=3, base_delay=0.01, max_delay=0.05, seed=1, **kwargs)
+
+
+def run_against(upstream: FlakyUpstream, body):
+    async def run():
+        url = await upstream.start()
+        http = AsyncClient()
+        try:
+            return await body(http, url)
+        finally:
+            await http.close()
+            await upstream.stop()
+    return asyncio.run(run())
+
+
+def test_transient_errors_are_retried():
+    """Two 502s followed by a 200 should be invisible to the caller."""
+    upstream = FlakyUpstream([502, 502])
+    with using_retrier(fast_retrier()) as retrier:
+        response = run_against(upstream, lambda http, url: http.get(url))
+
+    stats = retrier.stats()
+    assert response.status_code == 200
+    assert upstream.requests == 3
+    assert stats["retries"] == 2
+    assert stats["recovered"] == 1
+
+
+def test_only_idempotent_transient_failures_are_retried():
+    """POSTs and client errors should be returned after a single attempt."""
+    upstream = FlakyUpstream([503, 404])
+
+    async def body(http, url):
+        post = await http.request("POST", url)
+        missing = await http.get(url)
+        return post.status_code, missing.status_code
+
+    with using_retrier(fast_retrier()) as retrier:
+        statuses = run_against(upstream, body)
+
+    assert statuses == (503, 404)
+    assert upstream.requests == 2
+    assert retrier.stats()["retries"] == 0
+
+
+def test_retries_stop_after_max_retries():
+    """A persistent outage should give up after max_retries and return the last response."""
+    upstream = FlakyUpstream([503] * 10)
+    with using_retrier(fast_retrier()) as retrier:
+        response = run_against(upstream, lambda http, url: http.get(url))
+
+    assert response.status_code == 503
+    assert upstream.requests == 4
+    assert retrier.stats()["exhausted"] == 1
+
+
+def test_budget_caps_retries():
+    """With the budget spent, failures should be returned without retrying."""
+    upstream = FlakyUpstream([503] * 10)
+    retrier = fast_retrier(budget=RetryBudget(ratio=0.5, min_per_second=0, window=10))
+
+    async def body(http, url):
+        return [(await http.get(url)).status_code for _ in range(2)]
+
+    with using_retrier(retrier):
+        statuses = run_against(upstream, body)
+
+    # Two requests earn one retry in total
+    assert statuses == [503, 503]
+    assert upstream.requests == 3
+    assert retrier.stats()["budgetDenied"] == 2
+
+
+def test_deadline_limits_retries():
+    """No retry should start that cannot finish before the caller's deadline."""
+    upstream = FlakyUpstream([503] * 10)
+    retrier = Retrier(max_retries=5, base_delay=1, max_delay=1, seed=1,
+                      budget=RetryBudget(ratio=1, min_per_second=10, window=10))
+
+    async def body(http, url):
+        start = time.perf_counter()
+        with deadline_scope(0.3):
+            response = await http.get(url)
+        return response.status_code, time.perf_counter() - start
+
+    with using_retrier(retrier):
+        status, elapsed = run_against(upstream, body)
+
+    assert status == 503
+    assert elapsed < 0.3
+    assert retrier.stats()["deadlineDenied"] >= 1
+
+
+def test_expired_deadline_skips_the_request():
+    """A request made after the deadline should fail without reaching the network."""
+    upstream = FlakyUpstream([])
+
+    async def body(http, url):
+        with deadline_scope(0.05):
+            await asyncio.sleep(0.1)
+            try:
+                await http.get(url)
+            except DeadlineExceeded:
+                return True
+        return False
+
+    with using_retrier(fast_retrier()):
+        assert run_against(upstream, body)
+    assert upstream.requests == 0
+
+
+def test_sync_client_retries():
+    """The pooled requests transport should retry the same way."""
+    upstream = FlakyUpstream([500])
+
+    async def body(http, url):
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: Client().get(url))
+
+    with using_retrier(fast_retrier()) as retrier:
+        response = run_against(upstream, body)
+
+    assert response.status_code == 200
+    assert upstream.requests == 2
+    assert retrier.stats()["recovered"] == 1
+
+
+def test_deadline_reaches_executor_threads():
+    """Blocking scrapers run on the executor should see the caller's deadline."""
+    executor = ScraperExecutor(max_workers=1)
+
+    async def run():
+        with deadline_scope(5):
+            return await executor.run("test", remaining_time)
+
+    remaining = asyncio.run(run())
+    executor.shutdown()
+    assert remaining is not None and 4 < remaining <= 5
+
+
+def main():
+    """Run retry tests."""
+    logger.info("Starting retry tests...")
+
+    tests = [
+        ("Transient Errors Are Retried", test_transient_errors_are_retried),
+        ("Only Idempotent Transient Failures Are Retried", test_only_idempotent_transient_failures_are_retried),
+        ("Retries Stop After Max Retries", test_retries_stop_after_max_retries),
+        ("Budget Caps Retries", test_budget_caps_retries),
+        ("Deadline Limits Retries", test_deadline_limits_retries),
+        ("Expired Deadline Skips The Request", test_expired_deadline_skips_the_request),
+        ("Sync Client Retries", test_sync_client_retries),
+        ("Deadline Reaches Executor Threads", test_deadline_reaches_executor_threads),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Retry Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Test the adaptive fallback selectors used by the home page scraper."""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.management import get_logger
+from src.utils.extractors import SelectorChain
+import src.scrapers.homePages as home_pages
+from src.scrapers.homePages import HomePageScraper
+
+# Configure logging
+logger = get_logger("TestSelectorChain")
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "home.html")
+
+HTML = """
+<div class="new-layout"><a class="genre">Action</a><a class="genre">Drama</a></div>
+"""
+
+
+class CountingSoup:
+    """Wraps a soup and counts the selectors run against it."""
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.selected = []
+
+    def select(self, selector):
+        self.selected.append(selector)
+        return self.soup.select(selector)
+
+
+def counts(chain: SelectorChain) -> dict:
+    return {entry["selector"]: (entry["hits"], entry["misses"]) for entry in chain.stats()["selectors"]}
+
+
+def test_last_match_is_tried_first():
+    """After a fallback matches, it should be the only selector run next time."""
+    chain = SelectorChain("genres", [".old-layout a", ".older-layout a", ".new-layout .genre"])
+    soup = CountingSoup(BeautifulSoup(HTML, "html.parser"))
+
+    selector, elements = chain.resolve(soup.select)
+    assert selector == ".new-layout .genre"
+    assert [element.text for element in elements] == ["Action", "Drama"]
+    assert soup.selected == [".old-layout a", ".older-layout a", ".new-layout .genre"]
+
+    soup.selected.clear()
+    chain.resolve(soup.select)
+    assert soup.selected == [".new-layout .genre"]
+    assert chain.candidates() == [".new-layout .genre", ".old-layout a", ".older-layout a"]
+    assert counts(chain) == {".old-layout a": (0, 1), ".older-layout a": (0, 1), ".new-layout .genre": (2, 0)}
+
+
+def test_layout_drifts_back():
+    """When the preferred selector stops matching, the others are tried in declared order."""
+    chain = SelectorChain("genres", [".first", ".second", ".third"])
+    pages = iter([
+        BeautifulSoup('<p class="third">x</p>', "html.parser"),
+        BeautifulSoup('<p class="second">x</p>', "html.parser"),
+        BeautifulSoup("<p>nothing</p>", "html.parser"),
+    ])
+
+    assert chain.resolve(next(pages).select)[0] == ".third"
+    assert chain.resolve(next(pages).select)[0] == ".second"
+    assert chain.stats()["preferred"] == ".second"
+    assert chain.resolve(next(pages).select) == (None, None)
+    assert chain.stats()["preferred"] == ".second"
+
+
+def test_home_page_selectors_adapt():
+    """Parsing the recorded home page twice should pay the trending misses only once."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+
+    originals = (home_pages.TRENDING_SELECTORS, home_pages.GENRE_SELECTORS)
+    home_pages.TRENDING_SELECTORS = SelectorChain("trending", originals[0].selectors)
+    home_pages.GENRE_SELECTORS = SelectorChain("genres", originals[1].selectors)
+    try:
+        scraper = HomePageScraper()
+        first = scraper.parse_home_page(html)
+        second = scraper.parse_home_page(html)
+        trending = counts(home_pages.TRENDING_SELECTORS)
+        genres = counts(home_pages.GENRE_SELECTORS)
+    finally:
+        home_pages.TRENDING_SELECTORS, home_pages.GENRE_SELECTORS = originals
+
+    logger.info(f"Trending selectors: {trending}")
+    assert first == second
+    assert first.trendingAnimes and first.genres
+    assert sum(misses for _, misses in trending.values()) == 2
+    assert sum(hits for hits, _ in trending.values()) == 2
+    assert genres["#sidebar_subs_genre .nav-link"] == (2, 0)
+
+
+def main():
+    """Run selector chain tests."""
+    logger.info("Starting selector chain tests...")
+
+    tests = [
+        ("Last Match Is Tried First", test_last_match_is_tried_first),
+        ("Layout Drifts Back", test_layout_drifts_back),
+        ("Home Page Selectors Adapt", test_home_page_selectors_adapt),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Selector Chain Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
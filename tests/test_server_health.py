@@ -0,0 +1,138 @@
+"""Test the server health registry and health-aware ordering of source extraction."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.models import ScrapedEpisodeServers, EpisodeServer
+import src.scrapers.animeEpisodeSrcs as episode_srcs
+from src.scrapers.episodeContext import EpisodeContext
+from src.utils.health import ServerHealth
+
+# Configure logging
+logger = get_logger("TestServerHealth")
+
+EPISODE_ID = "one-piece-100?ep=2142"
+
+
+def test_scores_reflect_outcomes():
+    """Failures, decryption failures and latency should all lower a server's score."""
+    health = ServerHealth(names={1: "rapidcloud", 4: "vidstreaming", 5: "streamsb"}, half_life=3600, latency_ref=10)
+    for _ in range(5):
+        health.record(4, True, latency=1.0)
+        health.record(1, True, latency=8.0)
+        health.record(5, False, decryption_failure=True, error="Decryption failed")
+
+    stats = {entry["serverName"]: entry for entry in health.stats()}
+    logger.info(f"Health: {stats}")
+
+    assert health.score(4) > health.score(1) > health.score(5)
+    assert health.score(6) == 0.5
+    assert [entry["serverName"] for entry in health.stats()] == ["vidstreaming", "rapidcloud", "streamsb"]
+    assert stats["vidstreaming"]["successRate"] == 1 and stats["vidstreaming"]["latencyMs"] == 1000
+    assert stats["streamsb"]["decryptionFailures"] == 5
+    assert stats["streamsb"]["lastError"] == "Decryption failed"
+
+
+def test_scores_decay():
+    """Old failures should weigh less than recent successes."""
+    health = ServerHealth(half_life=0.1, latency_ref=10)
+    for _ in range(10):
+        health.record(4, False)
+    failing = health.score(4)
+    time.sleep(0.5)
+    health.record(4, True, latency=0.5)
+
+    assert failing < 0.1
+    assert health.score(4) > 0.5
+
+
+def test_order_is_stable_and_health_first():
+    """Unknown servers should keep their order and unhealthy ones should move last."""
+    health = ServerHealth(half_life=3600, latency_ref=10)
+    servers = [1, 4, 5, 3]
+    assert health.order(servers, key=lambda server: server) == servers
+
+    for _ in range(3):
+        health.record(1, False)
+        health.record(3, True, latency=0.5)
+    assert health.order(servers, key=lambda server: server) == [3, 4, 5, 1]
+
+
+def test_all_sources_stops_after_enough_servers():
+    """The healthiest server should be tried first and the rest skipped once it succeeds."""
+    calls = []
+
+    async def fake_get_servers(self) -> ScrapedEpisodeServers:
+        return ScrapedEpisodeServers(
+            sub=[
+                EpisodeServer(serverName="vidstreaming", serverId=4, hianimeid="hd-1"),
+                EpisodeServer(serverName="streamsb", serverId=5, hianimeid="hd-3"),
+                EpisodeServer(serverName="streamtape", serverId=3, hianimeid="hd-4"),
+            ],
+            episodeId=self.episode_id,
+            episodeNo=1
+        )
+
+    async def fake_get_sources(episode_id, server, category, *args, **kwargs):
+        calls.append(server)
+        await asyncio.sleep(0.05)
+        return {"headers": {}, "sources": [{"url": f"https://example.com/{server}.m3u8", "isM3U8": True}]}
+
+    health = ServerHealth(half_life=3600, latency_ref=10)
+    for _ in range(3):
+        health.record(4, False, error="Request timed out after 45 seconds")
+        health.record(3, True, latency=0.5)
+
+    originals = (EpisodeContext.get_servers, episode_srcs.getAnimeEpisodeSources, episode_srcs.server_health)
+    EpisodeContext.get_servers = fake_get_servers
+    episode_srcs.getAnimeEpisodeSources = fake_get_sources
+    episode_srcs.server_health = health
+    try:
+        result = asyncio.run(episode_srcs.get_all_anime_episode_sources(
+            EPISODE_ID, "sub", concurrent=False, enough_servers=1
+        ))
+    finally:
+        EpisodeContext.get_servers, episode_srcs.getAnimeEpisodeSources, episode_srcs.server_health = originals
+
+    data = result["data"]
+    assert result["success"], result
+    assert calls == ["StreamTape"]
+    assert list(data["sources"]) == ["streamtape"]
+    assert data["skippedServers"] == ["vidstreaming", "streamsb"]
+    assert health.stats()[0]["successes"] > 3.9
+
+
+def main():
+    """Run server health tests."""
+    logger.info("Starting server health tests...")
+
+    tests = [
+        ("Scores Reflect Outcomes", test_scores_reflect_outcomes),
+        ("Scores Decay", test_scores_decay),
+        ("Order Is Stable And Health First", test_order_is_stable_and_health_first),
+        ("All Sources Stops After Enough Servers", test_all_sources_stops_after_enough_servers),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Server Health Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
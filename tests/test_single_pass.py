@@ -0,0 +1,179 @@
+"""Test the single-pass home page extraction against the per-section selectors."""
+import sys
+import os
+import dataclasses
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.management import get_logger
+from src.utils.config import Config
+from src.utils.extractors import SelectorChain, SelectLookup
+from src.utils.singlepass import (
+    ContainerSection,
+    MatchSection,
+    SinglePassExtractor,
+    UnsupportedSelector,
+    compile_selector
+)
+import src.scrapers.homePages as home_pages
+from src.scrapers.homePages import HomePageScraper
+
+# Configure logging
+logger = get_logger("TestSinglePass")
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "home.html")
+
+HTML = """
+<div id="page" class="outer">
+  <ul class="list">
+    <li class="card" id="first"><a href="/one" title="One">One</a><span class="tick"><i class="sub">12</i></span></li>
+    <li class="card"><div class="film-detail"><a>no href</a><a href="/two">Two</a></div></li>
+  </ul>
+  <ul class="list other"><li class="card"><a href="/three">Three</a></li></ul>
+  <p class="sub">outside</p>
+</div>
+"""
+
+CHAINS = ("SPOTLIGHT_SELECTORS", "TRENDING_SELECTORS", "RANK_SELECTORS", "GENRE_SELECTORS")
+
+
+def parse(html: str, single_pass: bool) -> dict:
+    """
+    Parse a home page with fresh selector chains, so earlier parses do not reorder them.
+
+    Uses a BeautifulSoup tree, the only one the single pass runs on.
+    """
+    originals = [getattr(home_pages, name) for name in CHAINS] + [Config.HOME_PAGE_SINGLE_PASS]
+    for name, chain in zip(CHAINS, originals):
+        setattr(home_pages, name, SelectorChain(chain.name, chain.selectors))
+    Config.HOME_PAGE_SINGLE_PASS = single_pass
+    try:
+        return dataclasses.asdict(HomePageScraper().parse_home_page(html, "bs4-lxml"))
+    finally:
+        for name, chain in zip(CHAINS, originals):
+            setattr(home_pages, name, chain)
+        Config.HOME_PAGE_SINGLE_PASS = originals[-1]
+
+
+def test_selectors_match_like_select():
+    """Every supported selector should find the same elements as BeautifulSoup's select()."""
+    soup = BeautifulSoup(HTML, "html.parser")
+    selectors = [
+        ".card", "li.card", "#first", ".outer .sub", ".tick .sub", ".list.other .card",
+        "a[href]", ".film-detail a[href]", "#page .list a", "ul li a[title]", "*[title]", "div .nope",
+    ]
+    elements = [tag for tag in soup.descendants if getattr(tag, "name", None)]
+    for selector in selectors:
+        compiled = compile_selector(selector)
+        found = [tag for tag in elements if any(part.matches(tag) for part in compiled)]
+        assert found == soup.select(selector), selector
+
+
+def test_unsupported_selectors():
+    """Combinators and pseudo-classes the walker cannot evaluate should be refused."""
+    for selector in ["ul > li", "li + li", "li:first-child", 'a[href="/one"]', ""]:
+        try:
+            compile_selector(selector)
+            raise AssertionError(f"Expected '{selector}' to be unsupported")
+        except UnsupportedSelector:
+            pass
+
+
+def test_sections_collect_in_one_walk():
+    """Containers, their items' fields and plain matches should all come out of one walk."""
+    soup = BeautifulSoup(HTML, "html.parser")
+    fields = {"link": "a[href]", "detailLink": ".film-detail a[href]", "sub": ".tick .sub"}
+    lists = ContainerSection([".missing", ".list"], ".card", fields, many=["link"])
+    subs = MatchSection([".sub", ".tick .sub"])
+    SinglePassExtractor([lists, subs]).walk(soup)
+
+    assert lists.first_container(".missing") is None
+    container = lists.first_with_items(".list")
+    assert container is lists.first_container(".list")
+    assert len(container.items) == 2  # The second list is ignored once the first has items
+
+    for item in container.items:
+        expected = SelectLookup(item.element, fields)
+        for field in fields:
+            assert item.first(field) is expected.first(field), field
+        assert item.all("link") == expected.all("link")
+    assert [tag.text for tag in subs.matches(".sub")] == ["12", "outside"]
+    assert [tag.text for tag in subs.matches(".tick .sub")] == ["12"]
+
+
+def test_home_page_matches_per_section_extraction():
+    """The recorded home page should parse the same either way."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+
+    single = parse(html, single_pass=True)
+    assert single == parse(html, single_pass=False)
+    assert len(single["spotlightAnimes"]) == 10
+    assert len(single["trendingAnimes"]) == 12
+    assert single["genres"][0] == "Action"
+
+
+def test_drifted_layout_matches_per_section_extraction():
+    """Fallback selectors and missing fields should resolve the same in the single pass."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    drifted = (
+        html.replace('class="swiper-wrapper"', 'class="old-wrapper"', 1)
+        .replace("film_list-wrap", "popular-section")
+        .replace('sb-genre-list sb-genre-less" id="sidebar_subs_genre"', 'genre-list"')
+        .replace(' href="/', ' data-href="/', 5)
+    )
+
+    single = parse(drifted, single_pass=True)
+    assert single == parse(drifted, single_pass=False)
+    assert single["trendingAnimes"] and single["genres"]
+
+
+def test_unsupported_selector_falls_back():
+    """A fallback selector the walker cannot evaluate should use the per-section extractors."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+
+    original = home_pages.GENRE_SELECTORS
+    home_pages.GENRE_SELECTORS = SelectorChain("genres", ["#sidebar_subs_genre > ul .nav-link", *original.selectors])
+    try:
+        genres = dataclasses.asdict(HomePageScraper().parse_home_page(html, "bs4-lxml"))["genres"]
+    finally:
+        home_pages.GENRE_SELECTORS = original
+    assert genres[0] == "Action"
+
+
+def main():
+    """Run single-pass extraction tests."""
+    logger.info("Starting single-pass extraction tests...")
+
+    tests = [
+        ("Selectors Match Like Select", test_selectors_match_like_select),
+        ("Unsupported Selectors", test_unsupported_selectors),
+        ("Sections Collect In One Walk", test_sections_collect_in_one_walk),
+        ("Home Page Matches Per-Section Extraction", test_home_page_matches_per_section_extraction),
+        ("Drifted Layout Matches Per-Section Extraction", test_drifted_layout_matches_per_section_extraction),
+        ("Unsupported Selector Falls Back", test_unsupported_selector_falls_back),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Single-Pass Extraction Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
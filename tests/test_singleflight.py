@@ -0,0 +1,224 @@
+"""Test coalescing of identical concurrent calls."""
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.utils.retry import deadline_scope, remaining_time
+from src.utils.singleflight import SingleFlight, normalize_key
+import src.scrapers.animeEpisodeSrcs as episode_srcs
+
+# Configure logging
+logger = get_logger("TestSingleFlight")
+
+
+def test_identical_calls_share_one_operation():
+    """Concurrent calls with the same key should run the operation once."""
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def scrape():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"anime": "one-piece-100"}
+
+    async def run():
+        return await asyncio.gather(*(
+            flight.do(normalize_key(anime_id), scrape)
+            for anime_id in ["one-piece-100", " one-piece-100", "one-piece-100 "] * 3
+        ))
+
+    results = asyncio.run(run())
+    logger.info(f"Single-flight stats: {flight.stats()}")
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats()["coalesced"] == 8
+    assert flight.stats()["maxWaiters"] == 9
+    assert flight.stats()["inFlight"] == 0
+
+
+def test_errors_are_shared_and_not_kept():
+    """Every waiter should get the error, and the next call should retry."""
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def scrape():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        if calls == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    async def run():
+        first = await asyncio.gather(*(flight.do("key", scrape) for _ in range(3)), return_exceptions=True)
+        second = await flight.do("key", scrape)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in first)
+    assert second == "ok"
+    assert calls == 2
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    """One caller giving up should leave the shared operation running for the rest."""
+    flight = SingleFlight("test")
+
+    async def scrape():
+        await asyncio.sleep(0.2)
+        return "ok"
+
+    async def run():
+        impatient = asyncio.create_task(flight.do("key", scrape))
+        patient = asyncio.create_task(flight.do("key", scrape))
+        await asyncio.sleep(0.05)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(run()) == "ok"
+
+
+def test_last_waiter_leaving_cancels_operation():
+    """Once every caller has given up, the shared operation should be cancelled."""
+    flight = SingleFlight("test")
+    cancelled = asyncio.Event()
+
+    async def scrape():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "ok"
+
+    async def run():
+        callers = [asyncio.create_task(flight.do("key", scrape)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        callers[0].cancel()
+        await asyncio.sleep(0.05)
+        assert not cancelled.is_set()
+        callers[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=0.5)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert flight.stats()["abandoned"] == 1
+    assert flight.stats()["inFlight"] == 0
+
+
+def test_call_again_after_timeout():
+    """A call made right after the only caller timed out should start a fresh operation."""
+    flight = SingleFlight("test")
+    started = 0
+
+    async def scrape():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    async def run():
+        try:
+            await asyncio.wait_for(flight.do("key", scrape), timeout=0.05)
+            raise AssertionError("Expected the first call to time out")
+        except asyncio.TimeoutError:
+            pass
+        return await flight.do("key", scrape)
+
+    assert asyncio.run(run()) == "ok"
+    assert started == 2
+    assert flight.stats()["inFlight"] == 0
+
+
+def test_deadline_follows_the_latest_caller():
+    """The shared operation should run under its callers' deadline, pushed back by later ones."""
+    flight = SingleFlight("test")
+    seen = []
+
+    async def scrape():
+        seen.append(remaining_time())
+        await asyncio.sleep(0.1)
+        seen.append(remaining_time())
+        return "ok"
+
+    async def call(seconds: float):
+        with deadline_scope(seconds):
+            return await asyncio.wait_for(flight.do("key", scrape), timeout=seconds)
+
+    async def run():
+        first = asyncio.create_task(call(0.05))
+        await asyncio.sleep(0.01)
+        second = await call(1)
+        return await asyncio.gather(first, return_exceptions=True), second
+
+    (first,), second = asyncio.run(run())
+    assert 0 < seen[0] <= 0.05
+    assert 0.5 < seen[1] < 1
+    assert isinstance(first, asyncio.TimeoutError)
+    assert second == "ok"
+
+
+def test_episode_sources_are_coalesced():
+    """Concurrent getAnimeEpisodeSources calls for the same server should extract once."""
+    calls = 0
+
+    async def fake_fetch(episode_id, server, category, context):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"sources": [], "anilistID": 1, "malID": 2}
+
+    original_fetch = episode_srcs._fetchAnimeEpisodeSources
+    episode_srcs._fetchAnimeEpisodeSources = fake_fetch
+    try:
+        async def run():
+            return await asyncio.gather(
+                episode_srcs.getAnimeEpisodeSources("frieren-18542?ep=107257", "VidStreaming", "sub"),
+                episode_srcs.getAnimeEpisodeSources("frieren-18542?ep=107257", "VidStreaming", "SUB"),
+                episode_srcs.getAnimeEpisodeSources("frieren-18542?ep=107257", "StreamTape", "sub"),
+            )
+
+        asyncio.run(run())
+    finally:
+        episode_srcs._fetchAnimeEpisodeSources = original_fetch
+
+    assert calls == 2
+
+
+def main():
+    """Run single-flight tests."""
+    logger.info("Starting single-flight tests...")
+
+    tests = [
+        ("Identical Calls Share One Operation", test_identical_calls_share_one_operation),
+        ("Errors Are Shared And Not Kept", test_errors_are_shared_and_not_kept),
+        ("Cancelled Waiter Does Not Cancel Others", test_cancelled_waiter_does_not_cancel_others),
+        ("Last Waiter Leaving Cancels Operation", test_last_waiter_leaving_cancels_operation),
+        ("Call Again After Timeout", test_call_again_after_timeout),
+        ("Deadline Follows The Latest Caller", test_deadline_follows_the_latest_caller),
+        ("Episode Sources Are Coalesced", test_episode_sources_are_coalesced),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Single-flight Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Test concurrent, cached liveness probing of extracted source and subtitle URLs."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from src.management import get_logger
+import src.utils.client as client
+import src.utils.probe as probe
+from src.utils.probe import SourceProber
+from src.utils.ratelimit import RateLimiter
+
+# Configure logging
+logger = get_logger("TestSourceProbe")
+
+REFERER = "https://megacloud.example/"
+
+
+class MediaHost:
+    """Local CDN that only serves requests carrying the expected Referer."""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if request.match_info["name"].startswith("dead"):
+            return web.Response(status=404)
+        if request.headers.get("Referer") != REFERER:
+            return web.Response(status=403)
+        # A large body, of which the probe should read only the first bytes
+        return web.Response(body=b"#EXTM3U\n" + b"0" * 5_000_000)
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/{name}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        await probe.async_client.close()
+        await self.runner.cleanup()
+
+
+def annotate(host: MediaHost, build_entries, prober: SourceProber = None, rounds: int = 1):
+    """Annotate the entries built for the host's base URL `rounds` times; returns the last result."""
+    prober = prober or SourceProber(concurrency=8, timeout=5, cache_ttl=60)
+
+    async def run():
+        base_url = await host.start()
+        try:
+            for _ in range(rounds):
+                start = time.perf_counter()
+                annotated = await prober.annotate(build_entries(base_url))
+            return annotated, time.perf_counter() - start
+        finally:
+            await host.stop()
+
+    return asyncio.run(run())
+
+
+def test_sources_and_subtitles_are_probed():
+    """Every URL should be probed concurrently with the entry's Referer."""
+    host = MediaHost()
+
+    def entries(base_url):
+        return [{
+            "headers": {"Referer": REFERER},
+            "sources": [{"url": f"{base_url}/master.m3u8", "isM3U8": True}, {"url": f"{base_url}/dead.m3u8"}],
+            "subtitles": [{"url": f"{base_url}/en.vtt", "lang": "English"}, {"url": f"{base_url}/dead.vtt"}],
+        }]
+
+    (entry,), elapsed = annotate(host, entries)
+    logger.info(f"Probed {host.requests} URLs in {elapsed:.2f}s")
+    live, dead = entry["sources"]
+
+    assert host.max_active == 4
+    assert elapsed < 1
+    assert live["isM3U8"] and live["probe"]["alive"] and live["probe"]["status"] == 200
+    assert live["probe"]["ttfbMs"] >= 100
+    assert not live["probe"]["cached"]
+    assert not dead["probe"]["alive"] and dead["probe"]["status"] == 404
+    assert [subtitle["probe"]["alive"] for subtitle in entry["subtitles"]] == [True, False]
+    assert entry["liveSources"] == 1
+
+
+def test_referer_comes_from_each_entry():
+    """Entries without the Referer the host expects should be reported dead."""
+    def entries(base_url):
+        return [
+            {"headers": {"Referer": REFERER}, "sources": [{"url": f"{base_url}/a.mp4"}]},
+            {"headers": {}, "sources": [{"url": f"{base_url}/b.mp4"}, {"url": ""}]},
+        ]
+
+    with_referer, without_referer = annotate(MediaHost(delay=0), entries)[0]
+
+    assert with_referer["liveSources"] == 1
+    assert without_referer["sources"][0]["probe"]["status"] == 403
+    assert without_referer["sources"][1]["probe"]["error"] == "missing url"
+    assert without_referer["liveSources"] == 0
+
+
+def test_probes_are_cached():
+    """Probing the same URLs again should not contact the host."""
+    host = MediaHost()
+
+    def entries(base_url):
+        return [{"headers": {"Referer": REFERER}, "sources": [{"url": f"{base_url}/master.m3u8"}]}]
+
+    (entry,), elapsed = annotate(host, entries, rounds=2)
+
+    assert host.requests == 1
+    assert elapsed < 0.05
+    assert entry["sources"][0]["probe"]["cached"]
+    assert entry["sources"][0]["probe"]["alive"]
+
+
+def test_concurrency_is_bounded():
+    """No more than the configured number of URLs should be probed at once."""
+    host = MediaHost()
+
+    def entries(base_url):
+        return [{"headers": {"Referer": REFERER}, "sources": [{"url": f"{base_url}/{n}.ts"} for n in range(6)]}]
+
+    (entry,), _ = annotate(host, entries, prober=SourceProber(concurrency=2, timeout=5, cache_ttl=60))
+
+    assert host.max_active == 2
+    assert entry["liveSources"] == 6
+
+
+def test_rate_limit_wait_counts_against_timeout():
+    """Probes held back by the host's rate limit should fail at their timeout, not queue past it."""
+    host = MediaHost(delay=0)
+
+    def entries(base_url):
+        return [{"headers": {"Referer": REFERER}, "sources": [{"url": f"{base_url}/{n}.ts"} for n in range(4)]}]
+
+    original = client.rate_limiter
+    # One request every 2 seconds: without the budget the last probe would wait 6 seconds
+    client.rate_limiter = RateLimiter(enabled=True, host_limits={"127.0.0.1": (0.5, 1)})
+    try:
+        (entry,), elapsed = annotate(host, entries, prober=SourceProber(timeout=0.3, cache_ttl=60))
+    finally:
+        client.rate_limiter = original
+
+    assert elapsed < 1
+    assert host.requests == 1
+    assert entry["liveSources"] == 1
+    assert [source["probe"]["error"] for source in entry["sources"]].count("TimeoutError") == 3
+
+
+def test_unreachable_host():
+    """Connection errors should be reported, not raised."""
+    async def run():
+        try:
+            return await SourceProber(timeout=2).probe("http://127.0.0.1:9/master.m3u8")
+        finally:
+            await probe.async_client.close()
+
+    result = asyncio.run(run())
+    assert not result["alive"]
+    assert result["status"] is None
+    assert result["error"]
+
+
+def main():
+    """Run source probe tests."""
+    logger.info("Starting source probe tests...")
+
+    tests = [
+        ("Sources And Subtitles Are Probed", test_sources_and_subtitles_are_probed),
+        ("Referer Comes From Each Entry", test_referer_comes_from_each_entry),
+        ("Probes Are Cached", test_probes_are_cached),
+        ("Concurrency Is Bounded", test_concurrency_is_bounded),
+        ("Rate Limit Wait Counts Against Timeout", test_rate_limit_wait_counts_against_timeout),
+        ("Unreachable Host", test_unreachable_host),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Source Probe Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Test the episode source result cache and its TTL from signed URL expiry."""
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.utils.config import Config
+import src.scrapers.animeEpisodeSrcs as episode_srcs
+
+# Configure logging
+logger = get_logger("TestSourcesCache")
+
+EPISODE_ID = "frieren-18542?ep=107257"
+
+
+def test_ttl_from_signed_url_expiry():
+    """The TTL should follow the earliest URL expiry minus the safety margin."""
+    expires = int(time.time()) + 1800
+    sources = [
+        {"url": f"https://cdn.example.com/a/master.m3u8?expires={expires}&token=abc", "isM3U8": True},
+        {"url": f"https://cdn.example.com/b/master.m3u8?e={(expires + 600) * 1000}", "isM3U8": True},
+    ]
+    ttl = episode_srcs.sources_cache_ttl(sources)
+    logger.info(f"TTL for URLs expiring in 1800s: {ttl:.0f}s")
+    assert abs(ttl - (1800 - Config.SOURCES_CACHE_EXPIRY_MARGIN)) < 5
+
+
+def test_ttl_defaults_and_bounds():
+    """Unsigned URLs get the default TTL, far expiries are capped and past ones are not cached."""
+    unsigned = [{"url": "https://cdn.example.com/master.m3u8"}]
+    far = [{"url": f"https://cdn.example.com/master.m3u8?expires={int(time.time()) + 10 ** 6}"}]
+    expired = [{"url": f"https://cdn.example.com/master.m3u8?expires={int(time.time()) + 30}"}]
+
+    assert episode_srcs.sources_cache_ttl(unsigned) == Config.SOURCES_CACHE_DEFAULT_TTL
+    assert episode_srcs.sources_cache_ttl(far) == Config.SOURCES_CACHE_MAX_TTL
+    assert episode_srcs.sources_cache_ttl(expired) == 0
+    assert episode_srcs.sources_cache_ttl([]) == 0
+
+
+def run_with_fake_extraction(sources, calls):
+    async def fake_fetch(episode_id, server, category, context):
+        calls.append((episode_id, server, category))
+        await asyncio.sleep(0.01)
+        return {"sources": sources, "headers": {}, "anilistID": 1, "malID": 2}
+
+    original_fetch = episode_srcs._fetchAnimeEpisodeSources
+    episode_srcs._fetchAnimeEpisodeSources = fake_fetch
+    episode_srcs.episode_sources_cache.invalidate()
+    try:
+        async def run():
+            first = await episode_srcs.getAnimeEpisodeSources(EPISODE_ID, "VidStreaming", "sub")
+            first["sources"] = "mutated by caller"
+            second = await episode_srcs.getAnimeEpisodeSources(f" {EPISODE_ID}", "VidStreaming", "SUB")
+            third = await episode_srcs.getAnimeEpisodeSources(EPISODE_ID, "VidStreaming", "dub")
+            return first, second, third
+
+        return asyncio.run(run())
+    finally:
+        episode_srcs._fetchAnimeEpisodeSources = original_fetch
+        episode_srcs.episode_sources_cache.invalidate()
+
+
+def test_repeat_requests_hit_the_cache():
+    """A repeated (episode, server, category) should not extract again."""
+    sources = [{"url": f"https://cdn.example.com/master.m3u8?expires={int(time.time()) + 3600}", "isM3U8": True}]
+    calls = []
+    _, second, _ = run_with_fake_extraction(sources, calls)
+
+    assert len(calls) == 2, calls
+    assert calls[1][2] == "dub"
+    assert second["sources"] == sources
+
+
+def test_expiring_sources_are_not_cached():
+    """Sources whose URLs expire within the margin should be extracted again."""
+    sources = [{"url": f"https://cdn.example.com/master.m3u8?expires={int(time.time()) + 10}", "isM3U8": True}]
+    calls = []
+    run_with_fake_extraction(sources, calls)
+    assert len(calls) == 3
+
+
+def main():
+    """Run source cache tests."""
+    logger.info("Starting source cache tests...")
+
+    tests = [
+        ("TTL From Signed URL Expiry", test_ttl_from_signed_url_expiry),
+        ("TTL Defaults And Bounds", test_ttl_defaults_and_bounds),
+        ("Repeat Requests Hit The Cache", test_repeat_requests_hit_the_cache),
+        ("Expiring Sources Are Not Cached", test_expiring_sources_are_not_cached),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Source Cache Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Test the shared pooled HTTP transport against a local keep-alive server."""
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.management import get_logger
+from src.utils.client import Client
+
+# Configure logging
+logger = get_logger("TestTransport")
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports = set()
+    seen_headers = []
+
+    def do_GET(self):
+        KeepAliveHandler.client_ports.add(self.client_address[1])
+        KeepAliveHandler.seen_headers.append(dict(self.headers))
+        body = b'{"html": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def test_connections_are_reused():
+    """Repeated requests to one host should share a single keep-alive connection."""
+    KeepAliveHandler.client_ports.clear()
+    server = start_server()
+    try:
+        client = Client(pool_connections=2, pool_maxsize=2)
+        url = f"http://127.0.0.1:{server.server_port}/ajax/v2/episode/servers"
+        for _ in range(5):
+            response = client.get(url)
+            response.raise_for_status()
+            assert response.json()["html"] == "ok"
+    finally:
+        server.shutdown()
+
+    logger.info(f"Client ports seen by server: {KeepAliveHandler.client_ports}")
+    assert len(KeepAliveHandler.client_ports) == 1
+    assert client.stats()["requestsPerHost"]["127.0.0.1"] == 5
+
+
+def test_default_headers_are_sent():
+    """Default headers from Config.get_headers() should be sent and be overridable."""
+    KeepAliveHandler.seen_headers.clear()
+    server = start_server()
+    try:
+        client = Client()
+        url = f"http://127.0.0.1:{server.server_port}/home"
+        client.get(url, headers={"X-Requested-With": "XMLHttpRequest"})
+    finally:
+        server.shutdown()
+
+    headers = KeepAliveHandler.seen_headers[0]
+    assert "Chrome" in headers["User-Agent"]
+    assert headers["X-Requested-With"] == "XMLHttpRequest"
+    assert headers["Accept-Language"] == "en-US,en;q=0.9"
+
+
+def main():
+    """Run transport tests."""
+    logger.info("Starting transport tests...")
+
+    tests = [
+        ("Connections Are Reused", test_connections_are_reused),
+        ("Default Headers Are Sent", test_default_headers_are_sent),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n--- Running {test_name} Test ---")
+        try:
+            test_func()
+            passed += 1
+            logger.info(f"✓ {test_name} test passed")
+        except Exception as e:
+            logger.error(f"✗ {test_name} test failed: {str(e)}")
+
+    logger.info(f"\n--- Transport Test Results ---")
+    logger.info(f"Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    main()